@@ -14,10 +14,9 @@ Usage
     python advanced_optimization.py
 """
 
-import os
 import sys
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass, field
 
 # Add project root to path for imports
@@ -29,17 +28,19 @@ import pandas as _pd
 import numpy as _np
 
 from utils import fetch_historical_ohlcv
+from ohlcv_store import find_ohlcv_file, load_ohlcv
 from backtest_optimized import (
     Trade,
     StrategyResult,
-    ema,
-    rsi,
-    adx,
-    atr,
-    sma,
     RISK_PER_TRADE,
     FEE_PER_TRADE,
+    EXIT_FILL,
+    bar_exit,
+    bar_length_ms,
+    fill_inputs,
 )
+from intrabar import IntrabarPath
+from indicator_cache import get_indicator_series, indicator_name
 
 from config import (
     EXCHANGE_ID,
@@ -58,6 +59,7 @@ from config import (
     ADX_THRESHOLD,
     EMA_FAST_PERIOD,
     EMA_SLOW_PERIOD,
+    INDICATOR_SMOOTHING,
 )
 
 
@@ -65,17 +67,27 @@ def backtest_atr_with_trailing_stop(
     df: _pd.DataFrame,
     use_trailing_stop: bool = False,
     trailing_stop_atr_mult: float = 0.5,
+    fill: str = EXIT_FILL,
+    drill_down: Optional[IntrabarPath] = None,
 ) -> StrategyResult:
-    """Backtest ATR Breakout with optional trailing stop."""
+    """
+    Backtest ATR Breakout with optional trailing stop.
+
+    With ``fill="high_low"`` the stop and target (as they stood at the
+    candle open) are checked against each candle's high and low, and the
+    trailing stop then follows the candle's high (long) / low (short).
+    Candles that touched both levels are resolved with ``drill_down``
+    (see :func:`backtest_optimized.simulate_trades`).
+    """
     if len(df) < 50:
         return StrategyResult("ATR Breakout")
     
-    ema20 = ema(df["close"], EMA_FAST_PERIOD)
-    ema50 = ema(df["close"], EMA_SLOW_PERIOD)
-    atr_val = atr(df["high"], df["low"], df["close"], 14)
-    rsi_val = rsi(df["close"], window=14)
-    volume_sma = sma(df["volume"], 20)
-    adx_val = adx(df["high"], df["low"], df["close"], 14)
+    ema20 = get_indicator_series(df, "ema", EMA_FAST_PERIOD)
+    ema50 = get_indicator_series(df, "ema", EMA_SLOW_PERIOD)
+    atr_val = get_indicator_series(df, indicator_name("atr", INDICATOR_SMOOTHING), 14)
+    rsi_val = get_indicator_series(df, indicator_name("rsi", INDICATOR_SMOOTHING), 14)
+    volume_sma = get_indicator_series(df, "volume_sma", 20)
+    adx_val = get_indicator_series(df, indicator_name("adx", INDICATOR_SMOOTHING), 14)
     
     signals = _np.zeros(len(df), dtype=int)
     
@@ -106,6 +118,11 @@ def backtest_atr_with_trailing_stop(
             if RSI_SHORT_MIN < rsi_curr < RSI_SHORT_MAX:
                 signals[i] = -1
     
+    # Candle ranges for high/low exits
+    bars, drill_down = fill_inputs(df, fill, drill_down)
+    if bars is not None:
+        bar_ms = bar_length_ms(bars["timestamp"])
+    
     # Backtest with trailing stop
     result = StrategyResult("ATR Breakout" + (" + Trailing Stop" if use_trailing_stop else ""))
     in_pos = False
@@ -151,9 +168,33 @@ def backtest_atr_with_trailing_stop(
         else:
             exit_flag = False
             profit = 0.0
+            exit_price = price
+            
+            if bars is not None:
+                start_ms = int(bars["timestamp"][i])
+                end_ms = int(bars["timestamp"][i + 1]) if i + 1 < len(df) else start_ms + bar_ms
+                level_price = bar_exit(
+                    direction, bars["open"][i], bars["high"][i], bars["low"][i],
+                    stop, tp, start_ms, end_ms, drill_down,
+                )
+                if level_price is not None:
+                    exit_price = level_price
+                    exit_flag = True
+                elif signals[i] == -direction:
+                    exit_flag = True
+                if exit_flag:
+                    profit = (exit_price - entry_price) * direction * quantity - FEE_PER_TRADE
+                elif direction == 1 and bars["high"][i] > highest_price:
+                    highest_price = bars["high"][i]
+                    if use_trailing_stop:
+                        stop = max(stop, highest_price - (trailing_stop_atr_mult * atr_curr))
+                elif direction == -1 and bars["low"][i] < lowest_price:
+                    lowest_price = bars["low"][i]
+                    if use_trailing_stop:
+                        stop = min(stop, lowest_price + (trailing_stop_atr_mult * atr_curr))
             
             # Update trailing stop for long
-            if direction == 1:
+            elif direction == 1:
                 if price > highest_price:
                     highest_price = price
                     if use_trailing_stop:
@@ -198,7 +239,7 @@ def backtest_atr_with_trailing_stop(
                         entry_time=entry_time,
                         entry_price=entry_price,
                         exit_time=row["datetime"],
-                        exit_price=price,
+                        exit_price=exit_price,
                         direction="long" if direction == 1 else "short",
                         quantity=quantity,
                         profit=profit,
@@ -218,12 +259,12 @@ def backtest_with_time_filter(df: _pd.DataFrame, start_hour: int = 8, end_hour:
     if len(df) < 50:
         return StrategyResult("ATR Breakout")
     
-    ema20 = ema(df["close"], EMA_FAST_PERIOD)
-    ema50 = ema(df["close"], EMA_SLOW_PERIOD)
-    atr_val = atr(df["high"], df["low"], df["close"], 14)
-    rsi_val = rsi(df["close"], window=14)
-    volume_sma = sma(df["volume"], 20)
-    adx_val = adx(df["high"], df["low"], df["close"], 14)
+    ema20 = get_indicator_series(df, "ema", EMA_FAST_PERIOD)
+    ema50 = get_indicator_series(df, "ema", EMA_SLOW_PERIOD)
+    atr_val = get_indicator_series(df, indicator_name("atr", INDICATOR_SMOOTHING), 14)
+    rsi_val = get_indicator_series(df, indicator_name("rsi", INDICATOR_SMOOTHING), 14)
+    volume_sma = get_indicator_series(df, "volume_sma", 20)
+    adx_val = get_indicator_series(df, indicator_name("adx", INDICATOR_SMOOTHING), 14)
     
     signals = _np.zeros(len(df), dtype=int)
     
@@ -344,11 +385,10 @@ def backtest_with_time_filter(df: _pd.DataFrame, start_hour: int = 8, end_hour:
 def run_advanced_optimization():
     """Test advanced optimizations."""
     # Load data
-    if DATA_FILE and os.path.exists(DATA_FILE):
-        print(f"Loading data from {DATA_FILE}...")
-        data = _pd.read_csv(DATA_FILE)
-        data["datetime"] = _pd.to_datetime(data["datetime"])
-        data = data.sort_values("datetime").reset_index(drop=True)
+    data_path = find_ohlcv_file(DATA_FILE)
+    if data_path is not None:
+        print(f"Loading data from {data_path}...")
+        data = load_ohlcv(data_path)
         print(f"Loaded {len(data)} candles\n")
     else:
         print("Data file not found!")
@@ -11,12 +11,16 @@ Usage
 
 The script will continuously fetch data and display signals.
 Press Ctrl+C to stop.
+
+With ``STREAM_MODE = "websocket"`` in config.py the script subscribes to
+the exchange kline stream and evaluates each candle the moment it closes,
+falling back to REST polling while the stream is down.
 """
 
+import asyncio
 import os
 import sys
 import time
-import json
 from datetime import datetime
 from typing import Optional, Dict
 from pathlib import Path
@@ -42,18 +46,25 @@ except ImportError:
         BRIGHT = DIM = RESET_ALL = RESET = ''
 
 from utils import (
-    fetch_latest_ohlcv,
-    get_current_price,
-    ema,
-    rsi,
-    send_telegram_message,
+    EXCHANGE_REGISTRY,
+    fetch_ohlcv_rows,
+    get_exchange_time,
+    timeframe_to_ms,
 )
 
-from backtest_optimized import (
-    adx,
-    atr,
-    sma,
+from candle_buffer import CandleBuffer, CandleView
+from scheduler import CandleScheduler
+from signal_journal import SignalJournal
+from telegram_notifier import TelegramNotifier
+from kline_stream import StreamDisconnected, kline_stream_url, stream_klines
+from streaming_indicators import (
+    StreamingADX,
+    StreamingATR,
+    StreamingEMA,
+    StreamingRSI,
+    StreamingSMA,
 )
+from indicator_pipeline import compute_indicators_frame
 
 # Import configuration
 from config import (
@@ -75,16 +86,32 @@ from config import (
     # EMA periods
     EMA_FAST_PERIOD,
     EMA_SLOW_PERIOD,
+    INDICATOR_SMOOTHING,
     # Production config
     UPDATE_INTERVAL,
+    ALIGN_TO_CANDLE_CLOSE,
+    CANDLE_SETTLE_SECONDS,
+    CLOCK_SYNC_INTERVAL,
     CLEAR_SCREEN,
+    STREAM_MODE,
+    STREAM_URL,
+    STREAM_IDLE_TIMEOUT,
+    EVALUATION_POLICY,
     # Logging config
     SIGNAL_LOG_FILE,
     ENABLE_SIGNAL_LOGGING,
+    SIGNAL_LOG_BATCH_SIZE,
+    SIGNAL_LOG_FLUSH_INTERVAL,
+    SIGNAL_LOG_FSYNC,
+    SIGNAL_LOG_MAX_BYTES,
+    SIGNAL_LOG_ROTATE,
+    SIGNAL_LOG_BACKUPS,
     # Telegram config
     TELEGRAM_BOT_TOKEN,
     TELEGRAM_CHAT_ID,
     ENABLE_TELEGRAM,
+    TELEGRAM_QUEUE_SIZE,
+    TELEGRAM_API_URL,
 )
 
 
@@ -120,10 +147,86 @@ def format_percent(value: float) -> str:
     return f"{value:.2f}%"
 
 
-def get_signal_info(df: _pd.DataFrame) -> Dict:
+def compute_indicator_values(df: _pd.DataFrame) -> Dict:
+    """Compute the indicators over ``df`` and return their latest values."""
+    return compute_indicators_frame(
+        df,
+        INDICATOR_SMOOTHING,
+        ema_fast=EMA_FAST_PERIOD,
+        ema_slow=EMA_SLOW_PERIOD,
+    ).latest()
+
+
+class IndicatorState:
+    """
+    Streaming indicator state for the production loop.
+
+    All candles of an evaluation view but the last are fed to O(1)
+    streaming indicators once each; the last candle (the evaluated bar)
+    is applied with ``peek``, so it can still change until the next
+    view.  The state is reseeded from the view when it no longer overlaps
+    the candles that were already processed (first tick or after an
+    outage).
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        self.last_closed_ts: Optional[int] = None
+        self.ema_fast = StreamingEMA(EMA_FAST_PERIOD)
+        self.ema_slow = StreamingEMA(EMA_SLOW_PERIOD)
+        self.atr = StreamingATR(14, INDICATOR_SMOOTHING)
+        self.rsi = StreamingRSI(14, INDICATOR_SMOOTHING)
+        self.volume_sma = StreamingSMA(20)
+        self.adx = StreamingADX(14, INDICATOR_SMOOTHING)
+
+    def _update(self, h: float, l: float, c: float, v: float) -> None:
+        self.ema_fast.update(c)
+        self.ema_slow.update(c)
+        self.atr.update(h, l, c)
+        self.rsi.update(c)
+        self.volume_sma.update(v)
+        self.adx.update(h, l, c)
+
+    def sync(self, candles: CandleView) -> int:
+        """Feed candles before the evaluated bar not processed yet; returns how many were fed."""
+        stamps = candles.timestamp[:-1]
+        start = 0
+        if self.last_closed_ts is not None:
+            k = int(_np.searchsorted(stamps, self.last_closed_ts))
+            if k < len(stamps) and stamps[k] == self.last_closed_ts:
+                start = k + 1
+            else:
+                self.reset()
+
+        cols = [candles.values(col)[start:-1].tolist() for col in ("high", "low", "close", "volume")]
+        for h, l, c, v in zip(*cols):
+            self._update(h, l, c, v)
+        if len(stamps) > start:
+            self.last_closed_ts = int(stamps[-1])
+        return len(stamps) - start
+
+    def values(self, candles: CandleView) -> Dict:
+        """Indicator values at the evaluated bar (the last candle of the view)."""
+        h, l, c, v = (float(candles.values(col)[-1]) for col in ("high", "low", "close", "volume"))
+        return {
+            "ema20": self.ema_fast.peek(c),
+            "ema50": self.ema_slow.peek(c),
+            "atr": self.atr.peek(h, l, c),
+            "rsi": self.rsi.peek(c),
+            "volume_sma": self.volume_sma.peek(v),
+            "adx": self.adx.peek(h, l, c),
+        }
+
+
+def get_signal_info(df: _pd.DataFrame, values: Optional[Dict] = None) -> Dict:
     """
     Calculate indicators and generate signal information.
     
+    ``df`` is an OHLCV DataFrame or a :class:`CandleBuffer`.  ``values``
+    are precomputed latest indicator values (see :class:`IndicatorState`);
+    when omitted they are computed from ``df``.
     Returns dict with all signal data.
     """
     if len(df) < 50:
@@ -133,32 +236,26 @@ def get_signal_info(df: _pd.DataFrame) -> Dict:
         }
     
     # Calculate indicators
-    ema20 = ema(df["close"], EMA_FAST_PERIOD)
-    ema50 = ema(df["close"], EMA_SLOW_PERIOD)
-    atr_val = atr(df["high"], df["low"], df["close"], 14)
-    rsi_val = rsi(df["close"], window=14)
-    volume_sma = sma(df["volume"], 20)
-    adx_val = adx(df["high"], df["low"], df["close"], 14)
+    if values is None:
+        values = compute_indicator_values(df)
     
     # Get latest values
     i = len(df) - 1
     
-    if (_pd.isna(ema20.iloc[i]) or _pd.isna(ema50.iloc[i]) or 
-        _pd.isna(atr_val.iloc[i]) or _pd.isna(rsi_val.iloc[i]) or
-        _pd.isna(volume_sma.iloc[i]) or _pd.isna(adx_val.iloc[i])):
+    if any(_pd.isna(values[key]) for key in ("ema20", "ema50", "atr", "rsi", "volume_sma", "adx")):
         return {
             "error": "NaN values in indicators",
             "signal": 0,
         }
     
     current_price = df["close"].iloc[i]
-    ema20_current = ema20.iloc[i]
-    ema50_current = ema50.iloc[i]
-    atr_current = atr_val.iloc[i]
-    rsi_current = rsi_val.iloc[i]
+    ema20_current = values["ema20"]
+    ema50_current = values["ema50"]
+    atr_current = values["atr"]
+    rsi_current = values["rsi"]
     volume_current = df["volume"].iloc[i]
-    adx_current = adx_val.iloc[i]
-    volume_avg = volume_sma.iloc[i]
+    adx_current = values["adx"]
+    volume_avg = values["volume_sma"]
     
     # Calculate breakout levels
     breakout_long = ema20_current + (ATR_BREAKOUT_MULTIPLIER * atr_current)
@@ -281,39 +378,37 @@ def print_indicators(info: Dict):
     # Volume
     volume_color = Fore.GREEN if info['volume_ok'] else Fore.RED
     volume_status = "✓ PASS" if info['volume_ok'] else "✗ FAIL"
-    print(f"{Fore.WHITE}Volume: {Fore.YELLOW}{info['volume']:,.0f}")
+    projected = f" {Style.DIM}(projected){Style.RESET_ALL}" if info.get('volume_projected') else ""
+    print(f"{Fore.WHITE}Volume: {Fore.YELLOW}{info['volume']:,.0f}{projected}")
     print(f"{Fore.WHITE}Volume Avg: {Fore.YELLOW}{info['volume_avg']:,.0f}")
     print(f"{Fore.WHITE}Volume Ratio: {volume_color}{info['volume_ratio']:.2f}× {volume_status} (Required: {VOLUME_MULTIPLIER}×)")
     
     print()
 
 
-def log_signal_to_file(info: Dict, log_file: str = None):
-    """
-    Log signal to file with full details for tracing.
-    
-    Parameters
-    ----------
-    info : Dict
-        Signal information dictionary
-    log_file : str
-        Path to log file (uses SIGNAL_LOG_FILE from config if not provided)
-    """
-    if not ENABLE_SIGNAL_LOGGING:
-        return
-    
-    if info['signal'] == 0:
-        return  # Only log when there's an actual signal
-    
-    if log_file is None:
-        log_file = SIGNAL_LOG_FILE
-    
-    # Create logs directory if it doesn't exist
-    log_path = Path(log_file)
-    log_path.parent.mkdir(parents=True, exist_ok=True)
-    
-    # Prepare log entry
-    log_entry = {
+# Signal journal, opened on first use
+_journal: Optional[SignalJournal] = None
+
+
+def get_signal_journal() -> SignalJournal:
+    """Return the JSONL signal journal at ``SIGNAL_LOG_FILE``."""
+    global _journal
+    if _journal is None:
+        _journal = SignalJournal(
+            SIGNAL_LOG_FILE,
+            batch_size=SIGNAL_LOG_BATCH_SIZE,
+            flush_interval=SIGNAL_LOG_FLUSH_INTERVAL,
+            fsync=SIGNAL_LOG_FSYNC,
+            max_bytes=SIGNAL_LOG_MAX_BYTES,
+            rotate_interval=SIGNAL_LOG_ROTATE,
+            backup_count=SIGNAL_LOG_BACKUPS,
+        )
+    return _journal
+
+
+def build_signal_log_entry(info: Dict) -> Dict:
+    """Journal record with full signal details for tracing."""
+    return {
         "timestamp": datetime.now().isoformat(),
         "candle_time": info['latest_candle_time'].isoformat() if hasattr(info['latest_candle_time'], 'isoformat') else str(info['latest_candle_time']),
         "signal": {
@@ -365,14 +460,49 @@ def log_signal_to_file(info: Dict, log_file: str = None):
         },
         "signal_reason": info['signal_reason'],
     }
+
+
+def log_signal(info: Dict) -> bool:
+    """
+    Append a signal to the JSONL signal journal.
+
+    Returns True if the signal was logged (records are buffered and
+    written according to the ``SIGNAL_LOG_*`` settings).
+    """
+    if not ENABLE_SIGNAL_LOGGING:
+        return False
+    
+    if info['signal'] == 0:
+        return False  # Only log when there's an actual signal
     
-    # Append to log file (JSON format for easy parsing)
     try:
-        with open(log_file, 'a', encoding='utf-8') as f:
-            f.write(json.dumps(log_entry, indent=2, default=str) + '\n')
-            f.write("\n" + "="*80 + "\n\n")
+        get_signal_journal().write(build_signal_log_entry(info))
+        return True
     except Exception as e:
         print(f"{Fore.RED}Error logging signal: {e}{Style.RESET_ALL}")
+        return False
+
+
+# Background Telegram sender, created on first use
+_notifier: Optional[TelegramNotifier] = None
+
+
+def notify_telegram(message: str) -> bool:
+    """
+    Queue a Telegram message without blocking the trading loop.
+
+    Returns False if Telegram is disabled or not configured.
+    """
+    global _notifier
+    if not (ENABLE_TELEGRAM and TELEGRAM_BOT_TOKEN and TELEGRAM_CHAT_ID):
+        return False
+    if _notifier is None:
+        _notifier = TelegramNotifier(
+            TELEGRAM_BOT_TOKEN,
+            api_url=TELEGRAM_API_URL or None,
+            queue_size=TELEGRAM_QUEUE_SIZE,
+        )
+    return _notifier.notify(TELEGRAM_CHAT_ID, message)
 
 
 def format_signal_telegram_message(info: Dict) -> str:
@@ -437,18 +567,12 @@ def print_signal(info: Dict):
         print(f"{Fore.YELLOW}Risk:Reward = 1:{ATR_TP_RR}")
         
         # Log to file
-        if ENABLE_SIGNAL_LOGGING:
-            log_signal_to_file(info)
+        if log_signal(info):
             print(f"{Fore.CYAN}✓ Signal logged to {SIGNAL_LOG_FILE}{Style.RESET_ALL}")
         
-        # Send Telegram notification
-        if ENABLE_TELEGRAM and TELEGRAM_BOT_TOKEN and TELEGRAM_CHAT_ID:
-            message = format_signal_telegram_message(info)
-            success = send_telegram_message(TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID, message)
-            if success:
-                print(f"{Fore.CYAN}✓ Signal notification sent to Telegram{Style.RESET_ALL}")
-            else:
-                print(f"{Fore.RED}✗ Failed to send Telegram notification{Style.RESET_ALL}")
+        # Queue Telegram notification (sent in the background)
+        if notify_telegram(format_signal_telegram_message(info)):
+            print(f"{Fore.CYAN}✓ Signal notification queued for Telegram{Style.RESET_ALL}")
         
     elif signal == -1:  # SHORT signal
         print(f"{Back.RED}{Fore.WHITE}{Style.BRIGHT}{' '*20}SHORT SIGNAL{' '*20}")
@@ -460,18 +584,12 @@ def print_signal(info: Dict):
         print(f"{Fore.YELLOW}Risk:Reward = 1:{ATR_TP_RR}")
         
         # Log to file
-        if ENABLE_SIGNAL_LOGGING:
-            log_signal_to_file(info)
+        if log_signal(info):
             print(f"{Fore.CYAN}✓ Signal logged to {SIGNAL_LOG_FILE}{Style.RESET_ALL}")
         
-        # Send Telegram notification
-        if ENABLE_TELEGRAM and TELEGRAM_BOT_TOKEN and TELEGRAM_CHAT_ID:
-            message = format_signal_telegram_message(info)
-            success = send_telegram_message(TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID, message)
-            if success:
-                print(f"{Fore.CYAN}✓ Signal notification sent to Telegram{Style.RESET_ALL}")
-            else:
-                print(f"{Fore.RED}✗ Failed to send Telegram notification{Style.RESET_ALL}")
+        # Queue Telegram notification (sent in the background)
+        if notify_telegram(format_signal_telegram_message(info)):
+            print(f"{Fore.CYAN}✓ Signal notification queued for Telegram{Style.RESET_ALL}")
         
     else:  # No signal
         print(f"{Fore.YELLOW}{Style.BRIGHT}No Signal")
@@ -494,6 +612,24 @@ def print_strategy_params():
     print()
 
 
+def refresh_candles(candles: CandleBuffer) -> int:
+    """
+    Bring the candle buffer up to date and return the number of new candles.
+
+    The buffer is seeded with ``LOOKBACK_CANDLES`` candles on the first
+    call; afterwards only candles since the last buffered one are fetched.
+    If the bot fell too far behind to catch up in one request, it reseeds.
+    """
+    last_ts = candles.last_timestamp
+    if last_ts is None:
+        return candles.seed(fetch_ohlcv_rows(EXCHANGE_ID, SYMBOL, TIMEFRAME, limit=LOOKBACK_CANDLES))
+
+    rows = fetch_ohlcv_rows(EXCHANGE_ID, SYMBOL, TIMEFRAME, since_ms=last_ts, limit=LOOKBACK_CANDLES)
+    if len(rows) >= LOOKBACK_CANDLES:
+        return candles.seed(fetch_ohlcv_rows(EXCHANGE_ID, SYMBOL, TIMEFRAME, limit=LOOKBACK_CANDLES))
+    return candles.update(rows)
+
+
 def run_production():
     """Main production loop."""
     # Send start notification
@@ -513,11 +649,8 @@ def run_production():
             f"• ADX Threshold: {ADX_THRESHOLD}\n"
             f"\nBot is now monitoring for trading signals..."
         )
-        success = send_telegram_message(TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID, start_message)
-        if success:
-            print(f"{Fore.GREEN}✓ Start notification sent to Telegram{Style.RESET_ALL}")
-        else:
-            print(f"{Fore.YELLOW}⚠ Failed to send Telegram start notification{Style.RESET_ALL}")
+        if notify_telegram(start_message):
+            print(f"{Fore.GREEN}✓ Start notification queued for Telegram{Style.RESET_ALL}")
     
     print_header()
     print_strategy_params()
@@ -525,52 +658,196 @@ def run_production():
     print(f"{Fore.YELLOW}Fetching real-time data...")
     print(f"{Style.DIM}Press Ctrl+C to stop{Style.RESET_ALL}\n")
     
+    # Rolling window of the latest candles, topped up each tick, and
+    # streaming indicators fed once per closed candle
+    candles = CandleBuffer(LOOKBACK_CANDLES, timeframe_to_ms(TIMEFRAME))
+    indicators = IndicatorState()
+    
     try:
-        while True:
+        if STREAM_MODE == "websocket":
             try:
-                # Fetch latest data
-                df = fetch_latest_ohlcv(EXCHANGE_ID, SYMBOL, TIMEFRAME, LOOKBACK_CANDLES)
-                current_price = get_current_price(EXCHANGE_ID, SYMBOL)
-                
-                # Calculate signal
-                info = get_signal_info(df)
-                
-                if "error" in info:
-                    print(f"{Fore.RED}Error: {info['error']}")
-                    time.sleep(10)
-                    continue
-                
-                # Clear screen and print
-                clear_screen()
-                print_header()
-                
-                # Print all information
-                print_market_data(info)
-                print_indicators(info)
-                print_signal(info)
-                print_strategy_params()
-                
-                # Print footer
-                print_separator(Fore.CYAN)
-                print(f"{Style.DIM}Last update: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}{Style.RESET_ALL}")
-                print(f"{Style.DIM}Next update in {UPDATE_INTERVAL} seconds... (Press Ctrl+C to stop){Style.RESET_ALL}")
-                
-                # Wait for next update (configurable)
-                time.sleep(UPDATE_INTERVAL)
-                
-            except KeyboardInterrupt:
-                print(f"\n\n{Fore.YELLOW}Stopping...")
-                break
-            except Exception as e:
-                print(f"\n{Fore.RED}Error: {e}")
-                print(f"{Fore.YELLOW}Retrying in 10 seconds...")
-                time.sleep(10)
+                url = kline_stream_url(EXCHANGE_ID, SYMBOL, TIMEFRAME, STREAM_URL)
+            except ValueError as e:
+                print(f"{Fore.YELLOW}⚠ {e}; using REST polling{Style.RESET_ALL}")
+            else:
+                asyncio.run(run_streaming(candles, indicators, url))
+                return
+        run_polling(candles, indicators)
     
     except KeyboardInterrupt:
         print(f"\n\n{Fore.YELLOW}Script stopped by user.")
     except Exception as e:
         print(f"\n{Fore.RED}Fatal error: {e}")
         sys.exit(1)
+    finally:
+        # Write buffered signals and give queued notifications a chance to go out
+        if _journal is not None:
+            _journal.close()
+        if _notifier is not None:
+            _notifier.close(timeout=10)
+
+
+def evaluate_and_display(
+    candles: CandleBuffer,
+    indicators: IndicatorState,
+    next_update: str,
+    now_ms: Optional[float] = None,
+) -> Dict:
+    """
+    Evaluate the strategy on the buffered candles and redraw the screen.
+
+    The candles evaluated follow ``EVALUATION_POLICY`` (see
+    :meth:`CandleBuffer.evaluation_view`); ``now_ms`` is the current
+    exchange time used to tell whether the last candle has closed.  A bar
+    that was already evaluated is skipped and ``{"skipped": True}`` is
+    returned.
+    """
+    view = candles.evaluation_view(EVALUATION_POLICY, now_ms)
+    if view is None:
+        return {"error": "No candles to evaluate", "signal": 0}
+    if candles.is_evaluated(view):
+        return {"skipped": True, "signal": 0}
+    
+    indicators.sync(view)
+    info = get_signal_info(view, indicators.values(view))
+    
+    if "error" in info:
+        print(f"{Fore.RED}Error: {info['error']}")
+        return info
+    candles.mark_evaluated(view)
+    info["bar_closed"] = view.closed
+    info["volume_projected"] = view.projected
+    
+    # Clear screen and print
+    clear_screen()
+    print_header()
+    
+    # Print all information
+    print_market_data(info)
+    print_indicators(info)
+    print_signal(info)
+    print_strategy_params()
+    
+    # Print footer
+    print_separator(Fore.CYAN)
+    print(f"{Style.DIM}Last update: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}{Style.RESET_ALL}")
+    stats = EXCHANGE_REGISTRY.stats()
+    print(f"{Style.DIM}Exchange connections: {stats['connections']}, market loads: {stats['market_loads']}{Style.RESET_ALL}")
+    if _journal is not None:
+        _journal.flush_if_due()
+    if _notifier is not None:
+        tg = _notifier.stats()
+        print(f"{Style.DIM}Telegram: {tg['sent']} sent, {tg['pending']} pending, {tg['failed']} failed, {tg['dropped']} dropped{Style.RESET_ALL}")
+    print(f"{Style.DIM}{next_update} (Press Ctrl+C to stop){Style.RESET_ALL}")
+    return info
+
+
+def poll_once(
+    candles: CandleBuffer,
+    indicators: IndicatorState,
+    next_update: Optional[str] = None,
+    now_ms: Optional[float] = None,
+) -> Dict:
+    """One REST polling tick: fetch new candles, then evaluate."""
+    # Fetch only new / updated candles
+    refresh_candles(candles)
+    if next_update is None:
+        next_update = f"Next update in {UPDATE_INTERVAL} seconds..."
+    return evaluate_and_display(candles, indicators, next_update, now_ms)
+
+
+def make_scheduler() -> CandleScheduler:
+    """Scheduler waking up ``CANDLE_SETTLE_SECONDS`` after each candle close."""
+    return CandleScheduler(
+        timeframe_to_ms(TIMEFRAME),
+        settle_ms=CANDLE_SETTLE_SECONDS * 1000,
+        server_time=lambda: get_exchange_time(EXCHANGE_ID),
+        resync_interval=CLOCK_SYNC_INTERVAL,
+    )
+
+
+def scheduler_status(scheduler: CandleScheduler) -> str:
+    """Footer line with next wake-up and tick lag statistics."""
+    stats = scheduler.lag_stats()
+    status = f"Next update in {scheduler.seconds_until_next():.1f} seconds (candle close + {CANDLE_SETTLE_SECONDS:g}s)"
+    if stats["ticks"]:
+        status += (
+            f" | tick lag {stats['last_ms']:.0f} ms"
+            f" (avg {stats['mean_ms']:.0f}, max {stats['max_ms']:.0f}, missed {stats['missed']})"
+        )
+    return status + f" | clock offset {scheduler.offset_ms:+.0f} ms..."
+
+
+def run_polling(candles: CandleBuffer, indicators: IndicatorState) -> None:
+    """
+    REST polling loop.
+
+    With ``ALIGN_TO_CANDLE_CLOSE`` each update runs right after a candle
+    closes (see :class:`CandleScheduler`); otherwise every
+    ``UPDATE_INTERVAL`` seconds.
+    """
+    scheduler = make_scheduler() if ALIGN_TO_CANDLE_CLOSE else None
+    if scheduler is not None:
+        scheduler.sync_clock()
+    while True:
+        try:
+            next_update = scheduler_status(scheduler) if scheduler is not None else None
+            now_ms = scheduler.now_ms() if scheduler is not None else None
+            info = poll_once(candles, indicators, next_update, now_ms)
+            if "error" in info:
+                time.sleep(10)
+                continue
+            
+            # Wait for next update (next candle close or fixed interval)
+            if scheduler is not None:
+                scheduler.wait()
+            else:
+                time.sleep(UPDATE_INTERVAL)
+            
+        except KeyboardInterrupt:
+            print(f"\n\n{Fore.YELLOW}Stopping...")
+            break
+        except Exception as e:
+            print(f"\n{Fore.RED}Error: {e}")
+            print(f"{Fore.YELLOW}Retrying in 10 seconds...")
+            time.sleep(10)
+
+
+async def run_streaming(candles: CandleBuffer, indicators: IndicatorState, url: str) -> None:
+    """
+    Event-driven loop: evaluate the strategy as soon as a candle closes.
+
+    Kline updates from the WebSocket stream are merged into the candle
+    buffer; the strategy runs on every closed candle.  On (re)connect any
+    candles missed while disconnected are fetched over REST first.  While
+    the stream is down the bot falls back to one REST poll per
+    ``UPDATE_INTERVAL`` and then tries to reconnect.
+    """
+    next_update = "Next update when the current candle closes..."
+    timeframe_ms = timeframe_to_ms(TIMEFRAME)
+
+    async def on_kline(row, closed: bool) -> None:
+        candles.update([row])
+        if closed:
+            # The stream says the candle closed; evaluate as of its close time
+            await asyncio.to_thread(evaluate_and_display, candles, indicators, next_update, row[0] + timeframe_ms)
+
+    while True:
+        try:
+            await asyncio.to_thread(refresh_candles, candles)
+            print(f"{Fore.GREEN}✓ Streaming {TIMEFRAME} candles from {url}{Style.RESET_ALL}")
+            await stream_klines(url, on_kline, idle_timeout=STREAM_IDLE_TIMEOUT)
+        except StreamDisconnected as e:
+            print(f"\n{Fore.YELLOW}⚠ {e}; falling back to REST polling{Style.RESET_ALL}")
+            try:
+                await asyncio.to_thread(poll_once, candles, indicators)
+            except Exception as poll_error:
+                print(f"{Fore.RED}Error: {poll_error}")
+            await asyncio.sleep(UPDATE_INTERVAL)
+        except Exception as e:
+            print(f"\n{Fore.RED}Error: {e}")
+            print(f"{Fore.YELLOW}Retrying in 10 seconds...")
+            await asyncio.sleep(10)
 
 
 if __name__ == "__main__":
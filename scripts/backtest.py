@@ -14,7 +14,6 @@ The script will automatically download historical data and run backtests
 on all strategies, then print a performance summary.
 """
 
-import os
 import sys
 from pathlib import Path
 
@@ -34,6 +33,7 @@ from utils import (
     rsi,
     bollinger_bands,
 )
+from ohlcv_store import find_ohlcv_file, load_ohlcv
 
 
 # ----------------------------------------------------------------------
@@ -271,11 +271,10 @@ def run_backtest() -> None:
     reported profit to estimate ending account value.
     """
     # Load data from file or fetch from API
-    if DATA_FILE and os.path.exists(DATA_FILE):
-        print(f"Loading data from file: {DATA_FILE}")
-        data = _pd.read_csv(DATA_FILE)
-        data["datetime"] = _pd.to_datetime(data["datetime"])
-        data = data.sort_values("datetime").reset_index(drop=True)
+    data_path = find_ohlcv_file(DATA_FILE)
+    if data_path is not None:
+        print(f"Loading data from file: {data_path}")
+        data = load_ohlcv(data_path)
         print(f"Loaded {len(data)} candles from file")
         print(f"Date range: {data['datetime'].min()} to {data['datetime'].max()}")
     else:
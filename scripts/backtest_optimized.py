@@ -13,8 +13,9 @@ Usage
     python backtest_optimized.py
 """
 
-import os
+import math
 import sys
+from functools import partial
 from pathlib import Path
 
 # Add project root to path for imports
@@ -25,14 +26,35 @@ sys.path.insert(0, str(project_root / "src"))
 import numpy as _np
 import pandas as _pd
 from dataclasses import dataclass, field
-from typing import List, Optional
+from typing import Dict, List, Optional, Sequence, Tuple
+
+try:
+    from numba import njit as _njit  # type: ignore[import]
+    _HAVE_NUMBA = True
+except ImportError:
+    # numba not installed, the simulator kernels run as plain Python
+    _HAVE_NUMBA = False
+
+    def _njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
 
 from utils import (
     fetch_historical_ohlcv,
     ema,
     rsi,
     bollinger_bands,
+    adx,
+    atr,
+    sma,
 )
+from ohlcv_store import find_ohlcv_file, open_ohlcv
+from indicator_cache import get_indicator, get_indicator_arrays, indicator_name
+from intrabar import TOUCH_TARGET, IntrabarPath, open_intrabar_path
+from param_search import Real, SearchSpace
+from result_store import ResultStore, ResultSummary
+from sweep import run_sweep
 
 
 # ----------------------------------------------------------------------
@@ -50,6 +72,8 @@ from config import (
     # Risk management
     RISK_PER_TRADE,
     FEE_PER_TRADE,
+    EXIT_FILL,
+    INTRABAR_DATA_FILE,
     # Strategy parameters
     STOP_PCT,
     RR_EMA,
@@ -59,6 +83,7 @@ from config import (
     ATR_BREAKOUT_MULTIPLIER,
     ATR_SL_MULTIPLIER,
     ATR_TP_RR,
+    INDICATOR_SMOOTHING,
     # Filter parameters
     MIN_VOLUME_MULTIPLIER,
     MIN_ADX,
@@ -74,53 +99,6 @@ from config import (
 )
 
 
-# ----------------------------------------------------------------------
-# Additional indicators
-# ----------------------------------------------------------------------
-
-def adx(high: _pd.Series, low: _pd.Series, close: _pd.Series, period: int = 14) -> _pd.Series:
-    """
-    Calculate Average Directional Index (ADX) to measure trend strength.
-    Higher ADX (>25) indicates strong trend.
-    """
-    # Calculate True Range
-    tr1 = high - low
-    tr2 = abs(high - close.shift())
-    tr3 = abs(low - close.shift())
-    tr = _pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-    
-    # Calculate Directional Movement
-    plus_dm = high.diff()
-    minus_dm = -low.diff()
-    plus_dm[plus_dm < 0] = 0
-    minus_dm[minus_dm < 0] = 0
-    
-    # Calculate smoothed values
-    atr = tr.rolling(period).mean()
-    plus_di = 100 * (plus_dm.rolling(period).mean() / atr)
-    minus_di = 100 * (minus_dm.rolling(period).mean() / atr)
-    
-    # Calculate ADX
-    dx = 100 * abs(plus_di - minus_di) / (plus_di + minus_di)
-    adx = dx.rolling(period).mean()
-    
-    return adx
-
-
-def atr(high: _pd.Series, low: _pd.Series, close: _pd.Series, period: int = 14) -> _pd.Series:
-    """Calculate Average True Range (ATR) for volatility measurement."""
-    tr1 = high - low
-    tr2 = abs(high - close.shift())
-    tr3 = abs(low - close.shift())
-    tr = _pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-    return tr.rolling(period).mean()
-
-
-def sma(series: _pd.Series, window: int) -> _pd.Series:
-    """Simple Moving Average."""
-    return series.rolling(window).mean()
-
-
 # ----------------------------------------------------------------------
 # Strategy definitions (same as original)
 # ----------------------------------------------------------------------
@@ -175,83 +153,742 @@ class StrategyResult:
         return sum(losses) / len(losses) if losses else 0.0
 
 
-def backtest_strategy(
-    df: _pd.DataFrame,
-    signals: _np.ndarray,
-    rr: float,
-    stop_pct: float,
-    name: str,
-) -> StrategyResult:
-    """Execute backtest with same logic as original."""
-    result = StrategyResult(name)
+@dataclass
+class TradeArrays:
+    """
+    Column-oriented trade list produced by :func:`simulate_trades`.
+
+    ``exit_price`` is set when exits can fill away from the candle close
+    (``fill="high_low"``); otherwise exits are at ``close[exit_idx]``.
+    """
+    entry_idx: _np.ndarray
+    exit_idx: _np.ndarray
+    direction: _np.ndarray
+    quantity: _np.ndarray
+    profit: _np.ndarray
+    exit_price: Optional[_np.ndarray] = None
+    pruned: str = ""
+
+    def __len__(self) -> int:
+        return len(self.entry_idx)
+
+
+@dataclass
+class PruneLimits:
+    """
+    Early-abort constraints for optimization backtests.
+
+    A simulation stops as soon as its result is certain to be discarded:
+    more than ``max_trades`` trades closed, ``min_trades`` no longer
+    reachable with the entry signals left, a drawdown of the running P/L
+    (from its peak, starting at 0) above ``max_drawdown`` or a running P/L
+    below ``profit_floor`` (USD).  None disables a limit.  The trades
+    simulated up to that point are returned with ``pruned`` set to the
+    name of the violated limit (``min_signals`` for ``min_trades``); these
+    partial results are never stored.  A complete run with fewer than
+    ``min_trades`` trades is marked ``min_trades``.
+    """
+    max_trades: Optional[int] = None
+    min_trades: Optional[int] = None
+    max_drawdown: Optional[float] = None
+    profit_floor: Optional[float] = None
+
+    def kernel_args(self, n: int) -> Tuple[int, int, float, float]:
+        """Limits as kernel scalars, with no-op values for disabled limits."""
+        return (
+            n + 1 if self.max_trades is None else int(self.max_trades),
+            0 if self.min_trades is None else int(self.min_trades),
+            _np.inf if self.max_drawdown is None else float(self.max_drawdown),
+            -_np.inf if self.profit_floor is None else float(self.profit_floor),
+        )
+
+    def check(self, summary) -> str:
+        """
+        Name of the first limit a complete result violates, or "".
+
+        ``summary`` is a ``ResultSummary`` (or anything with its
+        ``trade_count``, ``max_drawdown`` and ``lowest_profit``).
+        """
+        if self.max_trades is not None and summary.trade_count > self.max_trades:
+            return "max_trades"
+        if self.min_trades is not None and summary.trade_count < self.min_trades:
+            return "min_trades"
+        if self.max_drawdown is not None and summary.max_drawdown > self.max_drawdown:
+            return "max_drawdown"
+        if self.profit_floor is not None and summary.lowest_profit < self.profit_floor:
+            return "profit_floor"
+        return ""
+
+
+FILL_MODES = ("close", "high_low")
+
+# Exit codes of _bar_exit
+_EXIT_NONE = 0
+_EXIT_STOP = 1
+_EXIT_TARGET = 2
+_EXIT_BOTH = 3
+_EXIT_SIGNAL = 4
+
+# Early-abort codes returned by the kernels, indexing PRUNE_REASONS
+PRUNE_REASONS = ("", "max_trades", "min_signals", "max_drawdown", "profit_floor")
+
+
+@_njit(cache=True)
+def _prune_code(n_trades, signals_left, equity, peak, max_trades, min_trades, max_drawdown, profit_floor):
+    """Limit violated after a trade closed (see :class:`PruneLimits`), or 0."""
+    if n_trades > max_trades:
+        return 1
+    if n_trades + signals_left < min_trades:
+        return 2
+    if peak - equity > max_drawdown:
+        return 3
+    if equity < profit_floor:
+        return 4
+    return 0
+
+
+@_njit(cache=True)
+def _simulate_trades_kernel(
+    close,
+    long_stop,
+    long_tp,
+    short_stop,
+    short_tp,
+    tradable,
+    signals,
+    risk_per_trade,
+    fee_per_trade,
+    total_signals,
+    max_trades,
+    min_trades,
+    max_drawdown,
+    profit_floor,
+    entry_idx,
+    exit_idx,
+    directions,
+    quantities,
+    profits,
+):
+    """
+    Single-position state machine over contiguous arrays.
+
+    Written in the numba subset (scalars, arrays, no Python objects) so it
+    is JIT-compiled when numba is available.  Fills the preallocated output
+    arrays and returns ``(n_trades, prune_code)``: the number of closed
+    trades and, if a pruning limit stopped the run early, its index in
+    ``PRUNE_REASONS`` (0 otherwise).  ``total_signals`` is the number of
+    non-zero signals on tradable candles, used to tell when ``min_trades``
+    can no longer be reached.
+    """
+    n_trades = 0
+    seen = 0
+    equity = 0.0
+    peak = 0.0
     in_pos = False
-    direction: Optional[int] = None
-    entry_price: float = 0.0
-    entry_time: _pd.Timestamp
-    stop: float = 0.0
-    tp: float = 0.0
-    quantity: float = 0.0
-    
-    for i, row in df.iterrows():
+    direction = 0
+    entry_i = 0
+    entry_price = 0.0
+    stop = 0.0
+    tp = 0.0
+    quantity = 0.0
+
+    for i in range(len(close)):
+        if not tradable[i]:
+            continue
+
+        price = close[i]
+        sig = signals[i]
+        if sig != 0:
+            seen += 1
+
         if not in_pos:
-            if signals[i] == 1:
-                direction = 1
-                entry_price = row["close"]
-                entry_time = row["datetime"]
-                stop = entry_price * (1 - stop_pct)
-                tp = entry_price * (1 + stop_pct * rr)
-                quantity = RISK_PER_TRADE / (entry_price - stop)
-                in_pos = True
-            elif signals[i] == -1:
-                direction = -1
-                entry_price = row["close"]
-                entry_time = row["datetime"]
-                stop = entry_price * (1 + stop_pct)
-                tp = entry_price * (1 - stop_pct * rr)
-                quantity = RISK_PER_TRADE / (stop - entry_price)
+            if sig == 1:
+                stop = long_stop[i]
+                tp = long_tp[i]
+                risk = price - stop
+            elif sig == -1:
+                stop = short_stop[i]
+                tp = short_tp[i]
+                risk = stop - price
+            else:
+                continue
+            if risk > 0:
+                direction = sig
+                entry_i = i
+                entry_price = price
+                quantity = risk_per_trade / risk
                 in_pos = True
         else:
-            price = row["close"]
             exit_flag = False
-            profit = 0.0
             if direction == 1:
-                if price <= stop:
-                    profit = (price - entry_price) * quantity - FEE_PER_TRADE
+                if price <= stop or price >= tp or sig == -1:
+                    profit = (price - entry_price) * quantity - fee_per_trade
                     exit_flag = True
-                elif price >= tp:
-                    profit = (price - entry_price) * quantity - FEE_PER_TRADE
-                    exit_flag = True
-                elif signals[i] == -1:
-                    profit = (price - entry_price) * quantity - FEE_PER_TRADE
-                    exit_flag = True
-            elif direction == -1:
-                if price >= stop:
-                    profit = (entry_price - price) * quantity - FEE_PER_TRADE
-                    exit_flag = True
-                elif price <= tp:
-                    profit = (entry_price - price) * quantity - FEE_PER_TRADE
-                    exit_flag = True
-                elif signals[i] == 1:
-                    profit = (entry_price - price) * quantity - FEE_PER_TRADE
+            else:
+                if price >= stop or price <= tp or sig == 1:
+                    profit = (entry_price - price) * quantity - fee_per_trade
                     exit_flag = True
+
             if exit_flag:
-                result.trades.append(
-                    Trade(
-                        entry_time=entry_time,
-                        entry_price=entry_price,
-                        exit_time=row["datetime"],
-                        exit_price=price,
-                        direction="long" if direction == 1 else "short",
-                        quantity=quantity,
-                        profit=profit,
-                    )
+                entry_idx[n_trades] = entry_i
+                exit_idx[n_trades] = i
+                directions[n_trades] = direction
+                quantities[n_trades] = quantity
+                profits[n_trades] = profit
+                n_trades += 1
+                in_pos = False
+                direction = 0
+                quantity = 0.0
+
+                equity += profit
+                if equity > peak:
+                    peak = equity
+                code = _prune_code(
+                    n_trades, total_signals - seen, equity, peak,
+                    max_trades, min_trades, max_drawdown, profit_floor,
                 )
+                if code != 0:
+                    return n_trades, code
+
+    return n_trades, 0
+
+
+@_njit(cache=True)
+def _bar_exit(direction, open_, high, low, stop, tp):
+    """
+    Stop / target check of one candle against its open, high and low.
+
+    Returns ``(code, price)``: a gap through a level at the open fills at
+    the open; otherwise a touched level fills at the level.  ``code`` is
+    ``_EXIT_BOTH`` when the candle touched both levels, so the order is
+    unknown.
+    """
+    if direction == 1:
+        if open_ <= stop:
+            return _EXIT_STOP, open_
+        if open_ >= tp:
+            return _EXIT_TARGET, open_
+        hit_stop = low <= stop
+        hit_tp = high >= tp
+    else:
+        if open_ >= stop:
+            return _EXIT_STOP, open_
+        if open_ <= tp:
+            return _EXIT_TARGET, open_
+        hit_stop = high >= stop
+        hit_tp = low <= tp
+    if hit_stop and hit_tp:
+        return _EXIT_BOTH, 0.0
+    if hit_stop:
+        return _EXIT_STOP, stop
+    if hit_tp:
+        return _EXIT_TARGET, tp
+    return _EXIT_NONE, 0.0
+
+
+@_njit(cache=True)
+def _simulate_trades_hl_kernel(
+    open_,
+    high,
+    low,
+    close,
+    long_stop,
+    long_tp,
+    short_stop,
+    short_tp,
+    tradable,
+    signals,
+    risk_per_trade,
+    fee_per_trade,
+    total_signals,
+    max_trades,
+    min_trades,
+    max_drawdown,
+    profit_floor,
+    state,
+    resolve,
+    n_trades,
+    entry_idx,
+    exit_idx,
+    directions,
+    quantities,
+    profits,
+    exit_prices,
+):
+    """
+    High/low variant of :func:`_simulate_trades_kernel`.
+
+    Stops and targets are checked against each candle's range
+    (:func:`_bar_exit`).  When a candle touched both, the kernel saves its
+    position in ``state`` (start index, in position, direction, entry
+    index, entry price, stop, target, quantity, signals seen, running P/L,
+    peak P/L) and returns ``(n_trades, i)`` so the caller can resolve
+    candle ``i``; it is then resumed from ``state`` with ``resolve`` set to
+    the level hit first.  Returns ``(n_trades, -1)`` when the data is
+    exhausted or a pruning limit stopped the run; in the latter case
+    ``state[11]`` holds the ``PRUNE_REASONS`` index.
+    """
+    start = int(state[0])
+    in_pos = state[1] != 0.0
+    direction = int(state[2])
+    entry_i = int(state[3])
+    entry_price = state[4]
+    stop = state[5]
+    tp = state[6]
+    quantity = state[7]
+    seen = int(state[8])
+    equity = state[9]
+    peak = state[10]
+
+    for i in range(start, len(close)):
+        if not tradable[i]:
+            continue
+
+        price = close[i]
+        sig = signals[i]
+        if sig != 0:
+            seen += 1
+
+        if not in_pos:
+            if sig == 1:
+                stop = long_stop[i]
+                tp = long_tp[i]
+                risk = price - stop
+            elif sig == -1:
+                stop = short_stop[i]
+                tp = short_tp[i]
+                risk = stop - price
+            else:
+                continue
+            if risk > 0:
+                direction = sig
+                entry_i = i
+                entry_price = price
+                quantity = risk_per_trade / risk
+                in_pos = True
+        else:
+            code, exit_price = _bar_exit(direction, open_[i], high[i], low[i], stop, tp)
+            if code == _EXIT_BOTH:
+                if i == start and resolve != _EXIT_NONE:
+                    code = resolve
+                    exit_price = stop if resolve == _EXIT_STOP else tp
+                else:
+                    state[0] = i
+                    state[1] = 1.0
+                    state[2] = direction
+                    state[3] = entry_i
+                    state[4] = entry_price
+                    state[5] = stop
+                    state[6] = tp
+                    state[7] = quantity
+                    # Candle i is evaluated again on resume
+                    state[8] = seen - 1 if sig != 0 else seen
+                    state[9] = equity
+                    state[10] = peak
+                    return n_trades, i
+            if code == _EXIT_NONE and sig == -direction:
+                code = _EXIT_SIGNAL
+                exit_price = price
+
+            if code != _EXIT_NONE:
+                entry_idx[n_trades] = entry_i
+                exit_idx[n_trades] = i
+                directions[n_trades] = direction
+                quantities[n_trades] = quantity
+                profit = (exit_price - entry_price) * direction * quantity - fee_per_trade
+                profits[n_trades] = profit
+                exit_prices[n_trades] = exit_price
+                n_trades += 1
                 in_pos = False
-                direction = None
+                direction = 0
                 quantity = 0.0
+
+                equity += profit
+                if equity > peak:
+                    peak = equity
+                code = _prune_code(
+                    n_trades, total_signals - seen, equity, peak,
+                    max_trades, min_trades, max_drawdown, profit_floor,
+                )
+                if code != 0:
+                    state[11] = code
+                    return n_trades, -1
+
+    return n_trades, -1
+
+
+def bar_timestamps(df) -> _np.ndarray:
+    """Candle open times of ``df`` as int64 milliseconds."""
+    return df["datetime"].to_numpy(dtype="datetime64[ms]").view(_np.int64)
+
+
+def bar_length_ms(timestamps: _np.ndarray) -> int:
+    """Typical candle length (median spacing) of sorted ms timestamps."""
+    if len(timestamps) < 2:
+        return 0
+    return int(_np.median(_np.diff(timestamps)))
+
+
+_DEFAULT_INTRABAR_PATH: Optional[IntrabarPath] = None
+
+
+def default_intrabar_path() -> Optional[IntrabarPath]:
+    """``INTRABAR_DATA_FILE`` opened once (memory-mapped if binary), or None."""
+    global _DEFAULT_INTRABAR_PATH
+    if _DEFAULT_INTRABAR_PATH is None and INTRABAR_DATA_FILE:
+        path = find_ohlcv_file(INTRABAR_DATA_FILE)
+        if path is not None:
+            _DEFAULT_INTRABAR_PATH = open_intrabar_path(path)
+    return _DEFAULT_INTRABAR_PATH
+
+
+def resolve_both_touched(
+    drill_down: Optional[IntrabarPath],
+    bar_start_ms: int,
+    bar_end_ms: int,
+    direction: int,
+    stop: float,
+    tp: float,
+) -> int:
+    """
+    Level hit first in a candle that touched both stop and target.
+
+    Looks the candle up in ``drill_down`` when given; if the order is
+    still unknown the stop is assumed to fill first (conservative).
+    """
+    if drill_down is not None:
+        touch = drill_down.first_touch(bar_start_ms, bar_end_ms, direction, stop, tp)
+        if touch == TOUCH_TARGET:
+            return _EXIT_TARGET
+    return _EXIT_STOP
+
+
+def bar_exit(
+    direction: int,
+    open_: float,
+    high: float,
+    low: float,
+    stop: float,
+    tp: float,
+    bar_start_ms: int = 0,
+    bar_end_ms: int = 0,
+    drill_down: Optional[IntrabarPath] = None,
+) -> Optional[float]:
+    """
+    Exit price of an open position in one candle, or None if neither the
+    stop nor the target was touched.
+
+    Same rules as ``fill="high_low"`` in :func:`simulate_trades`, for
+    simulators written as Python loops.
+    """
+    code, price = _bar_exit(direction, open_, high, low, stop, tp)
+    if code == _EXIT_BOTH:
+        code = resolve_both_touched(drill_down, bar_start_ms, bar_end_ms, direction, stop, tp)
+        price = stop if code == _EXIT_STOP else tp
+    if code == _EXIT_NONE:
+        return None
+    return price
+
+
+def _simulate_trades_high_low(
+    close, signals, long_stop, long_tp, short_stop, short_tp, tradable,
+    risk_per_trade, fee_per_trade, bars, drill_down, limits,
+) -> TradeArrays:
+    """Driver for :func:`_simulate_trades_hl_kernel` (see :func:`simulate_trades`)."""
+    n = len(close)
+    open_ = _np.ascontiguousarray(bars["open"], dtype=_np.float64)
+    high = _np.ascontiguousarray(bars["high"], dtype=_np.float64)
+    low = _np.ascontiguousarray(bars["low"], dtype=_np.float64)
+    timestamps = bars.get("timestamp")
+    bar_ms = bar_length_ms(timestamps) if timestamps is not None else 0
+
+    capacity = n // 2 + 1
+    state = _np.zeros(12, dtype=_np.float64)
+    entry_idx = _np.empty(capacity, dtype=_np.int64)
+    exit_idx = _np.empty(capacity, dtype=_np.int64)
+    directions = _np.empty(capacity, dtype=_np.int64)
+    quantities = _np.empty(capacity, dtype=_np.float64)
+    profits = _np.empty(capacity, dtype=_np.float64)
+    exit_prices = _np.empty(capacity, dtype=_np.float64)
+    inputs = (open_, high, low, close, long_stop, long_tp, short_stop, short_tp, tradable, signals)
+    outputs = (entry_idx, exit_idx, directions, quantities, profits, exit_prices)
+    if not _HAVE_NUMBA:
+        # Plain Python indexes lists much faster than NumPy scalars
+        inputs = tuple(arr.tolist() for arr in inputs)
+        state = state.tolist()
+        outputs = tuple(arr.tolist() for arr in outputs)
+
+    n_trades = 0
+    resolve = _EXIT_NONE
+    while True:
+        n_trades, paused = _simulate_trades_hl_kernel(
+            *inputs, float(risk_per_trade), float(fee_per_trade), *limits,
+            state, resolve, n_trades, *outputs,
+        )
+        if paused < 0:
+            break
+        # Lazy drill-down, only for candles that touched both levels
+        if timestamps is not None and drill_down is not None:
+            start_ms = int(timestamps[paused])
+            end_ms = int(timestamps[paused + 1]) if paused + 1 < n else start_ms + bar_ms
+            resolve = resolve_both_touched(drill_down, start_ms, end_ms, int(state[2]), state[5], state[6])
+        else:
+            resolve = _EXIT_STOP
+
+    columns = [_np.asarray(col[:n_trades]) for col in outputs]
+    return TradeArrays(
+        entry_idx=columns[0].astype(_np.int64, copy=False),
+        exit_idx=columns[1].astype(_np.int64, copy=False),
+        direction=columns[2].astype(_np.int64, copy=False),
+        quantity=columns[3].astype(_np.float64, copy=False),
+        profit=columns[4].astype(_np.float64, copy=False),
+        exit_price=columns[5].astype(_np.float64, copy=False),
+        pruned=PRUNE_REASONS[int(state[11])],
+    )
+
+
+def intrabar_bars(df) -> Dict[str, _np.ndarray]:
+    """Open / high / low / timestamp arrays of ``df`` for ``fill="high_low"``."""
+    return {
+        "open": df["open"].to_numpy(dtype=_np.float64),
+        "high": df["high"].to_numpy(dtype=_np.float64),
+        "low": df["low"].to_numpy(dtype=_np.float64),
+        "timestamp": bar_timestamps(df),
+    }
+
+
+def _check_min_trades(trades: TradeArrays, min_trades: int) -> TradeArrays:
+    """Mark a run that ended with fewer than ``min_trades`` trades as pruned."""
+    if not trades.pruned and len(trades) < min_trades:
+        trades.pruned = "min_trades"
+    return trades
+
+
+def simulate_trades(
+    close: _np.ndarray,
+    signals: _np.ndarray,
+    long_stop: _np.ndarray,
+    long_tp: _np.ndarray,
+    short_stop: _np.ndarray,
+    short_tp: _np.ndarray,
+    tradable: Optional[_np.ndarray] = None,
+    risk_per_trade: float = RISK_PER_TRADE,
+    fee_per_trade: float = FEE_PER_TRADE,
+    bars: Optional[Dict[str, _np.ndarray]] = None,
+    drill_down: Optional[IntrabarPath] = None,
+    prune: Optional[PruneLimits] = None,
+) -> TradeArrays:
+    """
+    Run the single-position trade simulator on plain NumPy arrays.
+
+    Entries happen on the close of a signal candle using that candle's
+    stop/take-profit levels.  Exits happen on the first later close that
+    hits the stop, the target, or an opposite signal.  Candles where
+    ``tradable`` is False are skipped entirely, as the pandas loops did
+    for NaN ATR rows.
+
+    With ``bars`` (``open``/``high``/``low`` and optionally ``timestamp``
+    arrays, see :func:`intrabar_bars`) stops and targets are instead
+    checked against each later candle's high and low and fill at the level
+    (or at the open after a gap).  A candle that touched both levels is
+    looked up lazily in ``drill_down`` (higher-resolution data, indexed by
+    timestamp) to find which was hit first; without it, or if that data
+    cannot tell, the stop is assumed to fill first.
+
+    ``prune`` stops the simulation as soon as the result violates one of
+    its limits (see :class:`PruneLimits`); a run with fewer entry signals
+    than ``prune.min_trades`` is not simulated at all.
+    """
+    close = _np.ascontiguousarray(close, dtype=_np.float64)
+    signals = _np.ascontiguousarray(signals, dtype=_np.int64)
+    n = len(close)
+    if tradable is None:
+        tradable = _np.ones(n, dtype=_np.bool_)
+    else:
+        tradable = _np.ascontiguousarray(tradable, dtype=_np.bool_)
+
+    if prune is None:
+        prune = PruneLimits()
+    total_signals = int(_np.count_nonzero(signals[tradable]))
+    max_trades, min_trades, max_drawdown, profit_floor = prune.kernel_args(n)
+    if total_signals < min_trades:
+        # Every trade needs an entry signal
+        empty = _np.empty(0, dtype=_np.int64)
+        return TradeArrays(empty, empty, empty, _np.empty(0), _np.empty(0), pruned="min_signals")
+    limits = (total_signals, max_trades, min_trades, max_drawdown, profit_floor)
+
+    capacity = n // 2 + 1
+    long_stop = _np.ascontiguousarray(long_stop, dtype=_np.float64)
+    long_tp = _np.ascontiguousarray(long_tp, dtype=_np.float64)
+    short_stop = _np.ascontiguousarray(short_stop, dtype=_np.float64)
+    short_tp = _np.ascontiguousarray(short_tp, dtype=_np.float64)
+
+    if bars is not None:
+        return _check_min_trades(_simulate_trades_high_low(
+            close, signals, long_stop, long_tp, short_stop, short_tp, tradable,
+            risk_per_trade, fee_per_trade, bars, drill_down, limits,
+        ), min_trades)
+
+    if _HAVE_NUMBA:
+        entry_idx = _np.empty(capacity, dtype=_np.int64)
+        exit_idx = _np.empty(capacity, dtype=_np.int64)
+        directions = _np.empty(capacity, dtype=_np.int64)
+        quantities = _np.empty(capacity, dtype=_np.float64)
+        profits = _np.empty(capacity, dtype=_np.float64)
+        n_trades, code = _simulate_trades_kernel(
+            close, long_stop, long_tp, short_stop, short_tp, tradable, signals,
+            float(risk_per_trade), float(fee_per_trade), *limits,
+            entry_idx, exit_idx, directions, quantities, profits,
+        )
+    else:
+        # Plain Python indexes lists much faster than NumPy scalars
+        entry_idx = [0] * capacity
+        exit_idx = [0] * capacity
+        directions = [0] * capacity
+        quantities = [0.0] * capacity
+        profits = [0.0] * capacity
+        n_trades, code = _simulate_trades_kernel(
+            close.tolist(), long_stop.tolist(), long_tp.tolist(),
+            short_stop.tolist(), short_tp.tolist(), tradable.tolist(), signals.tolist(),
+            float(risk_per_trade), float(fee_per_trade), *limits,
+            entry_idx, exit_idx, directions, quantities, profits,
+        )
+        entry_idx = _np.array(entry_idx[:n_trades], dtype=_np.int64)
+        exit_idx = _np.array(exit_idx[:n_trades], dtype=_np.int64)
+        directions = _np.array(directions[:n_trades], dtype=_np.int64)
+        quantities = _np.array(quantities[:n_trades], dtype=_np.float64)
+        profits = _np.array(profits[:n_trades], dtype=_np.float64)
+
+    return _check_min_trades(TradeArrays(
+        entry_idx=entry_idx[:n_trades],
+        exit_idx=exit_idx[:n_trades],
+        direction=directions[:n_trades],
+        quantity=quantities[:n_trades],
+        profit=profits[:n_trades],
+        pruned=PRUNE_REASONS[code],
+    ), min_trades)
+
+
+def simulate_atr_trades(
+    close: _np.ndarray,
+    atr_val: _np.ndarray,
+    signals: _np.ndarray,
+    sl_mult: float = ATR_SL_MULTIPLIER,
+    tp_rr: float = ATR_TP_RR,
+    risk_per_trade: float = RISK_PER_TRADE,
+    fee_per_trade: float = FEE_PER_TRADE,
+    bars: Optional[Dict[str, _np.ndarray]] = None,
+    drill_down: Optional[IntrabarPath] = None,
+    prune: Optional[PruneLimits] = None,
+) -> TradeArrays:
+    """
+    Simulate ATR-based stop loss / take profit exits on NumPy arrays.
+
+    ``bars`` / ``drill_down`` select high/low exits and ``prune`` early
+    aborts (see :func:`simulate_trades`).
+    """
+    close = _np.asarray(close, dtype=_np.float64)
+    atr_val = _np.asarray(atr_val, dtype=_np.float64)
+    return simulate_trades(
+        close,
+        signals,
+        long_stop=close - (sl_mult * atr_val),
+        long_tp=close + (tp_rr * atr_val),
+        short_stop=close + (sl_mult * atr_val),
+        short_tp=close - (tp_rr * atr_val),
+        tradable=~_np.isnan(atr_val),
+        risk_per_trade=risk_per_trade,
+        fee_per_trade=fee_per_trade,
+        bars=bars,
+        drill_down=drill_down,
+        prune=prune,
+    )
+
+
+def fill_inputs(df, fill: str, drill_down: Optional[IntrabarPath] = None):
+    """
+    ``(bars, drill_down)`` arguments of :func:`simulate_trades` for a fill mode.
+
+    ``fill="close"`` gives ``(None, None)``; ``fill="high_low"`` gives the
+    candle arrays of ``df`` and ``drill_down`` (default:
+    :func:`default_intrabar_path`).
+    """
+    if fill not in FILL_MODES:
+        raise ValueError(f"Unknown fill mode '{fill}'. Use one of: {', '.join(FILL_MODES)}")
+    if fill == "close":
+        return None, None
+    return intrabar_bars(df), drill_down if drill_down is not None else default_intrabar_path()
+
+
+def trades_to_result(
+    df: _pd.DataFrame,
+    trades: TradeArrays,
+    name: str,
+) -> StrategyResult:
+    """Materialize :class:`Trade` objects for a simulated trade list."""
+    result = StrategyResult(name)
+    if len(trades) == 0:
+        return result
+
+    close = df["close"].to_numpy(dtype=float)
+    times = df["datetime"]
+    entry_times = times.iloc[trades.entry_idx].tolist()
+    exit_times = times.iloc[trades.exit_idx].tolist()
+    entry_prices = close[trades.entry_idx].tolist()
+    if trades.exit_price is not None:
+        exit_prices = trades.exit_price.tolist()
+    else:
+        exit_prices = close[trades.exit_idx].tolist()
+
+    for k, (direction, quantity, profit) in enumerate(zip(
+        trades.direction.tolist(),
+        trades.quantity.tolist(),
+        trades.profit.tolist(),
+    )):
+        result.trades.append(
+            Trade(
+                entry_time=entry_times[k],
+                entry_price=entry_prices[k],
+                exit_time=exit_times[k],
+                exit_price=exit_prices[k],
+                direction="long" if direction == 1 else "short",
+                quantity=quantity,
+                profit=profit,
+            )
+        )
     return result
 
 
+def backtest_strategy(
+    df: _pd.DataFrame,
+    signals: _np.ndarray,
+    rr: float,
+    stop_pct: float,
+    name: str,
+    fill: str = EXIT_FILL,
+    drill_down: Optional[IntrabarPath] = None,
+) -> StrategyResult:
+    """
+    Execute backtest with same logic as original.
+
+    ``fill="high_low"`` checks stops and targets against candle highs and
+    lows (see :func:`simulate_trades`).
+    """
+    close = df["close"].to_numpy(dtype=float)
+    bars, drill_down = fill_inputs(df, fill, drill_down)
+    trades = simulate_trades(
+        close,
+        signals,
+        long_stop=close * (1 - stop_pct),
+        long_tp=close * (1 + stop_pct * rr),
+        short_stop=close * (1 + stop_pct),
+        short_tp=close * (1 - stop_pct * rr),
+        bars=bars,
+        drill_down=drill_down,
+    )
+    return trades_to_result(df, trades, name)
+
+
 # ----------------------------------------------------------------------
 # Optimized strategy signal generators
 # ----------------------------------------------------------------------
@@ -267,8 +904,8 @@ def generate_ema_signals_optimized(df: _pd.DataFrame) -> _np.ndarray:
     ema_fast = ema(df["close"], 8)   # Optimized: 8 instead of 9
     ema_slow = ema(df["close"], 21)
     volume_sma = sma(df["volume"], 20)
-    adx_val = adx(df["high"], df["low"], df["close"], 14)
-    atr_val = atr(df["high"], df["low"], df["close"], 14)
+    adx_val = adx(df["high"], df["low"], df["close"], 14, smoothing=INDICATOR_SMOOTHING)
+    atr_val = atr(df["high"], df["low"], df["close"], 14, smoothing=INDICATOR_SMOOTHING)
     atr_pct = atr_val / df["close"]
     
     diff = ema_fast - ema_slow
@@ -301,9 +938,9 @@ def generate_bollinger_rsi_signals_optimized(df: _pd.DataFrame) -> _np.ndarray:
     - Price must be closer to bands
     """
     bands = bollinger_bands(df["close"], window=20, n_std=2.0)
-    rsi_val = rsi(df["close"], window=14)
+    rsi_val = rsi(df["close"], window=14, smoothing=INDICATOR_SMOOTHING)
     volume_sma = sma(df["volume"], 20)
-    adx_val = adx(df["high"], df["low"], df["close"], 14)
+    adx_val = adx(df["high"], df["low"], df["close"], 14, smoothing=INDICATOR_SMOOTHING)
     
     signals = _np.zeros(len(df), dtype=int)
     
@@ -345,8 +982,8 @@ def generate_macd_signals_optimized(df: _pd.DataFrame) -> _np.ndarray:
     signal_line = ema(macd_line, 9)
     
     volume_sma = sma(df["volume"], 20)
-    adx_val = adx(df["high"], df["low"], df["close"], 14)
-    atr_val = atr(df["high"], df["low"], df["close"], 14)
+    adx_val = adx(df["high"], df["low"], df["close"], 14, smoothing=INDICATOR_SMOOTHING)
+    atr_val = atr(df["high"], df["low"], df["close"], 14, smoothing=INDICATOR_SMOOTHING)
     atr_pct = atr_val / df["close"]
     
     diff = macd_line - signal_line
@@ -369,6 +1006,124 @@ def generate_macd_signals_optimized(df: _pd.DataFrame) -> _np.ndarray:
     return signals
 
 
+def atr_breakout_signals_from_arrays(
+    close: _np.ndarray,
+    volume: _np.ndarray,
+    ema_fast: _np.ndarray,
+    ema_slow: _np.ndarray,
+    atr_val: _np.ndarray,
+    rsi_val: _np.ndarray,
+    volume_sma: _np.ndarray,
+    adx_val: _np.ndarray,
+    atr_breakout_mult: float,
+    rsi_long_min: float,
+    rsi_long_max: float,
+    rsi_short_min: float,
+    rsi_short_max: float,
+    volume_mult: float,
+    adx_threshold: float,
+    warmup: int = 50,
+) -> _np.ndarray:
+    """
+    Evaluate the ATR Breakout rule set on indicator arrays as boolean masks.
+
+    Every candle is evaluated in one vectorized pass instead of a per-row
+    loop.  Candles before ``warmup`` or with any NaN indicator never signal,
+    which matches the historical loop exactly.
+
+    Returns
+    -------
+    numpy.ndarray
+        Integer array with 1 (LONG), -1 (SHORT) or 0 (no signal) per candle.
+    """
+    close = _np.asarray(close, dtype=float)
+    volume = _np.asarray(volume, dtype=float)
+    ema_fast = _np.asarray(ema_fast, dtype=float)
+    ema_slow = _np.asarray(ema_slow, dtype=float)
+    atr_val = _np.asarray(atr_val, dtype=float)
+    rsi_val = _np.asarray(rsi_val, dtype=float)
+    volume_sma = _np.asarray(volume_sma, dtype=float)
+    adx_val = _np.asarray(adx_val, dtype=float)
+
+    n = len(close)
+    signals = _np.zeros(n, dtype=int)
+    if n <= warmup:
+        return signals
+
+    # Rows with a complete set of indicators past the warm-up period
+    valid = ~(
+        _np.isnan(ema_fast) | _np.isnan(ema_slow) | _np.isnan(atr_val)
+        | _np.isnan(rsi_val) | _np.isnan(volume_sma) | _np.isnan(adx_val)
+    )
+    valid[:warmup] = False
+
+    # Filters
+    valid &= volume >= volume_sma * volume_mult
+    valid &= adx_val >= adx_threshold
+
+    # Breakout levels
+    breakout_long = ema_fast + (atr_breakout_mult * atr_val)
+    breakout_short = ema_fast - (atr_breakout_mult * atr_val)
+
+    long_mask = (
+        valid
+        & (ema_fast > ema_slow)
+        & (close > breakout_long)
+        & (rsi_val > rsi_long_min)
+        & (rsi_val < rsi_long_max)
+    )
+    short_mask = (
+        valid
+        & (ema_fast < ema_slow)
+        & (close < breakout_short)
+        & (rsi_val > rsi_short_min)
+        & (rsi_val < rsi_short_max)
+    )
+
+    signals[long_mask] = 1
+    signals[short_mask] = -1
+    return signals
+
+
+def atr_breakout_signals(
+    df: _pd.DataFrame,
+    atr_breakout_mult: float,
+    rsi_long_min: float,
+    rsi_long_max: float,
+    rsi_short_min: float,
+    rsi_short_max: float,
+    volume_mult: float,
+    adx_threshold: float,
+) -> _np.ndarray:
+    """
+    Generate ATR Breakout signals for explicit parameters.
+
+    Indicators are read from the shared indicator cache, so sweeping the
+    thresholds over the same dataset computes EMA/ATR/RSI/ADX only once.
+    """
+    if len(df) < 50:
+        return _np.zeros(len(df), dtype=int)
+    
+    ind = get_indicator_arrays(df, INDICATOR_SMOOTHING)
+    return atr_breakout_signals_from_arrays(
+        df["close"].to_numpy(dtype=float),
+        df["volume"].to_numpy(dtype=float),
+        ind.ema20,
+        ind.ema50,
+        ind.atr,
+        ind.rsi,
+        ind.volume_sma,
+        ind.adx,
+        atr_breakout_mult,
+        rsi_long_min,
+        rsi_long_max,
+        rsi_short_min,
+        rsi_short_max,
+        volume_mult,
+        adx_threshold,
+    )
+
+
 def generate_atr_breakout_signals(df: _pd.DataFrame) -> _np.ndarray:
     """
     Generate ATR Breakout signals with EMA trend filter and RSI filter.
@@ -383,166 +1138,337 @@ def generate_atr_breakout_signals(df: _pd.DataFrame) -> _np.ndarray:
     - Volume filter: volume >= 1.2× average
     - ADX filter: ADX >= 25 (strong trend)
     """
-    if len(df) < 50:
-        return _np.zeros(len(df), dtype=int)
-    
-    # Calculate indicators
-    ema20 = ema(df["close"], 20)
-    ema50 = ema(df["close"], 50)
-    atr_val = atr(df["high"], df["low"], df["close"], 14)
-    rsi_val = rsi(df["close"], window=14)
-    volume_sma = sma(df["volume"], 20)
-    adx_val = adx(df["high"], df["low"], df["close"], 14)
-    
-    signals = _np.zeros(len(df), dtype=int)
-    
-    for i in range(50, len(df)):  # Start from index 50 to have enough data
-        if (_pd.isna(ema20.iloc[i]) or _pd.isna(ema50.iloc[i]) or 
-            _pd.isna(atr_val.iloc[i]) or _pd.isna(rsi_val.iloc[i]) or
-            _pd.isna(volume_sma.iloc[i]) or _pd.isna(adx_val.iloc[i])):
-            continue
-        
-        current_price = df["close"].iloc[i]
-        ema20_current = ema20.iloc[i]
-        ema50_current = ema50.iloc[i]
-        atr_current = atr_val.iloc[i]
-        rsi_current = rsi_val.iloc[i]
-        volume_current = df["volume"].iloc[i]
-        adx_current = adx_val.iloc[i]
-        
-        # Filters - using config values
-        volume_ok = volume_current >= volume_sma.iloc[i] * VOLUME_MULTIPLIER
-        adx_ok = adx_current >= ADX_THRESHOLD
-        
-        if not (volume_ok and adx_ok):
-            continue
-        
-        # Calculate breakout levels
-        breakout_long = ema20_current + (ATR_BREAKOUT_MULTIPLIER * atr_current)
-        breakout_short = ema20_current - (ATR_BREAKOUT_MULTIPLIER * atr_current)
-        
-        # Trend filter: EMA20 > EMA50 → uptrend (only LONG)
-        if ema20_current > ema50_current:
-            # LONG signal: price breaks above EMA20 + (k × ATR)
-            if current_price > breakout_long:
-                # RSI filter: using config values
-                if RSI_LONG_MIN < rsi_current < RSI_LONG_MAX:
-                    signals[i] = 1
-        
-        # Trend filter: EMA20 < EMA50 → downtrend (only SHORT)
-        elif ema20_current < ema50_current:
-            # SHORT signal: price breaks below EMA20 - (k × ATR)
-            if current_price < breakout_short:
-                # RSI filter: using config values
-                if RSI_SHORT_MIN < rsi_current < RSI_SHORT_MAX:
-                    signals[i] = -1
-    
-    return signals
+    return atr_breakout_signals(
+        df,
+        ATR_BREAKOUT_MULTIPLIER,
+        RSI_LONG_MIN,
+        RSI_LONG_MAX,
+        RSI_SHORT_MIN,
+        RSI_SHORT_MAX,
+        VOLUME_MULTIPLIER,
+        ADX_THRESHOLD,
+    )
 
 
 def backtest_atr_breakout_strategy(
     df: _pd.DataFrame,
     signals: _np.ndarray,
     name: str,
+    fill: str = EXIT_FILL,
+    drill_down: Optional[IntrabarPath] = None,
 ) -> StrategyResult:
     """
     Execute backtest for ATR Breakout strategy.
     Uses ATR-based stop loss and take profit instead of percentage-based.
+    ``fill="high_low"`` checks them against candle highs and lows.
     """
-    result = StrategyResult(name)
-    in_pos = False
-    direction: Optional[int] = None
-    entry_price: float = 0.0
-    entry_time: _pd.Timestamp
-    stop: float = 0.0
-    tp: float = 0.0
-    quantity: float = 0.0
-    
-    # Calculate ATR for stop loss and take profit
-    atr_val = atr(df["high"], df["low"], df["close"], 14)
-    
-    for i, row in df.iterrows():
-        if _pd.isna(atr_val.iloc[i]):
-            continue
-            
-        current_atr = atr_val.iloc[i]
-        
-        if not in_pos:
-            if signals[i] == 1:
-                # Open long
-                direction = 1
-                entry_price = row["close"]
-                entry_time = row["datetime"]
-                # SL = Entry - (1 × ATR)
-                stop = entry_price - (ATR_SL_MULTIPLIER * current_atr)
-                # TP = Entry + (RR × ATR)
-                tp = entry_price + (ATR_TP_RR * current_atr)
-                # Calculate quantity based on risk
-                risk_amount = entry_price - stop
-                if risk_amount > 0:
-                    quantity = RISK_PER_TRADE / risk_amount
-                else:
-                    continue
-                in_pos = True
-            elif signals[i] == -1:
-                # Open short
-                direction = -1
-                entry_price = row["close"]
-                entry_time = row["datetime"]
-                # SL = Entry + (1 × ATR)
-                stop = entry_price + (ATR_SL_MULTIPLIER * current_atr)
-                # TP = Entry - (RR × ATR)
-                tp = entry_price - (ATR_TP_RR * current_atr)
-                # Calculate quantity based on risk
-                risk_amount = stop - entry_price
-                if risk_amount > 0:
-                    quantity = RISK_PER_TRADE / risk_amount
-                else:
-                    continue
-                in_pos = True
-        else:
-            price = row["close"]
-            exit_flag = False
-            profit = 0.0
-            
-            if direction == 1:  # Long position
-                if price <= stop:
-                    profit = (price - entry_price) * quantity - FEE_PER_TRADE
-                    exit_flag = True
-                elif price >= tp:
-                    profit = (price - entry_price) * quantity - FEE_PER_TRADE
-                    exit_flag = True
-                elif signals[i] == -1:  # Opposite signal
-                    profit = (price - entry_price) * quantity - FEE_PER_TRADE
-                    exit_flag = True
-            elif direction == -1:  # Short position
-                if price >= stop:
-                    profit = (entry_price - price) * quantity - FEE_PER_TRADE
-                    exit_flag = True
-                elif price <= tp:
-                    profit = (entry_price - price) * quantity - FEE_PER_TRADE
-                    exit_flag = True
-                elif signals[i] == 1:  # Opposite signal
-                    profit = (entry_price - price) * quantity - FEE_PER_TRADE
-                    exit_flag = True
-            
-            if exit_flag:
-                result.trades.append(
-                    Trade(
-                        entry_time=entry_time,
-                        entry_price=entry_price,
-                        exit_time=row["datetime"],
-                        exit_price=price,
-                        direction="long" if direction == 1 else "short",
-                        quantity=quantity,
-                        profit=profit,
-                    )
-                )
-                in_pos = False
-                direction = None
-                quantity = 0.0
+    # ATR for stop loss and take profit (shared with the signal generator)
+    atr_val = get_indicator(df, indicator_name("atr", INDICATOR_SMOOTHING), 14)
+    bars, drill_down = fill_inputs(df, fill, drill_down)
     
-    return result
+    trades = simulate_atr_trades(
+        df["close"].to_numpy(dtype=float),
+        atr_val,
+        signals,
+        sl_mult=ATR_SL_MULTIPLIER,
+        tp_rr=ATR_TP_RR,
+        bars=bars,
+        drill_down=drill_down,
+    )
+    return trades_to_result(df, trades, name)
+
+
+# ----------------------------------------------------------------------
+# Array-based ATR Breakout evaluation (parameter sweeps)
+# ----------------------------------------------------------------------
+
+# Column layout of an ATR Breakout parameter row
+ATR_PARAM_FIELDS = (
+    "atr_breakout_mult",
+    "atr_tp_rr",
+    "rsi_long_min",
+    "rsi_long_max",
+    "rsi_short_min",
+    "rsi_short_max",
+    "volume_mult",
+    "adx_threshold",
+    "atr_sl_mult",
+)
+
+
+def atr_breakout_arrays(df: _pd.DataFrame) -> Dict[str, _np.ndarray]:
+    """
+    Collect the price columns and cached indicators the ATR Breakout
+    strategy needs as plain float64 arrays (e.g. for shared memory).
+    The indicators come from the fused pipeline (one pass per dataset).
+    """
+    return {
+        "close": df["close"].to_numpy(dtype=_np.float64),
+        "volume": df["volume"].to_numpy(dtype=_np.float64),
+        **get_indicator_arrays(df, INDICATOR_SMOOTHING).as_dict(),
+    }
+
+
+def atr_breakout_signal_matrix(
+    arrays: Dict[str, _np.ndarray],
+    params: _np.ndarray,
+    warmup: int = 50,
+) -> _np.ndarray:
+    """
+    Evaluate ATR Breakout signals for many parameter sets at once.
+
+    ``params`` is a 2-D array whose columns follow ``ATR_PARAM_FIELDS``
+    (extra trailing columns are ignored).  Thresholds are broadcast against
+    the shared indicator arrays, so every rule is one
+    (n_params × n_candles) boolean operation.
+
+    Returns
+    -------
+    numpy.ndarray
+        int8 matrix of shape (n_params, n_candles) with 1 / -1 / 0 signals,
+        identical row by row to :func:`atr_breakout_signals_from_arrays`.
+    """
+    params = _np.atleast_2d(_np.asarray(params, dtype=_np.float64))
+    close = arrays["close"]
+    ema_fast = arrays["ema20"]
+    ema_slow = arrays["ema50"]
+    atr_val = arrays["atr"]
+    rsi_val = arrays["rsi"]
+    volume_sma = arrays["volume_sma"]
+    adx_val = arrays["adx"]
+
+    n = len(close)
+    signals = _np.zeros((len(params), n), dtype=_np.int8)
+    if n <= warmup:
+        return signals
+
+    # Parameter-independent masks, computed once for the whole batch
+    valid = ~(
+        _np.isnan(ema_fast) | _np.isnan(ema_slow) | _np.isnan(atr_val)
+        | _np.isnan(rsi_val) | _np.isnan(volume_sma) | _np.isnan(adx_val)
+    )
+    valid[:warmup] = False
+    uptrend = valid & (ema_fast > ema_slow)
+    downtrend = valid & (ema_fast < ema_slow)
+
+    def column(name: str) -> _np.ndarray:
+        return params[:, ATR_PARAM_FIELDS.index(name)][:, None]
+
+    k = column("atr_breakout_mult")
+    filters = (
+        (arrays["volume"] >= volume_sma * column("volume_mult"))
+        & (adx_val >= column("adx_threshold"))
+    )
+    long_mask = (
+        filters
+        & uptrend
+        & (close > ema_fast + (k * atr_val))
+        & (rsi_val > column("rsi_long_min"))
+        & (rsi_val < column("rsi_long_max"))
+    )
+    short_mask = (
+        filters
+        & downtrend
+        & (close < ema_fast - (k * atr_val))
+        & (rsi_val > column("rsi_short_min"))
+        & (rsi_val < column("rsi_short_max"))
+    )
+
+    signals[long_mask] = 1
+    signals[short_mask] = -1
+    return signals
+
+
+def simulate_atr_breakout_batch(
+    arrays: Dict[str, _np.ndarray],
+    params: _np.ndarray,
+    max_cells: int = 1 << 22,
+    prune: Optional[PruneLimits] = None,
+) -> List[Tuple[TradeArrays, int]]:
+    """
+    Backtest a 2-D matrix of ATR Breakout parameter sets.
+
+    Signal masks are evaluated for a chunk of parameter rows at a time
+    (at most ``max_cells`` parameter×candle cells to bound memory), then
+    each row is run through the trade simulator, which stops early on
+    rows that violate ``prune`` (see :class:`PruneLimits`).
+
+    Returns
+    -------
+    list of (TradeArrays, int)
+        Simulated trades and signal count per parameter row, in order.
+    """
+    params = _np.atleast_2d(_np.asarray(params, dtype=_np.float64))
+    n = max(len(arrays["close"]), 1)
+    chunk = max(1, max_cells // n)
+    tp_col = ATR_PARAM_FIELDS.index("atr_tp_rr")
+    sl_col = ATR_PARAM_FIELDS.index("atr_sl_mult")
+
+    out: List[Tuple[TradeArrays, int]] = []
+    for start in range(0, len(params), chunk):
+        block = params[start:start + chunk]
+        matrix = atr_breakout_signal_matrix(arrays, block)
+        counts = _np.count_nonzero(matrix, axis=1)
+        for row, signals, count in zip(block, matrix, counts):
+            trades = simulate_atr_trades(
+                arrays["close"],
+                arrays["atr"],
+                signals,
+                sl_mult=row[sl_col],
+                tp_rr=row[tp_col],
+                prune=prune,
+            )
+            out.append((trades, int(count)))
+    return out
+
+
+def backtest_atr_breakout_batch(
+    df: _pd.DataFrame,
+    params: _np.ndarray,
+    names: Optional[Sequence[str]] = None,
+) -> List[StrategyResult]:
+    """
+    Execute ATR Breakout backtests for every row of a parameter matrix.
+
+    ``params`` columns follow ``ATR_PARAM_FIELDS``.  This is the batched
+    counterpart of :func:`backtest_atr_breakout_strategy`.
+    """
+    params = _np.atleast_2d(_np.asarray(params, dtype=_np.float64))
+    if names is None:
+        names = [f"ATR Breakout #{i}" for i in range(len(params))]
+    evaluated = simulate_atr_breakout_batch(atr_breakout_arrays(df), params)
+    return [
+        trades_to_result(df, trades, name)
+        for (trades, _count), name in zip(evaluated, names)
+    ]
+
+
+def evaluate_atr_breakout_params(
+    arrays: Dict[str, _np.ndarray],
+    rows: Sequence[Sequence[float]],
+    prune: Optional[PruneLimits] = None,
+) -> List[Tuple[TradeArrays, int]]:
+    """
+    Backtest ATR Breakout parameter rows (see ``ATR_PARAM_FIELDS``) on
+    precomputed arrays.  Returns ``(trades, signal_count)`` per row.
+
+    This is the task function used by the parallel sweep executor (bind
+    ``prune`` with ``functools.partial``); each shard is evaluated with
+    the batched kernel.
+    """
+    return simulate_atr_breakout_batch(arrays, _np.asarray(rows, dtype=_np.float64), prune=prune)
+
+
+# Continuous search ranges for the search strategies in param_search
+ATR_SEARCH_SPACE = SearchSpace({
+    "atr_breakout_mult": Real(0.5, 2.5, 0.05),
+    "atr_tp_rr": Real(1.0, 4.0, 0.1),
+    "rsi_long_min": Real(45, 60, 1),
+    "rsi_long_max": Real(60, 80, 1),
+    "rsi_short_min": Real(20, 40, 1),
+    "rsi_short_max": Real(40, 55, 1),
+    "volume_mult": Real(1.0, 3.0, 0.1),
+    "adx_threshold": Real(15, 45, 1),
+})
+
+
+def atr_param_row(config: Dict[str, float], atr_sl_mult: float = 1.0) -> Tuple[float, ...]:
+    """Parameter row (``ATR_PARAM_FIELDS`` order) for a config keyed by field name."""
+    return tuple(float(config.get(name, atr_sl_mult if name == "atr_sl_mult" else 0.0)) for name in ATR_PARAM_FIELDS)
+
+
+# Bump when the ATR Breakout signal or trade simulation logic changes, so
+# results kept in the result store are recomputed
+ATR_BREAKOUT_VERSION = "1"
+
+
+def atr_breakout_version() -> str:
+    """Result store version: logic version plus the risk and indicator settings of every backtest."""
+    return f"{ATR_BREAKOUT_VERSION};risk={RISK_PER_TRADE};fee={FEE_PER_TRADE};smoothing={INDICATOR_SMOOTHING}"
+
+
+def summarize_atr_breakout_params(
+    arrays: Dict[str, _np.ndarray],
+    rows: Sequence[Sequence[float]],
+    max_workers: Optional[int] = 1,
+    progress=None,
+    store: Optional[ResultStore] = None,
+    dataset: Optional[str] = None,
+    prune: Optional[PruneLimits] = None,
+) -> List[ResultSummary]:
+    """
+    Result summaries of ATR Breakout parameter rows (``ATR_PARAM_FIELDS``
+    order), backtested with :func:`sweep.run_sweep`.
+
+    With a ``store`` and the ``dataset`` fingerprint of ``arrays``, stored
+    summaries are reused and only unseen rows are backtested.  With
+    ``prune`` backtests stop early on rows that violate its limits; their
+    partial summaries have ``pruned`` set and are not stored.  Complete
+    summaries, stored or new, are re-checked with ``prune.check``.
+    """
+    task = evaluate_atr_breakout_params if prune is None else partial(evaluate_atr_breakout_params, prune=prune)
+
+    def run(missing: Sequence[Sequence[float]]) -> List[ResultSummary]:
+        evaluated = run_sweep(task, arrays, missing, max_workers=max_workers, progress=progress)
+        return [ResultSummary.from_profits(trades.profit, count, pruned=trades.pruned) for trades, count in evaluated]
+
+    if store is None:
+        return run(rows)
+    params = [dict(zip(ATR_PARAM_FIELDS, map(float, row))) for row in rows]
+    summaries = store.evaluate(
+        dataset, "atr_breakout", atr_breakout_version(), params,
+        lambda missing: run([atr_param_row(p) for p in missing]),
+    )
+    for summary in summaries:
+        if not summary.partial:
+            summary.pruned = "" if prune is None else prune.check(summary)
+    return summaries
+
+
+def atr_breakout_objective(
+    arrays: Dict[str, _np.ndarray],
+    min_trades: int = 10,
+    max_trades: int = 500,
+    max_workers: Optional[int] = 1,
+    store: Optional[ResultStore] = None,
+    dataset: Optional[str] = None,
+    max_drawdown: Optional[float] = None,
+):
+    """
+    Search objective ``evaluate(configs, budget) -> profits`` for
+    :func:`param_search.run_search`.
+
+    ``budget`` selects the most recent fraction of the candles (with 50
+    candles of indicator context before it, masked by the signal warm-up).
+    Configurations trading outside ``[min_trades, max_trades]`` (scaled by
+    the budget) or with a drawdown above ``max_drawdown`` score ``-inf``;
+    their backtests are aborted as soon as that is certain.  Each batch is
+    backtested with :func:`sweep.run_sweep` over ``max_workers``
+    processes; with a ``store`` (and the ``dataset`` fingerprint) results
+    are memoized.
+    """
+    n = len(arrays["close"])
+
+    def evaluate(configs: List[Dict[str, float]], budget: float = 1.0) -> List[float]:
+        start = n - max(1, int(round(n * budget)))
+        offset = max(0, start - 50)
+        window = {key: values[offset:] for key, values in arrays.items()}
+        prune = PruneLimits(
+            max_trades=int(math.floor(max_trades * budget)),
+            min_trades=int(math.ceil(min_trades * budget)),
+            max_drawdown=max_drawdown,
+        )
+        summaries = summarize_atr_breakout_params(
+            window,
+            [atr_param_row(c) for c in configs],
+            max_workers=max_workers,
+            store=store,
+            dataset=dataset if dataset is None or offset == 0 else f"{dataset}[{offset}:{n}]",
+            prune=prune,
+        )
+        return [float("-inf") if s.pruned else s.total_profit for s in summaries]
+
+    return evaluate
 
 
 # ----------------------------------------------------------------------
@@ -552,11 +1478,11 @@ def backtest_atr_breakout_strategy(
 def run_backtest() -> None:
     """Run optimized backtests."""
     # Load data
-    if DATA_FILE and os.path.exists(DATA_FILE):
-        print(f"Loading data from file: {DATA_FILE}")
-        data = _pd.read_csv(DATA_FILE)
-        data["datetime"] = _pd.to_datetime(data["datetime"])
-        data = data.sort_values("datetime").reset_index(drop=True)
+    data_path = find_ohlcv_file(DATA_FILE)
+    if data_path is not None:
+        print(f"Loading data from file: {data_path}")
+        # Binary files are memory-mapped instead of loaded into a DataFrame
+        data = open_ohlcv(data_path)
         print(f"Loaded {len(data)} candles from file")
         print(f"Date range: {data['datetime'].min()} to {data['datetime'].max()}")
     else:
@@ -0,0 +1,71 @@
+"""
+Data Conversion Script for OHLCV Files
+======================================
+
+One-shot converter from existing CSV data files to the columnar storage
+format selected in config.py (``DATA_FORMAT``).  Columnar files keep typed
+int64 timestamps and float64 prices, so backtests and optimizers no longer
+re-parse text and dates on every run.  The ``binary`` format writes
+fixed-width records that can be memory-mapped for very long histories.
+
+Usage
+-----
+    python convert_data.py [FILE ...] [--format parquet|feather|binary|csv]
+
+Without arguments the configured ``DATA_FILE`` is converted.  The source
+file is left in place; loaders prefer the file in the configured format.
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "src"))
+
+from config import DATA_FILE, DATA_FORMAT
+from ohlcv_store import STORAGE_FORMATS, convert_ohlcv_file, load_ohlcv
+
+
+def convert_files(files, fmt: str) -> None:
+    """Convert each file to ``fmt`` and print a size / load-time summary."""
+    for source in files:
+        source = Path(source)
+        if not source.exists():
+            print(f"Skipping {source}: file not found")
+            continue
+
+        target = convert_ohlcv_file(source, fmt)
+        if target == source:
+            print(f"{source} is already in {fmt} format")
+            continue
+
+        start = time.perf_counter()
+        load_ohlcv(source)
+        source_load = time.perf_counter() - start
+        start = time.perf_counter()
+        df = load_ohlcv(target)
+        target_load = time.perf_counter() - start
+
+        print("\n" + "="*60)
+        print(f"Converted {source} -> {target}")
+        print("="*60)
+        print(f"Candles: {len(df)}")
+        print(f"Size: {os.path.getsize(source) / 1024:.2f} KB -> {os.path.getsize(target) / 1024:.2f} KB")
+        print(f"Load time: {source_load * 1000:.1f} ms -> {target_load * 1000:.1f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Convert OHLCV data files to a columnar or binary format.")
+    parser.add_argument("files", nargs="*", default=[DATA_FILE], help="files to convert (default: DATA_FILE)")
+    parser.add_argument("--format", default=DATA_FORMAT, choices=sorted(STORAGE_FORMATS), help="target format")
+    args = parser.parse_args()
+    convert_files(args.files, args.format)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
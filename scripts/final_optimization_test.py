@@ -9,7 +9,6 @@ Tests additional improvements:
 4. Different R:R ratios with current config
 """
 
-import os
 import sys
 from pathlib import Path
 from dataclasses import dataclass
@@ -23,17 +22,14 @@ import pandas as _pd
 import numpy as _np
 
 from utils import fetch_historical_ohlcv
+from ohlcv_store import find_ohlcv_file, load_ohlcv
 from backtest_optimized import (
     Trade,
     StrategyResult,
-    ema,
-    rsi,
-    adx,
-    atr,
-    sma,
     RISK_PER_TRADE,
     FEE_PER_TRADE,
 )
+from indicator_cache import get_indicator_series, indicator_name
 
 from config import (
     EXCHANGE_ID,
@@ -52,6 +48,7 @@ from config import (
     ADX_THRESHOLD,
     EMA_FAST_PERIOD,
     EMA_SLOW_PERIOD,
+    INDICATOR_SMOOTHING,
 )
 
 
@@ -60,12 +57,12 @@ def backtest_with_early_exit(df: _pd.DataFrame, use_early_exit: bool = False) ->
     if len(df) < 50:
         return StrategyResult("ATR Breakout")
     
-    ema20 = ema(df["close"], EMA_FAST_PERIOD)
-    ema50 = ema(df["close"], EMA_SLOW_PERIOD)
-    atr_val = atr(df["high"], df["low"], df["close"], 14)
-    rsi_val = rsi(df["close"], window=14)
-    volume_sma = sma(df["volume"], 20)
-    adx_val = adx(df["high"], df["low"], df["close"], 14)
+    ema20 = get_indicator_series(df, "ema", EMA_FAST_PERIOD)
+    ema50 = get_indicator_series(df, "ema", EMA_SLOW_PERIOD)
+    atr_val = get_indicator_series(df, indicator_name("atr", INDICATOR_SMOOTHING), 14)
+    rsi_val = get_indicator_series(df, indicator_name("rsi", INDICATOR_SMOOTHING), 14)
+    volume_sma = get_indicator_series(df, "volume_sma", 20)
+    adx_val = get_indicator_series(df, indicator_name("adx", INDICATOR_SMOOTHING), 14)
     
     signals = _np.zeros(len(df), dtype=int)
     
@@ -198,12 +195,12 @@ def backtest_with_volume_spike(df: _pd.DataFrame, volume_spike_mult: float = 3.0
     if len(df) < 50:
         return StrategyResult("ATR Breakout")
     
-    ema20 = ema(df["close"], EMA_FAST_PERIOD)
-    ema50 = ema(df["close"], EMA_SLOW_PERIOD)
-    atr_val = atr(df["high"], df["low"], df["close"], 14)
-    rsi_val = rsi(df["close"], window=14)
-    volume_sma = sma(df["volume"], 20)
-    adx_val = adx(df["high"], df["low"], df["close"], 14)
+    ema20 = get_indicator_series(df, "ema", EMA_FAST_PERIOD)
+    ema50 = get_indicator_series(df, "ema", EMA_SLOW_PERIOD)
+    atr_val = get_indicator_series(df, indicator_name("atr", INDICATOR_SMOOTHING), 14)
+    rsi_val = get_indicator_series(df, indicator_name("rsi", INDICATOR_SMOOTHING), 14)
+    volume_sma = get_indicator_series(df, "volume_sma", 20)
+    adx_val = get_indicator_series(df, indicator_name("adx", INDICATOR_SMOOTHING), 14)
     
     signals = _np.zeros(len(df), dtype=int)
     
@@ -340,11 +337,10 @@ def test_different_rr_ratios(df: _pd.DataFrame):
 def run_final_tests():
     """Run final optimization tests."""
     # Load data
-    if DATA_FILE and os.path.exists(DATA_FILE):
-        print(f"Loading data from {DATA_FILE}...")
-        data = _pd.read_csv(DATA_FILE)
-        data["datetime"] = _pd.to_datetime(data["datetime"])
-        data = data.sort_values("datetime").reset_index(drop=True)
+    data_path = find_ohlcv_file(DATA_FILE)
+    if data_path is not None:
+        print(f"Loading data from {data_path}...")
+        data = load_ohlcv(data_path)
         print(f"Loaded {len(data)} candles\n")
     else:
         print("Data file not found!")
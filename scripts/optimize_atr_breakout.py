@@ -5,12 +5,17 @@ Advanced Optimization Script for ATR Breakout Strategy
 This script performs comprehensive optimization of ATR Breakout strategy
 by testing multiple parameter combinations and filters.
 
+Instead of the fixed grid, a search strategy can explore continuous
+parameter ranges (see ``src/param_search.py``).
+
 Usage
 -----
-    python optimize_atr_breakout.py
+    python optimize_atr_breakout.py                          # exhaustive grid
+    python optimize_atr_breakout.py --search halving         # successive halving
+    python optimize_atr_breakout.py --search tpe --trials 150
 """
 
-import os
+import argparse
 import sys
 from pathlib import Path
 from dataclasses import dataclass, field
@@ -27,21 +32,31 @@ import pandas as _pd
 
 from utils import (
     fetch_historical_ohlcv,
-    ema,
-    rsi,
     bollinger_bands,
 )
+from ohlcv_store import find_ohlcv_file, load_ohlcv
 
 # Import from backtest_optimized
 from backtest_optimized import (
-    Trade,
     StrategyResult,
-    adx,
-    atr,
-    sma,
+    atr_breakout_signals,
+    simulate_atr_trades,
+    trades_to_result,
+    atr_breakout_arrays,
+    evaluate_atr_breakout_params,
+    atr_breakout_objective,
+    atr_param_row,
+    summarize_atr_breakout_params,
+    PruneLimits,
+    ATR_SEARCH_SPACE,
     RISK_PER_TRADE,
     FEE_PER_TRADE,
 )
+from config import INDICATOR_SMOOTHING, OPTIMIZATION_MAX_DRAWDOWN, RESULT_STORE_FILE
+from indicator_cache import dataset_fingerprint, get_indicator, indicator_name
+from result_store import ResultStore
+from param_search import SEARCH_STRATEGIES, run_search
+from sweep import default_workers
 
 
 # ----------------------------------------------------------------------
@@ -63,6 +78,12 @@ RSI_SHORT_RANGES = [
 VOLUME_MULTIPLIERS = [1.2, 1.5, 2.0]
 ADX_THRESHOLDS = [25, 30, 35]
 
+# Worker processes for the parameter sweep (None = all CPU cores, 1 = serial)
+OPTIMIZATION_WORKERS: Optional[int] = None
+
+# Configurations tried by the random / halving / tpe search strategies
+SEARCH_TRIALS: int = 243
+
 
 def backtest_atr_breakout_optimized(
     df: _pd.DataFrame,
@@ -83,150 +104,57 @@ def backtest_atr_breakout_optimized(
     if len(df) < 50:
         return StrategyResult(name), 0
     
-    # Calculate indicators
-    ema20 = ema(df["close"], 20)
-    ema50 = ema(df["close"], 50)
-    atr_val = atr(df["high"], df["low"], df["close"], 14)
-    rsi_val = rsi(df["close"], window=14)
-    volume_sma = sma(df["volume"], 20)
-    adx_val = adx(df["high"], df["low"], df["close"], 14)
-    
-    signals = _np.zeros(len(df), dtype=int)
-    signal_count = 0
-    
-    for i in range(50, len(df)):
-        if (_pd.isna(ema20.iloc[i]) or _pd.isna(ema50.iloc[i]) or 
-            _pd.isna(atr_val.iloc[i]) or _pd.isna(rsi_val.iloc[i]) or
-            _pd.isna(volume_sma.iloc[i]) or _pd.isna(adx_val.iloc[i])):
-            continue
-        
-        current_price = df["close"].iloc[i]
-        ema20_current = ema20.iloc[i]
-        ema50_current = ema50.iloc[i]
-        atr_current = atr_val.iloc[i]
-        rsi_current = rsi_val.iloc[i]
-        volume_current = df["volume"].iloc[i]
-        adx_current = adx_val.iloc[i]
-        
-        # Filters
-        volume_ok = volume_current >= volume_sma.iloc[i] * volume_mult
-        adx_ok = adx_current >= adx_threshold
-        
-        if not (volume_ok and adx_ok):
-            continue
-        
-        # Calculate breakout levels
-        breakout_long = ema20_current + (atr_breakout_mult * atr_current)
-        breakout_short = ema20_current - (atr_breakout_mult * atr_current)
-        
-        # Trend filter: EMA20 > EMA50 → uptrend (only LONG)
-        if ema20_current > ema50_current:
-            if current_price > breakout_long:
-                if rsi_long_min < rsi_current < rsi_long_max:
-                    signals[i] = 1
-                    signal_count += 1
-        
-        # Trend filter: EMA20 < EMA50 → downtrend (only SHORT)
-        elif ema20_current < ema50_current:
-            if current_price < breakout_short:
-                if rsi_short_min < rsi_current < rsi_short_max:
-                    signals[i] = -1
-                    signal_count += 1
+    # Indicators come from the shared cache, so only the thresholds vary
+    # between calls on the same dataset
+    signals = atr_breakout_signals(
+        df,
+        atr_breakout_mult,
+        rsi_long_min,
+        rsi_long_max,
+        rsi_short_min,
+        rsi_short_max,
+        volume_mult,
+        adx_threshold,
+    )
+    signal_count = int(_np.count_nonzero(signals))
+    atr_val = get_indicator(df, indicator_name("atr", INDICATOR_SMOOTHING), 14)
     
     # Backtest
-    result = StrategyResult(name)
-    in_pos = False
-    direction: Optional[int] = None
-    entry_price: float = 0.0
-    entry_time: _pd.Timestamp
-    stop: float = 0.0
-    tp: float = 0.0
-    quantity: float = 0.0
-    
-    for i, row in df.iterrows():
-        if _pd.isna(atr_val.iloc[i]):
-            continue
-            
-        current_atr = atr_val.iloc[i]
-        
-        if not in_pos:
-            if signals[i] == 1:
-                direction = 1
-                entry_price = row["close"]
-                entry_time = row["datetime"]
-                stop = entry_price - (1.0 * current_atr)
-                tp = entry_price + (atr_tp_rr * current_atr)
-                risk_amount = entry_price - stop
-                if risk_amount > 0:
-                    quantity = RISK_PER_TRADE / risk_amount
-                else:
-                    continue
-                in_pos = True
-            elif signals[i] == -1:
-                direction = -1
-                entry_price = row["close"]
-                entry_time = row["datetime"]
-                stop = entry_price + (1.0 * current_atr)
-                tp = entry_price - (atr_tp_rr * current_atr)
-                risk_amount = stop - entry_price
-                if risk_amount > 0:
-                    quantity = RISK_PER_TRADE / risk_amount
-                else:
-                    continue
-                in_pos = True
-        else:
-            price = row["close"]
-            exit_flag = False
-            profit = 0.0
-            
-            if direction == 1:
-                if price <= stop:
-                    profit = (price - entry_price) * quantity - FEE_PER_TRADE
-                    exit_flag = True
-                elif price >= tp:
-                    profit = (price - entry_price) * quantity - FEE_PER_TRADE
-                    exit_flag = True
-                elif signals[i] == -1:
-                    profit = (price - entry_price) * quantity - FEE_PER_TRADE
-                    exit_flag = True
-            elif direction == -1:
-                if price >= stop:
-                    profit = (entry_price - price) * quantity - FEE_PER_TRADE
-                    exit_flag = True
-                elif price <= tp:
-                    profit = (entry_price - price) * quantity - FEE_PER_TRADE
-                    exit_flag = True
-                elif signals[i] == 1:
-                    profit = (entry_price - price) * quantity - FEE_PER_TRADE
-                    exit_flag = True
-            
-            if exit_flag:
-                result.trades.append(
-                    Trade(
-                        entry_time=entry_time,
-                        entry_price=entry_price,
-                        exit_time=row["datetime"],
-                        exit_price=price,
-                        direction="long" if direction == 1 else "short",
-                        quantity=quantity,
-                        profit=profit,
-                    )
-                )
-                in_pos = False
-                direction = None
-                quantity = 0.0
+    trades = simulate_atr_trades(
+        df["close"].to_numpy(dtype=float),
+        atr_val,
+        signals,
+        sl_mult=1.0,
+        tp_rr=atr_tp_rr,
+        risk_per_trade=RISK_PER_TRADE,
+        fee_per_trade=FEE_PER_TRADE,
+    )
+    result = trades_to_result(df, trades, name)
     
     return result, signal_count
 
 
-def run_optimization():
-    """Run comprehensive parameter optimization."""
+def open_result_store(enabled: bool = True) -> Optional[ResultStore]:
+    """The result store at ``RESULT_STORE_FILE`` (None if disabled)."""
+    if not enabled or not RESULT_STORE_FILE:
+        return None
+    return ResultStore(project_root / RESULT_STORE_FILE)
+
+
+def run_optimization(use_store: bool = True):
+    """
+    Run comprehensive parameter optimization.
+
+    Combinations already in the result store (same data, strategy version
+    and parameters) are read from it instead of being backtested again.
+    Backtests of combinations that will be discarded (outside 10-500
+    trades, or over ``OPTIMIZATION_MAX_DRAWDOWN``) are aborted early.
+    """
     # Load data
-    if DATA_FILE and os.path.exists(DATA_FILE):
-        print(f"Loading data from {DATA_FILE}...")
-        data = _pd.read_csv(DATA_FILE)
-        data["datetime"] = _pd.to_datetime(data["datetime"])
-        data = data.sort_values("datetime").reset_index(drop=True)
+    data_path = find_ohlcv_file(DATA_FILE)
+    if data_path is not None:
+        print(f"Loading data from {data_path}...")
+        data = load_ohlcv(data_path)
         print(f"Loaded {len(data)} candles")
     else:
         print("Data file not found!")
@@ -236,70 +164,84 @@ def run_optimization():
     print("ATR BREAKOUT STRATEGY - COMPREHENSIVE OPTIMIZATION")
     print("="*80)
     print(f"Testing {len(ATR_BREAKOUT_MULTIPLIERS) * len(ATR_TP_RRS) * len(RSI_LONG_RANGES) * len(RSI_SHORT_RANGES) * len(VOLUME_MULTIPLIERS) * len(ADX_THRESHOLDS)} combinations...")
-    print("This may take a while...\n")
+    print(f"Workers: {OPTIMIZATION_WORKERS or default_workers()}\n")
     
     best_result = None
     best_params = None
     best_profit = float('-inf')
     results = []
     
-    total_combinations = (len(ATR_BREAKOUT_MULTIPLIERS) * len(ATR_TP_RRS) * 
-                         len(RSI_LONG_RANGES) * len(RSI_SHORT_RANGES) * 
-                         len(VOLUME_MULTIPLIERS) * len(ADX_THRESHOLDS))
-    current = 0
-    
-    # Test all combinations
-    for (atr_mult, atr_rr, rsi_long, rsi_short, vol_mult, adx_thresh) in product(
+    combinations = list(product(
         ATR_BREAKOUT_MULTIPLIERS,
         ATR_TP_RRS,
         RSI_LONG_RANGES,
         RSI_SHORT_RANGES,
         VOLUME_MULTIPLIERS,
         ADX_THRESHOLDS
+    ))
+    rows = [
+        (atr_mult, atr_rr, rsi_long[0], rsi_long[1], rsi_short[0], rsi_short[1], vol_mult, adx_thresh, 1.0)
+        for (atr_mult, atr_rr, rsi_long, rsi_short, vol_mult, adx_thresh) in combinations
+    ]
+    
+    def print_progress(done: int, total: int) -> None:
+        print(f"Progress: {done}/{total} ({done*100/total:.1f}%)")
+    
+    # Test all unseen combinations in parallel; indicators are computed
+    # once and shared with the workers, results come back in combination order
+    store = open_result_store(use_store)
+    try:
+        evaluated = summarize_atr_breakout_params(
+            atr_breakout_arrays(data),
+            rows,
+            max_workers=OPTIMIZATION_WORKERS,
+            progress=print_progress,
+            store=store,
+            dataset=dataset_fingerprint(data),
+            prune=PruneLimits(max_trades=500, min_trades=10, max_drawdown=OPTIMIZATION_MAX_DRAWDOWN or None),
+        )
+        print(f"Pruned early: {sum(1 for r in evaluated if r.partial)}/{len(evaluated)} combinations")
+        if store is not None:
+            print(f"Result store: {store.hits} cached, {store.misses} backtested ({store.path})")
+    finally:
+        if store is not None:
+            store.close()
+    
+    for (atr_mult, atr_rr, rsi_long, rsi_short, vol_mult, adx_thresh), result in zip(
+        combinations, evaluated
     ):
-        current += 1
-        if current % 100 == 0:
-            print(f"Progress: {current}/{total_combinations} ({current*100/total_combinations:.1f}%)")
+        # Only consider strategies with reasonable number of trades (10-500)
+        # and within the drawdown limit; pruned backtests failed a limit
+        if result.pruned or not 10 <= result.trade_count <= 500:
+            continue
         
-        name = f"ATR(k={atr_mult},RR={atr_rr},RSI={rsi_long[0]}-{rsi_long[1]}/{rsi_short[0]}-{rsi_short[1]},Vol={vol_mult},ADX={adx_thresh})"
+        signal_count = result.signal_count
+        result.name = f"ATR(k={atr_mult},RR={atr_rr},RSI={rsi_long[0]}-{rsi_long[1]}/{rsi_short[0]}-{rsi_short[1]},Vol={vol_mult},ADX={adx_thresh})"
         
-        result, signal_count = backtest_atr_breakout_optimized(
-            data,
-            atr_mult,
-            atr_rr,
-            rsi_long[0], rsi_long[1],
-            rsi_short[0], rsi_short[1],
-            vol_mult,
-            adx_thresh,
-            name
-        )
+        results.append({
+            'params': {
+                'atr_mult': atr_mult,
+                'atr_rr': atr_rr,
+                'rsi_long': rsi_long,
+                'rsi_short': rsi_short,
+                'vol_mult': vol_mult,
+                'adx_thresh': adx_thresh,
+            },
+            'result': result,
+            'signal_count': signal_count,
+        })
         
-        # Only consider strategies with reasonable number of trades (10-500)
-        if 10 <= result.trade_count <= 500:
-            results.append({
-                'params': {
-                    'atr_mult': atr_mult,
-                    'atr_rr': atr_rr,
-                    'rsi_long': rsi_long,
-                    'rsi_short': rsi_short,
-                    'vol_mult': vol_mult,
-                    'adx_thresh': adx_thresh,
-                },
-                'result': result,
-                'signal_count': signal_count,
-            })
-            
-            if result.total_profit > best_profit:
-                best_profit = result.total_profit
-                best_result = result
-                best_params = {
-                    'atr_mult': atr_mult,
-                    'atr_rr': atr_rr,
-                    'rsi_long': rsi_long,
-                    'rsi_short': rsi_short,
-                    'vol_mult': vol_mult,
-                    'adx_thresh': adx_thresh,
-                }
+        if result.total_profit > best_profit:
+            best_profit = result.total_profit
+            best_result = result
+            best_params = {
+                'atr_mult': atr_mult,
+                'atr_rr': atr_rr,
+                'rsi_long': rsi_long,
+                'rsi_short': rsi_short,
+                'vol_mult': vol_mult,
+                'adx_thresh': adx_thresh,
+            }
     
     # Sort by profit
     results.sort(key=lambda x: x['result'].total_profit, reverse=True)
@@ -338,6 +280,94 @@ def run_optimization():
     return best_params, best_result, results
 
 
+def run_search_optimization(
+    data: _pd.DataFrame,
+    strategy: str,
+    n_trials: int = SEARCH_TRIALS,
+    seed: Optional[int] = None,
+    max_workers: Optional[int] = OPTIMIZATION_WORKERS,
+    use_store: bool = True,
+):
+    """
+    Optimize over the continuous ``ATR_SEARCH_SPACE`` with a search
+    strategy from ``param_search`` (``random``, ``halving`` or ``tpe``)
+    instead of the fixed grid.  Trials are memoized in the result store.
+    """
+    print("\n" + "="*80)
+    print(f"ATR BREAKOUT STRATEGY - {strategy.upper()} SEARCH")
+    print("="*80)
+    print(f"Trials: {n_trials}, Workers: {max_workers or default_workers()}\n")
+    
+    arrays = atr_breakout_arrays(data)
+    store = open_result_store(use_store)
+    try:
+        objective = atr_breakout_objective(
+            arrays,
+            max_workers=max_workers,
+            store=store,
+            dataset=dataset_fingerprint(data),
+            max_drawdown=OPTIMIZATION_MAX_DRAWDOWN or None,
+        )
+        search = run_search(strategy, ATR_SEARCH_SPACE, objective, n_trials=n_trials, seed=seed)
+        print(f"Evaluated {len(search.trials)} trials at the cost of {search.cost:.1f} full backtests")
+        if store is not None:
+            print(f"Result store: {store.hits} cached, {store.misses} backtested ({store.path})")
+    finally:
+        if store is not None:
+            store.close()
+    
+    top = search.top(10)
+    print("\n" + "="*80)
+    print("TOP 10 CONFIGURATIONS")
+    print("="*80)
+    for i, trial in enumerate(top, 1):
+        params = ", ".join(f"{key}={value:g}" for key, value in trial.config.items())
+        print(f"\n{i}. Profit: ${trial.score:.2f}")
+        print(f"   Params: {params}")
+    
+    if not top:
+        print("No configuration traded within the accepted range.")
+        return None, None, search
+    
+    best = search.best
+    trades, _count = evaluate_atr_breakout_params(arrays, [atr_param_row(best.config)])[0]
+    best_result = trades_to_result(data, trades, f"ATR Breakout ({strategy} search)")
+    print("\n" + "="*80)
+    print("BEST CONFIGURATION")
+    print("="*80)
+    print(f"Profit: ${best_result.total_profit:.2f}")
+    print(f"Win Rate: {best_result.win_rate:.2%}")
+    print(f"Trades: {best_result.trade_count}")
+    print(f"Wins: {best_result.wins}, Losses: {best_result.losses}")
+    print(f"Avg Win: ${best_result.avg_win:.2f}, Avg Loss: ${best_result.avg_loss:.2f}")
+    print(f"\nParameters:")
+    for key, value in best.config.items():
+        print(f"  {key}: {value:g}")
+    print("="*80)
+    
+    return best.config, best_result, search
+
+
 if __name__ == "__main__":
-    best_params, best_result, all_results = run_optimization()
+    parser = argparse.ArgumentParser(description="Optimize the ATR Breakout strategy parameters.")
+    parser.add_argument("--search", choices=["grid"] + list(SEARCH_STRATEGIES), default="grid",
+                        help="search strategy (default: exhaustive grid)")
+    parser.add_argument("--trials", type=int, default=SEARCH_TRIALS, help=f"configurations to try (default: {SEARCH_TRIALS})")
+    parser.add_argument("--seed", type=int, help="random seed for reproducible searches")
+    parser.add_argument("--no-store", action="store_true", help="ignore and do not update the result store")
+    args = parser.parse_args()
+    
+    if args.search == "grid":
+        best_params, best_result, all_results = run_optimization(not args.no_store)
+    else:
+        data_path = find_ohlcv_file(DATA_FILE)
+        if data_path is None:
+            print("Data file not found!")
+            sys.exit(1)
+        print(f"Loading data from {data_path}...")
+        data = load_ohlcv(data_path)
+        print(f"Loaded {len(data)} candles")
+        best_params, best_result, search = run_search_optimization(
+            data, args.search, args.trials, args.seed, use_store=not args.no_store
+        )
 
@@ -5,15 +5,22 @@ Smart Optimization for ATR Breakout Strategy
 Optimizes ATR Breakout strategy by testing key parameters systematically.
 Uses a smarter approach: test most impactful parameters first.
 
+Walk-forward mode re-optimizes on rolling (or anchored) train windows
+and evaluates each winner on the following, unseen test window.
+
 Usage
 -----
     python optimize_atr_smart.py
+    python optimize_atr_smart.py --walk-forward 60 15            # 60-day train, 15-day test
+    python optimize_atr_smart.py --walk-forward 60 15 --anchored
+    python optimize_atr_smart.py --search tpe                    # model-based search instead
 """
 
-import os
+import argparse
 import sys
+from dataclasses import dataclass, replace
 from pathlib import Path
-from typing import Tuple, Dict, List, Optional
+from typing import Callable, Tuple, Dict, List, Optional, Sequence
 
 # Add project root to path for imports
 project_root = Path(__file__).parent.parent
@@ -23,21 +30,31 @@ sys.path.insert(0, str(project_root / "src"))
 import numpy as _np
 import pandas as _pd
 
-from utils import (
-    fetch_historical_ohlcv,
-    ema,
-    rsi,
-)
+from utils import fetch_historical_ohlcv
+from ohlcv_store import find_ohlcv_file, load_ohlcv
 
 from backtest_optimized import (
-    Trade,
     StrategyResult,
-    adx,
-    atr,
-    sma,
+    atr_breakout_signals,
+    simulate_atr_trades,
+    trades_to_result,
+    TradeArrays,
+    PruneLimits,
+    ATR_PARAM_FIELDS,
+    atr_breakout_arrays,
+    evaluate_atr_breakout_params,
+    atr_breakout_objective,
+    ATR_SEARCH_SPACE,
+    bar_length_ms,
+    bar_timestamps,
     RISK_PER_TRADE,
     FEE_PER_TRADE,
+    INDICATOR_SMOOTHING,
 )
+from indicator_cache import get_indicator, indicator_name
+from optimize_atr_breakout import SEARCH_TRIALS, run_search_optimization
+from param_search import SEARCH_STRATEGIES, run_search
+from sweep import run_sweep
 
 
 DATA_FILE: Optional[str] = "btcusdt_ohlcv.csv"
@@ -58,233 +75,195 @@ def backtest_atr_config(
     if len(df) < 50:
         return StrategyResult("")
     
-    ema20 = ema(df["close"], 20)
-    ema50 = ema(df["close"], 50)
-    atr_val = atr(df["high"], df["low"], df["close"], 14)
-    rsi_val = rsi(df["close"], window=14)
-    volume_sma = sma(df["volume"], 20)
-    adx_val = adx(df["high"], df["low"], df["close"], 14)
-    
-    signals = _np.zeros(len(df), dtype=int)
-    
-    for i in range(50, len(df)):
-        if (_pd.isna(ema20.iloc[i]) or _pd.isna(ema50.iloc[i]) or 
-            _pd.isna(atr_val.iloc[i]) or _pd.isna(rsi_val.iloc[i]) or
-            _pd.isna(volume_sma.iloc[i]) or _pd.isna(adx_val.iloc[i])):
-            continue
-        
-        price = df["close"].iloc[i]
-        ema20_curr = ema20.iloc[i]
-        ema50_curr = ema50.iloc[i]
-        atr_curr = atr_val.iloc[i]
-        rsi_curr = rsi_val.iloc[i]
-        vol_curr = df["volume"].iloc[i]
-        adx_curr = adx_val.iloc[i]
-        
-        if not (vol_curr >= volume_sma.iloc[i] * volume_mult and adx_curr >= adx_thresh):
-            continue
-        
-        breakout_long = ema20_curr + (atr_k * atr_curr)
-        breakout_short = ema20_curr - (atr_k * atr_curr)
-        
-        if ema20_curr > ema50_curr and price > breakout_long:
-            if rsi_long_min < rsi_curr < rsi_long_max:
-                signals[i] = 1
-        elif ema20_curr < ema50_curr and price < breakout_short:
-            if rsi_short_min < rsi_curr < rsi_short_max:
-                signals[i] = -1
+    # Indicators come from the shared cache, so only the thresholds vary
+    # between calls on the same dataset
+    signals = atr_breakout_signals(
+        df,
+        atr_k,
+        rsi_long_min,
+        rsi_long_max,
+        rsi_short_min,
+        rsi_short_max,
+        volume_mult,
+        adx_thresh,
+    )
+    atr_val = get_indicator(df, indicator_name("atr", INDICATOR_SMOOTHING), 14)
     
     # Backtest
-    result = StrategyResult("")
-    in_pos = False
-    direction = None
-    entry_price = 0.0
-    entry_time = None
-    stop = 0.0
-    tp = 0.0
-    quantity = 0.0
-    
-    for i, row in df.iterrows():
-        if _pd.isna(atr_val.iloc[i]):
-            continue
-        
-        atr_curr = atr_val.iloc[i]
-        
-        if not in_pos:
-            if signals[i] == 1:
-                direction = 1
-                entry_price = row["close"]
-                entry_time = row["datetime"]
-                stop = entry_price - (1.0 * atr_curr)
-                tp = entry_price + (atr_rr * atr_curr)
-                risk = entry_price - stop
-                if risk > 0:
-                    quantity = RISK_PER_TRADE / risk
-                    in_pos = True
-            elif signals[i] == -1:
-                direction = -1
-                entry_price = row["close"]
-                entry_time = row["datetime"]
-                stop = entry_price + (1.0 * atr_curr)
-                tp = entry_price - (atr_rr * atr_curr)
-                risk = stop - entry_price
-                if risk > 0:
-                    quantity = RISK_PER_TRADE / risk
-                    in_pos = True
-        else:
-            price = row["close"]
-            exit_flag = False
-            profit = 0.0
-            
-            if direction == 1:
-                if price <= stop:
-                    profit = (price - entry_price) * quantity - FEE_PER_TRADE
-                    exit_flag = True
-                elif price >= tp:
-                    profit = (price - entry_price) * quantity - FEE_PER_TRADE
-                    exit_flag = True
-                elif signals[i] == -1:
-                    profit = (price - entry_price) * quantity - FEE_PER_TRADE
-                    exit_flag = True
-            elif direction == -1:
-                if price >= stop:
-                    profit = (entry_price - price) * quantity - FEE_PER_TRADE
-                    exit_flag = True
-                elif price <= tp:
-                    profit = (entry_price - price) * quantity - FEE_PER_TRADE
-                    exit_flag = True
-                elif signals[i] == 1:
-                    profit = (entry_price - price) * quantity - FEE_PER_TRADE
-                    exit_flag = True
-            
-            if exit_flag:
-                result.trades.append(
-                    Trade(
-                        entry_time=entry_time,
-                        entry_price=entry_price,
-                        exit_time=row["datetime"],
-                        exit_price=price,
-                        direction="long" if direction == 1 else "short",
-                        quantity=quantity,
-                        profit=profit,
-                    )
-                )
-                in_pos = False
-                direction = None
-                quantity = 0.0
+    trades = simulate_atr_trades(
+        df["close"].to_numpy(dtype=float),
+        atr_val,
+        signals,
+        sl_mult=1.0,
+        tp_rr=atr_rr,
+        risk_per_trade=RISK_PER_TRADE,
+        fee_per_trade=FEE_PER_TRADE,
+    )
+    result = trades_to_result(df, trades, "")
     
     return result
 
 
+# ----------------------------------------------------------------------
+# Greedy step-by-step search
+# ----------------------------------------------------------------------
+
+# Start with current best known parameters
+START_CONFIG: Dict[str, float] = {
+    'atr_k': 1.0,
+    'atr_rr': 2.0,
+    'rsi_long_min': 55,
+    'rsi_long_max': 65,
+    'rsi_short_min': 35,
+    'rsi_short_max': 45,
+    'volume_mult': 1.5,
+    'adx_thresh': 30,
+}
+
+# Config key -> ATR_PARAM_FIELDS column
+_CONFIG_FIELDS = {
+    'atr_k': 'atr_breakout_mult',
+    'atr_rr': 'atr_tp_rr',
+    'rsi_long_min': 'rsi_long_min',
+    'rsi_long_max': 'rsi_long_max',
+    'rsi_short_min': 'rsi_short_min',
+    'rsi_short_max': 'rsi_short_max',
+    'volume_mult': 'volume_mult',
+    'adx_thresh': 'adx_threshold',
+}
+
+RSI_CONFIGS = [
+    ((50, 70), (30, 50)),
+    ((52, 68), (32, 48)),
+    ((55, 65), (35, 45)),
+    ((50, 65), (35, 50)),
+    ((52, 70), (30, 48)),
+    ((48, 68), (32, 52)),
+]
+
+# Search steps, most impactful parameters first: (title, candidate updates)
+SEARCH_STEPS: List[Tuple[str, List[Dict[str, float]]]] = [
+    ("Step 1: Optimizing R:R Ratio...", [{'atr_rr': rr} for rr in [1.5, 2.0, 2.5, 3.0, 3.5]]),
+    ("Step 2: Optimizing ATR Breakout Multiplier (k)...", [{'atr_k': k} for k in [0.8, 1.0, 1.2, 1.5, 2.0]]),
+    ("Step 3: Optimizing RSI Ranges...", [
+        {'rsi_long_min': lo[0], 'rsi_long_max': lo[1], 'rsi_short_min': sh[0], 'rsi_short_max': sh[1]}
+        for lo, sh in RSI_CONFIGS
+    ]),
+    ("Step 4: Optimizing Filters (Volume & ADX)...", [
+        {'volume_mult': vol_mult, 'adx_thresh': adx_thresh}
+        for vol_mult in [1.2, 1.5, 2.0, 2.5]
+        for adx_thresh in [25, 30, 35, 40]
+    ]),
+]
+
+# Console output per step: candidate label, best-config summary (both
+# formatted with the config) and the trade count a candidate needs to be
+# printed
+STEP_OUTPUT: Dict[str, Tuple[str, str, int]] = {
+    SEARCH_STEPS[0][0]: ("R:R = {atr_rr}", "Best R:R = {atr_rr}", 0),
+    SEARCH_STEPS[1][0]: ("k = {atr_k}", "Best k = {atr_k}", 0),
+    SEARCH_STEPS[2][0]: (
+        "RSI L=({rsi_long_min}, {rsi_long_max}), S=({rsi_short_min}, {rsi_short_max})",
+        "Best RSI: L={rsi_long_min}-{rsi_long_max}, S={rsi_short_min}-{rsi_short_max}",
+        0,
+    ),
+    SEARCH_STEPS[3][0]: ("Vol={volume_mult}, ADX={adx_thresh}", "Best: Vol={volume_mult}, ADX={adx_thresh}", 10),
+}
+
+# Accepted trade count range for a configuration
+MIN_TRADES = 10
+MAX_TRADES = 500
+
+# Callback for search progress: log(step_title, config, trades) per candidate
+SearchLog = Callable[[str, Dict[str, float], TradeArrays], None]
+
+# Callback after each step: on_step(step_title, best_config, best_profit)
+StepLog = Callable[[str, Dict[str, float], float], None]
+
+
+def config_row(config: Dict[str, float]) -> Tuple[float, ...]:
+    """Parameter row (``ATR_PARAM_FIELDS`` order) for a search config (SL = 1 ATR)."""
+    values = {field: float(config[key]) for key, field in _CONFIG_FIELDS.items()}
+    values['atr_sl_mult'] = 1.0
+    return tuple(values[field] for field in ATR_PARAM_FIELDS)
+
+
+def step_search(
+    arrays: Dict[str, _np.ndarray],
+    config: Optional[Dict[str, float]] = None,
+    log: Optional[SearchLog] = None,
+    on_step: Optional[StepLog] = None,
+    prune: bool = True,
+) -> Tuple[Dict[str, float], TradeArrays]:
+    """
+    Greedy step-by-step search on precomputed ATR Breakout arrays.
+
+    Each step tries its candidates with the other parameters fixed at the
+    best configuration so far, and keeps a candidate if it is more
+    profitable and trades ``MIN_TRADES``-``MAX_TRADES`` times.  The
+    candidates of a step are backtested as one batch; with ``prune``
+    backtests of candidates outside the trade range are aborted early
+    (``pruned``), so ``log`` sees partial trades for them.
+
+    Returns
+    -------
+    (dict, TradeArrays)
+        Best configuration and its trades.
+    """
+    best_config = dict(START_CONFIG if config is None else config)
+    best_trades, _ = evaluate_atr_breakout_params(arrays, [config_row(best_config)])[0]
+    best_profit = float(best_trades.profit.sum())
+    limits = PruneLimits(max_trades=MAX_TRADES, min_trades=MIN_TRADES) if prune else None
+
+    for title, updates in SEARCH_STEPS:
+        candidates = [{**best_config, **update} for update in updates]
+        evaluated = evaluate_atr_breakout_params(arrays, [config_row(c) for c in candidates], prune=limits)
+        for candidate, (trades, _count) in zip(candidates, evaluated):
+            if log is not None:
+                log(title, candidate, trades)
+            profit = float(trades.profit.sum())
+            if profit > best_profit and not trades.pruned and MIN_TRADES <= len(trades) <= MAX_TRADES:
+                best_profit = profit
+                best_config = candidate
+                best_trades = trades
+        if on_step is not None:
+            on_step(title, best_config, best_profit)
+    return best_config, best_trades
+
+
 def optimize_step_by_step(df: _pd.DataFrame):
     """Optimize parameters step by step."""
     print("="*80)
     print("ATR BREAKOUT - SMART OPTIMIZATION")
     print("="*80)
     
-    # Start with current best known parameters
-    best_config = {
-        'atr_k': 1.0,
-        'atr_rr': 2.0,
-        'rsi_long_min': 55,
-        'rsi_long_max': 65,
-        'rsi_short_min': 35,
-        'rsi_short_max': 45,
-        'volume_mult': 1.5,
-        'adx_thresh': 30,
-    }
-    
-    best_result = backtest_atr_config(df, **best_config)
-    best_profit = best_result.total_profit
-    
-    print(f"\nInitial config: Profit = ${best_profit:.2f}, Trades = {best_result.trade_count}, WR = {best_result.win_rate:.2%}")
-    
-    # Step 1: Optimize R:R ratio (most impactful)
-    print("\n" + "-"*80)
-    print("Step 1: Optimizing R:R Ratio...")
-    print("-"*80)
-    
-    for rr in [1.5, 2.0, 2.5, 3.0, 3.5]:
-        config = best_config.copy()
-        config['atr_rr'] = rr
-        result = backtest_atr_config(df, **config)
-        print(f"  R:R = {rr}: Profit = ${result.total_profit:.2f}, Trades = {result.trade_count}, WR = {result.win_rate:.2%}")
-        if result.total_profit > best_profit and 10 <= result.trade_count <= 500:
-            best_profit = result.total_profit
-            best_config['atr_rr'] = rr
-            best_result = result
-    
-    print(f"  → Best R:R = {best_config['atr_rr']}, Profit = ${best_profit:.2f}")
-    
-    # Step 2: Optimize ATR multiplier (k)
-    print("\n" + "-"*80)
-    print("Step 2: Optimizing ATR Breakout Multiplier (k)...")
-    print("-"*80)
+    arrays = atr_breakout_arrays(df)
+    initial = backtest_atr_config(df, **START_CONFIG)
+    print(f"\nInitial config: Profit = ${initial.total_profit:.2f}, Trades = {initial.trade_count}, WR = {initial.win_rate:.2%}")
     
-    for k in [0.8, 1.0, 1.2, 1.5, 2.0]:
-        config = best_config.copy()
-        config['atr_k'] = k
-        result = backtest_atr_config(df, **config)
-        print(f"  k = {k}: Profit = ${result.total_profit:.2f}, Trades = {result.trade_count}, WR = {result.win_rate:.2%}")
-        if result.total_profit > best_profit and 10 <= result.trade_count <= 500:
-            best_profit = result.total_profit
-            best_config['atr_k'] = k
-            best_result = result
+    current = {"step": None}
     
-    print(f"  → Best k = {best_config['atr_k']}, Profit = ${best_profit:.2f}")
+    def log(title: str, config: Dict[str, float], trades: TradeArrays) -> None:
+        if title != current["step"]:
+            current["step"] = title
+            print("\n" + "-"*80)
+            print(title)
+            print("-"*80)
+        label, _summary, min_trades = STEP_OUTPUT[title]
+        n = len(trades)
+        if n < min_trades:
+            return
+        profit = float(trades.profit.sum())
+        win_rate = float((trades.profit > 0).sum()) / n if n else 0.0
+        print(f"  {label.format(**config)}: Profit = ${profit:.2f}, Trades = {n}, WR = {win_rate:.2%}")
     
-    # Step 3: Optimize RSI ranges
-    print("\n" + "-"*80)
-    print("Step 3: Optimizing RSI Ranges...")
-    print("-"*80)
+    def on_step(title: str, config: Dict[str, float], profit: float) -> None:
+        _label, summary, _min_trades = STEP_OUTPUT[title]
+        print(f"  → {summary.format(**config)}, Profit = ${profit:.2f}")
     
-    rsi_configs = [
-        ((50, 70), (30, 50)),
-        ((52, 68), (32, 48)),
-        ((55, 65), (35, 45)),
-        ((50, 65), (35, 50)),
-        ((52, 70), (30, 48)),
-        ((48, 68), (32, 52)),
-    ]
-    
-    for rsi_long, rsi_short in rsi_configs:
-        config = best_config.copy()
-        config['rsi_long_min'] = rsi_long[0]
-        config['rsi_long_max'] = rsi_long[1]
-        config['rsi_short_min'] = rsi_short[0]
-        config['rsi_short_max'] = rsi_short[1]
-        result = backtest_atr_config(df, **config)
-        print(f"  RSI L={rsi_long}, S={rsi_short}: Profit = ${result.total_profit:.2f}, Trades = {result.trade_count}, WR = {result.win_rate:.2%}")
-        if result.total_profit > best_profit and 10 <= result.trade_count <= 500:
-            best_profit = result.total_profit
-            best_config['rsi_long_min'] = rsi_long[0]
-            best_config['rsi_long_max'] = rsi_long[1]
-            best_config['rsi_short_min'] = rsi_short[0]
-            best_config['rsi_short_max'] = rsi_short[1]
-            best_result = result
-    
-    print(f"  → Best RSI: L={best_config['rsi_long_min']}-{best_config['rsi_long_max']}, S={best_config['rsi_short_min']}-{best_config['rsi_short_max']}, Profit = ${best_profit:.2f}")
-    
-    # Step 4: Optimize filters
-    print("\n" + "-"*80)
-    print("Step 4: Optimizing Filters (Volume & ADX)...")
-    print("-"*80)
-    
-    for vol_mult in [1.2, 1.5, 2.0, 2.5]:
-        for adx_thresh in [25, 30, 35, 40]:
-            config = best_config.copy()
-            config['volume_mult'] = vol_mult
-            config['adx_thresh'] = adx_thresh
-            result = backtest_atr_config(df, **config)
-            if result.trade_count >= 10:  # At least 10 trades
-                print(f"  Vol={vol_mult}, ADX={adx_thresh}: Profit = ${result.total_profit:.2f}, Trades = {result.trade_count}, WR = {result.win_rate:.2%}")
-                if result.total_profit > best_profit and result.trade_count <= 500:
-                    best_profit = result.total_profit
-                    best_config['volume_mult'] = vol_mult
-                    best_config['adx_thresh'] = adx_thresh
-                    best_result = result
-    
-    print(f"  → Best: Vol={best_config['volume_mult']}, ADX={best_config['adx_thresh']}, Profit = ${best_profit:.2f}")
+    # Every candidate is printed, so none of them is pruned
+    best_config, best_trades = step_search(arrays, log=log, on_step=on_step, prune=False)
+    best_result = trades_to_result(df, best_trades, "")
     
     # Final result
     print("\n" + "="*80)
@@ -303,17 +282,254 @@ def optimize_step_by_step(df: _pd.DataFrame):
     return best_config, best_result
 
 
+# ----------------------------------------------------------------------
+# Walk-forward optimization
+# ----------------------------------------------------------------------
+
+# Candles before a window start that are kept as indicator context; the
+# signal warm-up masks them, so no trade opens before the window start
+WINDOW_PADDING = 50
+
+
+@dataclass(frozen=True)
+class WalkForwardWindow:
+    """Train / test candle index ranges (``[start, end)``) of one window."""
+    train_start: int
+    train_end: int
+    test_start: int
+    test_end: int
+
+
+@dataclass
+class WalkForwardResult:
+    """Per-window parameters and in-sample / out-of-sample results."""
+    windows: List[WalkForwardWindow]
+    configs: List[Dict[str, float]]
+    in_sample: List[StrategyResult]
+    out_of_sample: List[StrategyResult]
+
+    @property
+    def combined(self) -> StrategyResult:
+        """All out-of-sample trades stitched together."""
+        result = StrategyResult("Walk-forward (out of sample)")
+        for res in self.out_of_sample:
+            result.trades.extend(res.trades)
+        return result
+
+    @property
+    def efficiency(self) -> float:
+        """
+        Out-of-sample profit per candle divided by in-sample profit per
+        candle (walk-forward efficiency); NaN if in-sample profit is not
+        positive.
+        """
+        is_candles = sum(w.train_end - w.train_start for w in self.windows)
+        oos_candles = sum(w.test_end - w.test_start for w in self.windows)
+        is_rate = sum(r.total_profit for r in self.in_sample) / max(is_candles, 1)
+        oos_rate = sum(r.total_profit for r in self.out_of_sample) / max(oos_candles, 1)
+        return oos_rate / is_rate if is_rate > 0 else float('nan')
+
+
+def walk_forward_windows(
+    n_candles: int,
+    train_candles: int,
+    test_candles: int,
+    step_candles: Optional[int] = None,
+    anchored: bool = False,
+) -> List[WalkForwardWindow]:
+    """
+    Split ``n_candles`` into consecutive train / test windows.
+
+    Test windows follow their train window and advance by
+    ``step_candles`` (default: ``test_candles``).  Rolling windows keep a
+    fixed train length; anchored windows all train from candle 0.
+    """
+    if train_candles <= 0 or test_candles <= 0:
+        raise ValueError("train and test windows must be positive")
+    step = step_candles or test_candles
+    windows = []
+    start = 0
+    while start + train_candles + test_candles <= n_candles:
+        train_end = start + train_candles
+        windows.append(WalkForwardWindow(0 if anchored else start, train_end, train_end, train_end + test_candles))
+        start += step
+    return windows
+
+
+def _window_arrays(arrays: Dict[str, _np.ndarray], start: int, end: int) -> Tuple[Dict[str, _np.ndarray], int]:
+    """Slice ``[start, end)`` plus ``WINDOW_PADDING`` candles of context; returns (arrays, offset)."""
+    offset = max(0, start - WINDOW_PADDING)
+    return {key: values[offset:end] for key, values in arrays.items()}, offset
+
+
+def _shift(trades: TradeArrays, offset: int) -> TradeArrays:
+    return replace(trades, entry_idx=trades.entry_idx + offset, exit_idx=trades.exit_idx + offset)
+
+
+def search_config(
+    arrays: Dict[str, _np.ndarray],
+    strategy: str,
+    n_trials: int = SEARCH_TRIALS,
+    seed: Optional[int] = None,
+) -> Tuple[Dict[str, float], TradeArrays]:
+    """
+    :func:`step_search` counterpart using a ``param_search`` strategy over
+    ``ATR_SEARCH_SPACE``.  Falls back to ``START_CONFIG`` when no
+    configuration trades within the accepted range.
+    """
+    search = run_search(strategy, ATR_SEARCH_SPACE, atr_breakout_objective(arrays), n_trials=n_trials, seed=seed)
+    best = search.best
+    if best is None:
+        config = dict(START_CONFIG)
+    else:
+        config = {key: best.config[field] for key, field in _CONFIG_FIELDS.items()}
+    trades, _ = evaluate_atr_breakout_params(arrays, [config_row(config)])[0]
+    return config, trades
+
+
+def optimize_windows(
+    arrays: Dict[str, _np.ndarray],
+    rows: Sequence[Tuple[WalkForwardWindow, Optional[Dict]]],
+) -> List[Tuple[Dict[str, float], TradeArrays, TradeArrays]]:
+    """
+    Re-optimize on each train window and backtest the winner on its test
+    window.  Returns ``(config, in-sample trades, out-of-sample trades)``
+    per window with candle indices into the full ``arrays``.
+
+    ``rows`` are ``(window, search)`` pairs; ``search`` is None for
+    :func:`step_search` or keyword arguments of :func:`search_config`.
+
+    Task function for :func:`sweep.run_sweep`: the full indicator arrays
+    are computed once and shared by every window (and worker).
+    """
+    out = []
+    for window, search in rows:
+        train, train_offset = _window_arrays(arrays, window.train_start, window.train_end)
+        if search is None:
+            config, in_sample = step_search(train)
+        else:
+            config, in_sample = search_config(train, **search)
+        test, test_offset = _window_arrays(arrays, window.test_start, window.test_end)
+        out_of_sample, _ = evaluate_atr_breakout_params(test, [config_row(config)])[0]
+        out.append((config, _shift(in_sample, train_offset), _shift(out_of_sample, test_offset)))
+    return out
+
+
+def walk_forward(
+    df: _pd.DataFrame,
+    train_days: float,
+    test_days: float,
+    step_days: Optional[float] = None,
+    anchored: bool = False,
+    max_workers: Optional[int] = None,
+    search: Optional[str] = None,
+    n_trials: int = SEARCH_TRIALS,
+    seed: Optional[int] = None,
+) -> WalkForwardResult:
+    """
+    Walk-forward optimization of the ATR Breakout strategy.
+
+    Indicators are computed once for the whole dataset (so every window
+    sees fully warmed-up values and overlapping windows share them) and
+    the windows are optimized in parallel with :func:`sweep.run_sweep`.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        OHLCV candles.
+    train_days, test_days : float
+        Train and test window lengths.
+    step_days : float, optional
+        Shift between windows (default: ``test_days``).
+    anchored : bool
+        Train every window from the start of the data instead of on a
+        rolling window.
+    max_workers : int, optional
+        Worker processes (default: CPU count, 1 = serial).
+    search : str, optional
+        ``param_search`` strategy used per window instead of the
+        step-by-step search, with ``n_trials`` and ``seed``.
+    """
+    bar_ms = bar_length_ms(bar_timestamps(df)) or 60_000
+    per_day = 86_400_000 / bar_ms
+    windows = walk_forward_windows(
+        len(df),
+        int(round(train_days * per_day)),
+        int(round(test_days * per_day)),
+        int(round(step_days * per_day)) if step_days else None,
+        anchored,
+    )
+    settings = None if search is None else {"strategy": search, "n_trials": n_trials, "seed": seed}
+    rows = [(window, settings) for window in windows]
+    evaluated = run_sweep(optimize_windows, atr_breakout_arrays(df), rows, max_workers=max_workers, shard_size=1)
+
+    configs, in_sample, out_of_sample = [], [], []
+    for k, (config, is_trades, oos_trades) in enumerate(evaluated):
+        configs.append(config)
+        in_sample.append(trades_to_result(df, is_trades, f"Window {k + 1} (in sample)"))
+        out_of_sample.append(trades_to_result(df, oos_trades, f"Window {k + 1} (out of sample)"))
+    return WalkForwardResult(windows, configs, in_sample, out_of_sample)
+
+
+def print_walk_forward(df: _pd.DataFrame, wf: WalkForwardResult) -> None:
+    """Print a per-window table and the combined out-of-sample result."""
+    times = df["datetime"]
+    print("="*80)
+    print("ATR BREAKOUT - WALK-FORWARD OPTIMIZATION")
+    print("="*80)
+    for k, (window, config, is_res, oos_res) in enumerate(zip(wf.windows, wf.configs, wf.in_sample, wf.out_of_sample), 1):
+        print(f"\nWindow {k}: train {times.iloc[window.train_start]} → {times.iloc[window.train_end - 1]}, "
+              f"test {times.iloc[window.test_start]} → {times.iloc[window.test_end - 1]}")
+        print(f"  In sample:     Profit = ${is_res.total_profit:.2f}, Trades = {is_res.trade_count}, WR = {is_res.win_rate:.2%}")
+        print(f"  Out of sample: Profit = ${oos_res.total_profit:.2f}, Trades = {oos_res.trade_count}, WR = {oos_res.win_rate:.2%}")
+        print(f"  Params: k={config['atr_k']}, R:R={config['atr_rr']}, "
+              f"RSI_L={config['rsi_long_min']}-{config['rsi_long_max']}, RSI_S={config['rsi_short_min']}-{config['rsi_short_max']}, "
+              f"Vol={config['volume_mult']}, ADX={config['adx_thresh']}")
+
+    combined = wf.combined
+    print("\n" + "="*80)
+    print("OUT-OF-SAMPLE SUMMARY")
+    print("="*80)
+    print(f"Windows: {len(wf.windows)}")
+    print(f"Profit: ${combined.total_profit:.2f}")
+    print(f"Win Rate: {combined.win_rate:.2%}")
+    print(f"Trades: {combined.trade_count}")
+    print(f"Walk-forward efficiency: {wf.efficiency:.2f}")
+    print("="*80)
+
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Optimize the ATR Breakout strategy.")
+    parser.add_argument("--walk-forward", nargs=2, type=float, metavar=("TRAIN_DAYS", "TEST_DAYS"),
+                        help="walk-forward optimization with these train / test window lengths")
+    parser.add_argument("--step", type=float, metavar="DAYS", help="shift between walk-forward windows (default: TEST_DAYS)")
+    parser.add_argument("--anchored", action="store_true", help="train every window from the start of the data")
+    parser.add_argument("--workers", type=int, help="worker processes for walk-forward windows or --search batches (default: all cores)")
+    parser.add_argument("--search", choices=list(SEARCH_STRATEGIES),
+                        help="replace the step-by-step search (also per walk-forward window) with a search strategy")
+    parser.add_argument("--trials", type=int, default=SEARCH_TRIALS, help=f"configurations to try with --search (default: {SEARCH_TRIALS})")
+    parser.add_argument("--seed", type=int, help="random seed for --search")
+    parser.add_argument("--no-store", action="store_true", help="ignore and do not update the result store with --search")
+    args = parser.parse_args()
+    
     # Load data
-    if DATA_FILE and os.path.exists(DATA_FILE):
-        print(f"Loading data from {DATA_FILE}...")
-        data = _pd.read_csv(DATA_FILE)
-        data["datetime"] = _pd.to_datetime(data["datetime"])
-        data = data.sort_values("datetime").reset_index(drop=True)
+    data_path = find_ohlcv_file(DATA_FILE)
+    if data_path is not None:
+        print(f"Loading data from {data_path}...")
+        data = load_ohlcv(data_path)
         print(f"Loaded {len(data)} candles\n")
     else:
         print("Data file not found!")
         exit(1)
     
-    best_config, best_result = optimize_step_by_step(data)
-
+    if args.walk_forward:
+        train_days, test_days = args.walk_forward
+        wf = walk_forward(data, train_days, test_days, args.step, args.anchored, args.workers,
+                          args.search, args.trials, args.seed)
+        print_walk_forward(data, wf)
+    elif args.search:
+        best_config, best_result, search = run_search_optimization(
+            data, args.search, args.trials, args.seed, args.workers, use_store=not args.no_store
+        )
+    else:
+        best_config, best_result = optimize_step_by_step(data)
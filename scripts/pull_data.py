@@ -3,7 +3,8 @@ Data Pulling Script for BTCUSDT
 ================================
 
 This script fetches historical OHLCV data from the exchange and saves it
-to a CSV file. This allows you to:
+to a data file (CSV, Parquet or Feather, see DATA_FORMAT in config.py).
+This allows you to:
 - Download data once and reuse it for multiple backtests
 - Work offline after initial data download
 - Share data files with others
@@ -11,23 +12,34 @@ to a CSV file. This allows you to:
 
 Usage
 -----
-    python pull_data.py
+    python pull_data.py                 # incremental sync (full pull if no file yet)
+    python pull_data.py --backfill 90   # also extend history back to 90 days ago
+    python pull_data.py --full          # re-download LOOKBACK_DAYS and overwrite
 
-The script will fetch data and save it to 'btcusdt_ohlcv.csv' by default.
+The script will fetch data and save it to 'data/btcusdt_ohlcv.<format>' by default.
 You can modify the configuration at the top of the file.
+
+Incremental sync reads the last stored candle, fetches only candles from
+that timestamp onward, drops duplicate timestamps (the re-fetched last
+candle replaces the stored one, which may have been incomplete) and
+rewrites the file atomically.
 """
 
+import argparse
 import os
 import sys
+import time
 from pathlib import Path
-from datetime import datetime
+from typing import Optional
 
 # Add project root to path for imports
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 sys.path.insert(0, str(project_root / "src"))
 
-from utils import fetch_historical_ohlcv
+from utils import fetch_historical_ohlcv, fetch_ohlcv_range
+from ohlcv_store import find_ohlcv_file, load_ohlcv, merge_ohlcv, save_ohlcv
+from config import DATA_FORMAT
 
 
 # ----------------------------------------------------------------------
@@ -41,46 +53,113 @@ TIMEFRAME: str = "1m"          # 1‑minute candles
 
 # Data pulling parameters
 LOOKBACK_DAYS: int = 30        # number of days of data to fetch (1 month)
-OUTPUT_FILE: str = "data/btcusdt_ohlcv.csv"  # output CSV file name (relative to project root)
+OUTPUT_FILE: str = "data/btcusdt_ohlcv.csv"  # output file base name (relative to project root)
+OUTPUT_FORMAT: str = DATA_FORMAT               # "csv", "parquet", "feather" or "binary"
+INCREMENTAL: bool = True       # append new candles to an existing file instead of re-downloading
 
 
 # ----------------------------------------------------------------------
 # Main data pulling logic
 # ----------------------------------------------------------------------
 
-def pull_and_save_data() -> None:
+def _to_ms(ts) -> int:
+    """Convert a timestamp to milliseconds since epoch."""
+    return int(ts.value // 1_000_000)
+
+
+def _print_summary(df, output_path: Path, fetched: int) -> None:
+    print("\n" + "="*60)
+    print("Data Pull Summary")
+    print("="*60)
+    print(f"Candles fetched: {fetched}")
+    print(f"Total candles: {len(df)}")
+    print(f"Date range: {df['datetime'].min()} to {df['datetime'].max()}")
+    print(f"Output file: {output_path}")
+    print(f"File size: {os.path.getsize(output_path) / 1024:.2f} KB")
+    print("="*60)
+    print(f"\nData saved successfully to '{output_path}'")
+    print("You can now use this file for backtesting without fetching data again.")
+
+
+def sync_data(backfill_days: Optional[int] = None) -> Path:
+    """
+    Bring the stored data file up to date, downloading only missing candles.
+
+    New candles are fetched from the last stored timestamp onward.  With
+    ``backfill_days`` the history is also extended backward so that it
+    starts ``backfill_days`` days ago.  Falls back to a full pull when no
+    data file exists yet.
+
+    Returns
+    -------
+    Path
+        The file that was written.
     """
-    Fetch historical data and save to CSV file.
+    source = find_ohlcv_file(OUTPUT_FILE, OUTPUT_FORMAT)
+    if source is None:
+        print(f"No existing data file for {OUTPUT_FILE}, doing a full pull")
+        return pull_and_save_data(backfill_days or LOOKBACK_DAYS)
+
+    df = load_ohlcv(source)
+    if df.empty:
+        return pull_and_save_data(backfill_days or LOOKBACK_DAYS)
+    first_ms = _to_ms(df["datetime"].iloc[0])
+    last_ms = _to_ms(df["datetime"].iloc[-1])
+    print(f"Loaded {len(df)} candles from {source} ({df['datetime'].iloc[0]} to {df['datetime'].iloc[-1]})")
+
+    fetched = 0
+    if backfill_days is not None:
+        now_ms = int(time.time() * 1000)
+        start_ms = now_ms - backfill_days * 24 * 60 * 60 * 1000
+        if start_ms < first_ms:
+            print(f"Extending history back {backfill_days} days...")
+            older = fetch_ohlcv_range(EXCHANGE_ID, SYMBOL, TIMEFRAME, start_ms, first_ms)
+            fetched += len(older)
+            df = merge_ohlcv(df, older)
+
+    print(f"Fetching {TIMEFRAME} candles for {SYMBOL} from {EXCHANGE_ID} since {df['datetime'].iloc[-1]}...")
+    newer = fetch_ohlcv_range(EXCHANGE_ID, SYMBOL, TIMEFRAME, last_ms)
+    fetched += len(newer)
+    df = merge_ohlcv(df, newer)
+
+    # Save (directory is created and the file replaced atomically)
+    output_path = save_ohlcv(df, OUTPUT_FILE, OUTPUT_FORMAT)
+    if source != output_path:
+        print(f"Note: data migrated from {source} to {output_path}")
+    _print_summary(df, output_path, fetched)
+    return output_path
+
+
+def pull_and_save_data(days: int = LOOKBACK_DAYS) -> Path:
     """
-    print(f"Fetching {LOOKBACK_DAYS} days of {TIMEFRAME} data for {SYMBOL} from {EXCHANGE_ID}...")
+    Fetch ``days`` of historical data and save it in the configured storage format.
+    """
+    print(f"Fetching {days} days of {TIMEFRAME} data for {SYMBOL} from {EXCHANGE_ID}...")
     print("This may take a few minutes depending on the amount of data...")
-    
+
+    # Fetch data
+    df = fetch_historical_ohlcv(EXCHANGE_ID, SYMBOL, TIMEFRAME, days)
+
+    # Sort by datetime
+    df = df.sort_values("datetime").reset_index(drop=True)
+
+    # Save (directory is created and the file replaced atomically)
+    output_path = save_ohlcv(df, OUTPUT_FILE, OUTPUT_FORMAT)
+    _print_summary(df, output_path, len(df))
+    return output_path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Download or update OHLCV data for backtesting.")
+    parser.add_argument("--full", action="store_true", help=f"re-download LOOKBACK_DAYS ({LOOKBACK_DAYS}) and overwrite")
+    parser.add_argument("--backfill", type=int, metavar="DAYS", help="extend stored history back to DAYS days ago")
+    args = parser.parse_args()
+
     try:
-        # Fetch data
-        df = fetch_historical_ohlcv(EXCHANGE_ID, SYMBOL, TIMEFRAME, LOOKBACK_DAYS)
-        
-        # Sort by datetime
-        df = df.sort_values("datetime").reset_index(drop=True)
-        
-        # Ensure data directory exists
-        output_path = Path(OUTPUT_FILE)
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        # Save to CSV
-        df.to_csv(OUTPUT_FILE, index=False)
-        
-        # Print summary
-        print("\n" + "="*60)
-        print("Data Pull Summary")
-        print("="*60)
-        print(f"Total candles: {len(df)}")
-        print(f"Date range: {df['datetime'].min()} to {df['datetime'].max()}")
-        print(f"Output file: {OUTPUT_FILE}")
-        print(f"File size: {os.path.getsize(OUTPUT_FILE) / 1024:.2f} KB")
-        print("="*60)
-        print(f"\nData saved successfully to '{OUTPUT_FILE}'")
-        print("You can now use this file for backtesting without fetching data again.")
-        
+        if args.full or not INCREMENTAL:
+            pull_and_save_data(args.backfill or LOOKBACK_DAYS)
+        else:
+            sync_data(args.backfill)
     except Exception as e:
         print(f"\nError fetching data: {e}")
         print("Please check your internet connection and exchange configuration.")
@@ -88,5 +167,5 @@ def pull_and_save_data() -> None:
 
 
 if __name__ == "__main__":  # pragma: no cover
-    pull_and_save_data()
+    main()
 
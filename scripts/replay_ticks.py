@@ -0,0 +1,279 @@
+"""
+Tick Replay Backtest for the ATR Breakout Strategy
+==================================================
+
+Replays exchange trades (Binance ``aggTrades`` dumps, optionally
+compressed) through the ATR Breakout strategy:
+
+- trades are streamed in chunks and aggregated into candles on the fly
+  (see ``src/tick_data.py``)
+- indicators are updated candle by candle with the streaming indicators,
+  which match the batch indicators exactly, and signals are evaluated with
+  the same rule set as ``generate_atr_breakout_signals``
+- entries, ATR stop loss / take profit and opposite-signal exits follow
+  ``backtest_atr_breakout_strategy``, except that stops and targets are
+  checked trade by trade: a position exits at the price and time of the
+  first trade at or through its stop or target (gaps fill at the trade
+  price, not the level)
+
+Memory use is bounded by the chunk size: only one chunk of trades, the
+trades of one unfinished candle and the O(1) indicator state are held at
+a time, so months of ticks can be replayed on a small machine.
+
+Usage
+-----
+    python replay_ticks.py data/ticks/BTCUSDT-aggTrades-2024-01.zip data/ticks/BTCUSDT-aggTrades-2024-02.zip
+    python replay_ticks.py data/ticks/*.zip --timeframe 5m --chunksize 500000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "src"))
+
+import numpy as _np
+import pandas as _pd
+
+from utils import timeframe_to_ms
+from streaming_indicators import StreamingADX, StreamingATR, StreamingEMA, StreamingRSI, StreamingSMA
+from tick_data import BarChunk, iter_bar_chunks, iter_trade_chunks
+from backtest_optimized import StrategyResult, Trade, atr_breakout_signals_from_arrays
+
+from config import (
+    TIMEFRAME,
+    RISK_PER_TRADE,
+    FEE_PER_TRADE,
+    ATR_BREAKOUT_MULTIPLIER,
+    ATR_SL_MULTIPLIER,
+    ATR_TP_RR,
+    RSI_LONG_MIN,
+    RSI_LONG_MAX,
+    RSI_SHORT_MIN,
+    RSI_SHORT_MAX,
+    VOLUME_MULTIPLIER,
+    ADX_THRESHOLD,
+    INDICATOR_SMOOTHING,
+)
+
+
+# Candles before this index never signal (same as atr_breakout_signals)
+WARMUP_CANDLES = 50
+
+
+# ----------------------------------------------------------------------
+# Replay engine
+# ----------------------------------------------------------------------
+
+class _Indicators:
+    """Streaming versions of the indicators read by atr_breakout_signals."""
+
+    NAMES = ("ema20", "ema50", "atr", "rsi", "volume_sma", "adx")
+
+    def __init__(self, smoothing: str = INDICATOR_SMOOTHING):
+        self.ema20 = StreamingEMA(20)
+        self.ema50 = StreamingEMA(50)
+        self.atr = StreamingATR(14, smoothing)
+        self.rsi = StreamingRSI(14, smoothing)
+        self.volume_sma = StreamingSMA(20)
+        self.adx = StreamingADX(14, smoothing)
+
+    def update(self, bars: BarChunk) -> Dict[str, _np.ndarray]:
+        """Advance over every candle of ``bars``; returns per-candle values."""
+        n = len(bars)
+        out = {name: _np.empty(n) for name in self.NAMES}
+        high, low, close, volume = (
+            bars.high.tolist(), bars.low.tolist(), bars.close.tolist(), bars.volume.tolist()
+        )
+        for j in range(n):
+            h, l, c = high[j], low[j], close[j]
+            out["ema20"][j] = self.ema20.update(c)
+            out["ema50"][j] = self.ema50.update(c)
+            out["atr"][j] = self.atr.update(h, l, c)
+            out["rsi"][j] = self.rsi.update(c)
+            out["volume_sma"][j] = self.volume_sma.update(volume[j])
+            out["adx"][j] = self.adx.update(h, l, c)
+        return out
+
+
+def _first_touch(prices: _np.ndarray, direction: int, stop: float, tp: float) -> int:
+    """Index of the first trade at or through the stop or target, or -1."""
+    if direction == 1:
+        hits = (prices <= stop) | (prices >= tp)
+    else:
+        hits = (prices >= stop) | (prices <= tp)
+    if not hits.any():
+        return -1
+    return int(_np.argmax(hits))
+
+
+def replay_atr_breakout(
+    paths: Union[str, Path, Sequence[Union[str, Path]]],
+    timeframe: str = TIMEFRAME,
+    chunksize: int = 1_000_000,
+    atr_breakout_mult: float = ATR_BREAKOUT_MULTIPLIER,
+    rsi_long_min: float = RSI_LONG_MIN,
+    rsi_long_max: float = RSI_LONG_MAX,
+    rsi_short_min: float = RSI_SHORT_MIN,
+    rsi_short_max: float = RSI_SHORT_MAX,
+    volume_mult: float = VOLUME_MULTIPLIER,
+    adx_threshold: float = ADX_THRESHOLD,
+    sl_mult: float = ATR_SL_MULTIPLIER,
+    tp_rr: float = ATR_TP_RR,
+    risk_per_trade: float = RISK_PER_TRADE,
+    fee_per_trade: float = FEE_PER_TRADE,
+    smoothing: str = INDICATOR_SMOOTHING,
+    name: str = "ATR Breakout (tick replay)",
+) -> Tuple[StrategyResult, Dict[str, int]]:
+    """
+    Replay trade files through the ATR Breakout strategy.
+
+    Parameters
+    ----------
+    paths : path or list of paths
+        aggTrade files, oldest first.
+    timeframe : str
+        Candle timeframe the strategy runs on (e.g. ``"1m"``).
+    chunksize : int
+        Trades read per chunk; bounds memory use.
+
+    Remaining parameters are the strategy thresholds, risk settings and
+    ATR / RSI / ADX smoothing (defaults from ``config.py``).
+
+    Returns
+    -------
+    (StrategyResult, dict)
+        Trades (entry times are candle open times, as in the candle
+        backtests; stop / target exits carry the time of the exit trade)
+        and counters: ``trades_read``, ``candles``, ``chunks``,
+        ``max_chunk_trades``.
+    """
+    result = StrategyResult(name)
+    stats = {"trades_read": 0, "candles": 0, "chunks": 0, "max_chunk_trades": 0}
+    indicators = _Indicators(smoothing)
+
+    in_pos = False
+    direction = 0
+    entry_time = None
+    entry_price = stop = tp = quantity = 0.0
+
+    def close_position(exit_time, exit_price: float) -> None:
+        result.trades.append(
+            Trade(
+                entry_time=entry_time,
+                entry_price=entry_price,
+                exit_time=exit_time,
+                exit_price=exit_price,
+                direction="long" if direction == 1 else "short",
+                quantity=quantity,
+                profit=(exit_price - entry_price) * direction * quantity - fee_per_trade,
+            )
+        )
+
+    for bars in iter_bar_chunks(iter_trade_chunks(paths, chunksize), timeframe_to_ms(timeframe)):
+        n = len(bars)
+        offset = stats["candles"]
+        stats["candles"] += n
+        stats["chunks"] += 1
+        stats["trades_read"] += len(bars.trades)
+        stats["max_chunk_trades"] = max(stats["max_chunk_trades"], len(bars.trades))
+
+        values = indicators.update(bars)
+        signals = atr_breakout_signals_from_arrays(
+            bars.close,
+            bars.volume,
+            values["ema20"],
+            values["ema50"],
+            values["atr"],
+            values["rsi"],
+            values["volume_sma"],
+            values["adx"],
+            atr_breakout_mult,
+            rsi_long_min,
+            rsi_long_max,
+            rsi_short_min,
+            rsi_short_max,
+            volume_mult,
+            adx_threshold,
+            warmup=0,
+        )
+        if offset < WARMUP_CANDLES:
+            signals[:WARMUP_CANDLES - offset] = 0
+
+        atr_val = values["atr"]
+        close = bars.close
+        trade_ts = bars.trades.timestamp
+        trade_price = bars.trades.price
+        for j in range(n):
+            if _np.isnan(atr_val[j]):
+                continue
+            sig = int(signals[j])
+            if in_pos:
+                a, b = int(bars.starts[j]), int(bars.ends[j])
+                k = _first_touch(trade_price[a:b], direction, stop, tp) if b > a else -1
+                if k >= 0:
+                    close_position(_pd.Timestamp(int(trade_ts[a + k]), unit="ms"), float(trade_price[a + k]))
+                    in_pos = False
+                elif sig == -direction:
+                    close_position(_pd.Timestamp(int(bars.timestamp[j]), unit="ms"), float(close[j]))
+                    in_pos = False
+                continue
+
+            if sig == 0:
+                continue
+            # Same arithmetic as simulate_atr_trades
+            price = float(close[j])
+            a_j = float(atr_val[j])
+            if sig == 1:
+                new_stop, new_tp = price - sl_mult * a_j, price + tp_rr * a_j
+                risk = price - new_stop
+            else:
+                new_stop, new_tp = price + sl_mult * a_j, price - tp_rr * a_j
+                risk = new_stop - price
+            if risk > 0:
+                direction = sig
+                entry_time = _pd.Timestamp(int(bars.timestamp[j]), unit="ms")
+                entry_price = price
+                stop, tp = new_stop, new_tp
+                quantity = risk_per_trade / risk
+                in_pos = True
+
+    return result, stats
+
+
+# ----------------------------------------------------------------------
+# Command line
+# ----------------------------------------------------------------------
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Replay aggTrade files through the ATR Breakout strategy.")
+    parser.add_argument("files", nargs="+", help="aggTrade CSV files (.csv, .zip, .gz, .bz2, .xz), oldest first")
+    parser.add_argument("--timeframe", default=TIMEFRAME, help=f"candle timeframe (default: {TIMEFRAME})")
+    parser.add_argument("--chunksize", type=int, default=1_000_000, help="trades read per chunk (default: 1000000)")
+    args = parser.parse_args(argv)
+
+    files = sorted(args.files)
+    print(f"Replaying {len(files)} file(s) on {args.timeframe} candles...")
+    started = time.perf_counter()
+    res, stats = replay_atr_breakout(files, timeframe=args.timeframe, chunksize=args.chunksize)
+    elapsed = time.perf_counter() - started
+
+    print(f"Read {stats['trades_read']:,} trades into {stats['candles']:,} candles "
+          f"in {stats['chunks']} chunk(s) ({elapsed:.1f}s)")
+    print("\n" + "="*70)
+    print(f"Strategy: {res.name}")
+    print(f"  Trades executed: {res.trade_count}")
+    print(f"  Wins: {res.wins}, Losses: {res.losses}, Win rate: {res.win_rate:.2%}")
+    if res.trade_count > 0:
+        print(f"  Avg Win: ${res.avg_win:.2f}, Avg Loss: ${res.avg_loss:.2f}")
+    print(f"  Total P/L (USD): {res.total_profit:.2f}")
+    print("="*70)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -0,0 +1,290 @@
+"""
+Rolling candle buffer for the production loop
+=============================================
+
+Holds the most recent ``capacity`` OHLCV candles in preallocated NumPy
+arrays.  The buffer is seeded once with a full lookback and then topped up
+with only the candles returned by ``fetch_ohlcv(since=last_timestamp)``:
+the last stored candle is overwritten with its updated values and newer
+candles are appended, evicting the oldest ones.
+
+Storage is a linear array of twice the capacity; rows are appended at the
+end and the live window is moved back to the front when the end is
+reached.  Column views are therefore always contiguous slices, with no
+copying on the read path.  Indexing by column name returns pandas Series
+backed by those views, so indicator code written for DataFrames (``ema``,
+``atr``, ``get_signal_info`` ...) works on the buffer directly.
+
+The buffer also decides which candles a strategy evaluation sees
+(:meth:`CandleBuffer.evaluation_view`):
+
+- ``"closed"``: only fully closed candles; the still-forming last candle
+  is left out, so results do not depend on when within the bar the
+  exchange was polled
+- ``"intrabar"``: include the forming candle, with its volume projected
+  to a full bar (``volume * timeframe / elapsed``) so volume filters are
+  comparable with closed bars
+
+Each view carries a key identifying the evaluated bar;
+:meth:`CandleBuffer.is_evaluated` / :meth:`CandleBuffer.mark_evaluated`
+let callers skip repeated evaluations of the same bar.
+"""
+
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+import numpy as _np
+import pandas as _pd
+
+
+OHLCV_COLUMNS = ("open", "high", "low", "close", "volume")
+
+EVALUATION_POLICIES = ("closed", "intrabar")
+
+
+class _CandleColumns(ABC):
+    """DataFrame-like column access shared by buffers and views."""
+
+    @property
+    @abstractmethod
+    def timestamp(self) -> _np.ndarray:
+        """Candle open times in milliseconds."""
+
+    @abstractmethod
+    def values(self, column: str) -> _np.ndarray:
+        """Values of one OHLCV column."""
+
+    def __len__(self) -> int:
+        return len(self.timestamp)
+
+    @property
+    def columns(self):
+        return ["datetime"] + list(OHLCV_COLUMNS)
+
+    @property
+    def index(self) -> _pd.RangeIndex:
+        return _pd.RangeIndex(len(self))
+
+    def __getitem__(self, name: str) -> _pd.Series:
+        if name == "datetime":
+            values = self.timestamp.view("datetime64[ms]")
+        elif name in OHLCV_COLUMNS:
+            values = self.values(name)
+        else:
+            raise KeyError(name)
+        return _pd.Series(values, index=self.index, name=name, copy=False)
+
+    def to_frame(self) -> _pd.DataFrame:
+        """Copy the candles into a regular DataFrame."""
+        frame = _pd.DataFrame({"datetime": _pd.to_datetime(self.timestamp, unit="ms")})
+        for col in OHLCV_COLUMNS:
+            frame[col] = self.values(col).copy()
+        return frame
+
+
+class CandleView(_CandleColumns):
+    """
+    Read-only window of candles selected for one strategy evaluation.
+
+    ``key`` identifies the evaluated bar (policy, open time and, for
+    intrabar views, the bar's current values); ``closed`` tells whether
+    the last candle has closed and ``projected`` whether its volume was
+    projected to a full bar.
+    """
+
+    def __init__(self, timestamp: _np.ndarray, values: Dict[str, _np.ndarray],
+                 key: Tuple, closed: bool, projected: bool = False):
+        self._ts = timestamp
+        self._cols = values
+        self.key = key
+        self.closed = closed
+        self.projected = projected
+
+    @property
+    def timestamp(self) -> _np.ndarray:
+        return self._ts
+
+    def values(self, column: str) -> _np.ndarray:
+        return self._cols[column]
+
+
+class CandleBuffer(_CandleColumns):
+    """
+    Fixed-capacity ring buffer of OHLCV candles.
+
+    Parameters
+    ----------
+    capacity : int
+        Number of most recent candles to keep.
+    timeframe_ms : int, optional
+        Candle length in milliseconds; required by
+        :meth:`evaluation_view`.
+    """
+
+    def __init__(self, capacity: int, timeframe_ms: Optional[int] = None):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = int(capacity)
+        self.timeframe_ms = int(timeframe_ms) if timeframe_ms else None
+        self._timestamp = _np.zeros(2 * self.capacity, dtype=_np.int64)
+        self._values = {col: _np.zeros(2 * self.capacity, dtype=_np.float64) for col in OHLCV_COLUMNS}
+        self._start = 0
+        self._end = 0
+        self._evaluated_key: Optional[Tuple] = None
+
+    # Size and timestamps -------------------------------------------------
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    @property
+    def last_timestamp(self) -> Optional[int]:
+        """Open time (ms since epoch) of the newest candle, or None if empty."""
+        if self._end == self._start:
+            return None
+        return int(self._timestamp[self._end - 1])
+
+    # Contiguous views ----------------------------------------------------
+
+    @property
+    def timestamp(self) -> _np.ndarray:
+        return self._timestamp[self._start:self._end]
+
+    def values(self, column: str) -> _np.ndarray:
+        """Contiguous view of one OHLCV column, oldest candle first."""
+        return self._values[column][self._start:self._end]
+
+    # Updates -------------------------------------------------------------
+
+    def clear(self) -> None:
+        """Drop every buffered candle."""
+        self._start = 0
+        self._end = 0
+
+    def seed(self, rows: Iterable[Sequence[float]]) -> int:
+        """Replace the contents with ccxt-style ``[ts, o, h, l, c, v]`` rows."""
+        self.clear()
+        return self.update(rows)
+
+    def seed_frame(self, df: _pd.DataFrame) -> int:
+        """Replace the contents with the candles in an OHLCV DataFrame."""
+        stamps = _pd.to_datetime(df["datetime"]).to_numpy(dtype="datetime64[ms]").view(_np.int64)
+        columns = [df[col].to_numpy(dtype=_np.float64) for col in OHLCV_COLUMNS]
+        return self.seed(zip(stamps.tolist(), *(col.tolist() for col in columns)))
+
+    def update(self, rows: Iterable[Sequence[float]]) -> int:
+        """
+        Merge ccxt-style ``[timestamp, open, high, low, close, volume]`` rows.
+
+        Rows for a timestamp already in the buffer overwrite that candle
+        (typically the last one, which was still forming); newer rows are
+        appended; rows older than the buffered window are ignored.
+
+        Returns
+        -------
+        int
+            Number of candles appended.
+        """
+        appended = 0
+        for row in rows:
+            ts = int(row[0])
+            last = self.last_timestamp
+            if last is None or ts > last:
+                self._append_slot()
+                pos = self._end - 1
+                appended += 1
+            elif ts == last:
+                pos = self._end - 1
+            else:
+                live = self.timestamp
+                k = int(_np.searchsorted(live, ts))
+                if k == len(live) or live[k] != ts:
+                    continue
+                pos = self._start + k
+            self._timestamp[pos] = ts
+            for col, value in zip(OHLCV_COLUMNS, row[1:6]):
+                self._values[col][pos] = value
+        return appended
+
+    # Evaluation policy ---------------------------------------------------
+
+    def evaluation_view(
+        self,
+        policy: str = "closed",
+        now_ms: Optional[float] = None,
+        min_elapsed_fraction: float = 0.1,
+    ) -> Optional[CandleView]:
+        """
+        Select the candles a strategy evaluation should see.
+
+        Parameters
+        ----------
+        policy : str
+            ``"closed"`` (closed candles only) or ``"intrabar"`` (include
+            the forming candle with projected volume).
+        now_ms : float, optional
+            Current exchange time in milliseconds (default: local clock).
+        min_elapsed_fraction : float
+            Lower bound on the elapsed fraction of the bar used for the
+            volume projection, so the first seconds of a bar are not
+            extrapolated wildly.
+
+        Returns
+        -------
+        CandleView or None
+            None when there is no candle to evaluate yet.
+        """
+        if policy not in EVALUATION_POLICIES:
+            raise ValueError(f"Unknown evaluation policy '{policy}'. Use one of: {', '.join(EVALUATION_POLICIES)}")
+        if self.timeframe_ms is None:
+            raise ValueError("CandleBuffer needs timeframe_ms for evaluation views")
+        n = len(self)
+        if n == 0:
+            return None
+        if now_ms is None:
+            now_ms = time.time() * 1000.0
+
+        last_ts = int(self._timestamp[self._end - 1])
+        elapsed = now_ms - last_ts
+        last_closed = elapsed >= self.timeframe_ms
+        stop = self._end if (last_closed or policy == "intrabar") else self._end - 1
+        if stop <= self._start:
+            return None
+
+        timestamp = self._timestamp[self._start:stop]
+        values = {col: arr[self._start:stop] for col, arr in self._values.items()}
+        bar_ts = int(timestamp[-1])
+
+        if policy == "closed" or last_closed:
+            return CandleView(timestamp, values, ("closed", bar_ts), closed=True)
+
+        # Intrabar: project the forming bar's volume to a full bar
+        fraction = max(elapsed / self.timeframe_ms, min_elapsed_fraction)
+        volume = values["volume"].copy()
+        volume[-1] = volume[-1] / fraction
+        values["volume"] = volume
+        row = tuple(float(values[col][-1]) for col in ("open", "high", "low", "close"))
+        key = ("intrabar", bar_ts) + row + (float(self._values["volume"][stop - 1]),)
+        return CandleView(timestamp, values, key, closed=False, projected=True)
+
+    def is_evaluated(self, view: CandleView) -> bool:
+        """True if ``view`` describes the bar evaluated last (nothing changed)."""
+        return view.key == self._evaluated_key
+
+    def mark_evaluated(self, view: CandleView) -> None:
+        """Remember ``view`` as evaluated so repeats can be skipped."""
+        self._evaluated_key = view.key
+
+    def _append_slot(self) -> None:
+        """Reserve one row at the end, evicting the oldest if full."""
+        if self._end == len(self._timestamp):
+            # Move the live window back to the front of the storage
+            n = self._end - self._start
+            self._timestamp[:n] = self._timestamp[self._start:self._end]
+            for values in self._values.values():
+                values[:n] = values[self._start:self._end]
+            self._start, self._end = 0, n
+        self._end += 1
+        if self._end - self._start > self.capacity:
+            self._start += 1
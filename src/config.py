@@ -81,6 +81,13 @@ ATR_TP_RR: float = 3.5
 # Range: 0.5 - 2.0
 ATR_SL_MULTIPLIER: float = 1.0
 
+# Smoothing of ATR, RSI and ADX
+# Options: "rolling" (simple rolling mean over the period), "wilder"
+# (Wilder's smoothing / RMA, as shown by exchanges and TradingView)
+# The optimized values in this file were found with "rolling"
+# Backtests, optimizers and the production scripts all use this setting
+INDICATOR_SMOOTHING: str = "rolling"
+
 
 # ============================================================================
 # RSI FILTER PARAMETERS
@@ -153,6 +160,18 @@ RISK_PER_TRADE: float = 5.0
 # Adjust based on your exchange and trading volume
 FEE_PER_TRADE: float = 1.4
 
+# How backtests fill stop loss / take profit exits
+# Options: "close" (exit when a candle closes beyond a level, at the close)
+# or "high_low" (exit when a candle's high/low touches a level, at the level)
+# With "high_low", candles that touched both levels are resolved with
+# INTRABAR_DATA_FILE if set, otherwise the stop is assumed to fill first
+EXIT_FILL: str = "close"
+
+# Higher-resolution OHLCV file (e.g. 1s candles) used only for candles that
+# touched both stop loss and take profit; "" = none
+# A binary (.npy) file is memory-mapped, so only the needed parts are read
+INTRABAR_DATA_FILE: str = ""
+
 
 # ============================================================================
 # OTHER STRATEGY PARAMETERS (for backtesting)
@@ -189,32 +208,109 @@ LOOKBACK_DAYS: int = 30
 # Path is relative to project root
 DATA_FILE: str = "data/btcusdt_ohlcv.csv"
 
+# Storage format for OHLCV data files
+# Options: "csv" (default) or, opt-in, "parquet", "feather", "binary"
+# Columnar formats (parquet/feather) store typed int64 timestamps and float64
+# prices, and load much faster than CSV (requires pyarrow)
+# "binary" writes fixed-width records (.npy) that backtest_optimized.py
+# memory-maps instead of loading, for multi-year 1m history on small VMs
+# DATA_FILE is used as a base name: with "parquet" the file read/written is
+# data/btcusdt_ohlcv.parquet; an existing CSV is still used until converted
+# Convert existing files with: python scripts/convert_data.py --format parquet
+DATA_FORMAT: str = "csv"
+
+# SQLite file where optimization scripts store backtest result summaries,
+# keyed by dataset, strategy version and parameters, so re-runs only
+# backtest parameter sets they have not seen (relative to project root)
+# "" = do not store results
+RESULT_STORE_FILE: str = "data/results.sqlite"
+
+# Optimization scripts abort a parameter set's backtest as soon as its
+# result is certain to be discarded (outside 10-500 trades, or a drawdown
+# of the running P/L above this many USD)
+# 0 = no drawdown limit
+OPTIMIZATION_MAX_DRAWDOWN: float = 0.0
+
 
 # ============================================================================
 # PRODUCTION SCRIPT CONFIGURATION
 # ============================================================================
 
 # Update interval in seconds
-# How often to fetch new data and check for signals
+# How often to fetch new data and check for signals when
+# ALIGN_TO_CANDLE_CLOSE is False (and the REST fallback interval in
+# websocket mode)
 # Recommended: 60 seconds (1 minute) for 1m timeframe
 # For 5m timeframe, you can use 300 seconds (5 minutes)
 UPDATE_INTERVAL: int = 60
 
+# Wake up right after each TIMEFRAME candle closes instead of sleeping
+# UPDATE_INTERVAL seconds after each update (which drifts mid-candle)
+ALIGN_TO_CANDLE_CLOSE: bool = True
+
+# Delay after the candle boundary before fetching, in seconds
+# Gives the exchange time to publish the closed candle
+CANDLE_SETTLE_SECONDS: float = 2.0
+
+# How often to re-measure the local clock offset against exchange server
+# time, in seconds
+CLOCK_SYNC_INTERVAL: int = 3600
+
+# Data feed mode for the production script
+# Options: "rest" (poll every UPDATE_INTERVAL) or "websocket"
+# "websocket" subscribes to the exchange kline stream and evaluates each
+# candle as soon as it closes; it falls back to REST polling while the
+# stream is down (Binance futures only)
+STREAM_MODE: str = "rest"
+
+# Override the WebSocket base URL (empty = exchange default)
+# Example: "ws://localhost:8765/ws" for a local stand-in replaying candles
+STREAM_URL: str = ""
+
+# Seconds without stream messages before the stream is considered dropped
+STREAM_IDLE_TIMEOUT: int = 90
+
+# Which candles a strategy evaluation sees
+# Options: "closed" (closed candles only; signals never change within a
+# candle) or "intrabar" (include the forming candle, with its volume
+# projected to a full candle)
+# Each candle (or, intrabar, each distinct candle update) is evaluated once
+EVALUATION_POLICY: str = "closed"
+
 # Enable/disable screen clearing
 # If True, screen will be cleared before each update (cleaner display)
 # If False, new data will append to screen (see history)
 CLEAR_SCREEN: bool = True
 
 # Signal logging configuration
-# Path to log file for signals (relative to project root)
-# Signals will be logged in JSON format for easy parsing
-SIGNAL_LOG_FILE: str = "logs/signals.log"
+# Path to the signal journal (relative to project root)
+# Signals are logged as JSON Lines (one JSON object per line); read them
+# back with signal_journal.iter_signals / load_signals
+SIGNAL_LOG_FILE: str = "logs/signals.jsonl"
 
 # Enable signal logging
 # If True, signals will be logged to file when detected
 # If False, signals will only be displayed on screen
 ENABLE_SIGNAL_LOGGING: bool = True
 
+# Write buffered signals once this many are pending...
+SIGNAL_LOG_BATCH_SIZE: int = 16
+
+# ...or once the oldest has waited this many seconds
+SIGNAL_LOG_FLUSH_INTERVAL: float = 5.0
+
+# Durability: "never" (OS decides), "flush" (fsync every write-out),
+# "always" (write and fsync every signal)
+SIGNAL_LOG_FSYNC: str = "flush"
+
+# Rotation: start a new file past this size (bytes, 0 = no limit) and/or
+# every period ("none", "hourly", "daily", "weekly")
+SIGNAL_LOG_MAX_BYTES: int = 50 * 1024 * 1024
+SIGNAL_LOG_ROTATE: str = "daily"
+
+# Rotated files to keep (0 = keep all)
+SIGNAL_LOG_BACKUPS: int = 0
+
 
 # ============================================================================
 # TELEGRAM NOTIFICATION CONFIGURATION
@@ -236,6 +332,14 @@ TELEGRAM_CHAT_ID: str = os.getenv("TELEGRAM_CHAT_ID", "")
 # Set to True to receive notifications when bot starts and when signals are detected
 ENABLE_TELEGRAM: bool = True
 
+# Notifications are sent from a background thread; the bot only queues them
+# Maximum number of queued messages (the oldest is dropped when full)
+TELEGRAM_QUEUE_SIZE: int = 100
+
+# Override the Bot API base URL (empty = https://api.telegram.org)
+# Example: "http://localhost:8081" for a local stub server
+TELEGRAM_API_URL: str = ""
+
 
 # ============================================================================
 # ADVANCED CONFIGURATION
@@ -0,0 +1,281 @@
+"""
+Indicator cache for backtests and optimizers
+============================================
+
+The indicators used by the ATR Breakout strategy (EMA, ATR, RSI, ADX and
+volume SMA) only depend on the OHLCV data and their period, never on the
+thresholds being optimized.  This module computes each indicator once per
+dataset and serves the stored array to every later caller.
+
+Entries are keyed by ``(dataset fingerprint, indicator, period)``.  The
+fingerprint is a hash of the timestamps and OHLCV columns, so two frames
+holding the same candles share entries while a different slice or a freshly
+downloaded file gets its own.
+
+ATR, RSI and ADX are registered once per smoothing method: ``"atr"`` uses
+a simple rolling mean and ``"atr_wilder"`` Wilder's smoothing (see
+:func:`indicator_name`).
+
+:func:`get_indicator_arrays` computes all ATR Breakout indicators at once
+with the fused pipeline in ``indicator_pipeline.py`` and stores each of
+them under its regular key.
+"""
+
+import hashlib
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as _np
+import pandas as _pd
+
+from utils import ema, rsi, atr, adx, sma
+from indicator_pipeline import (
+    EMA_FAST,
+    EMA_SLOW,
+    PERIOD,
+    VOLUME_WINDOW,
+    INDICATOR_FIELDS,
+    IndicatorArrays,
+    compute_indicators_frame,
+)
+
+
+OHLCV_COLUMNS = ("open", "high", "low", "close", "volume")
+
+
+# ----------------------------------------------------------------------
+# Indicator registry
+# ----------------------------------------------------------------------
+
+IndicatorFunc = Callable[[_pd.DataFrame, int], _pd.Series]
+
+_INDICATORS: Dict[str, IndicatorFunc] = {
+    "ema": lambda df, period: ema(df["close"], period),
+    "rsi": lambda df, period: rsi(df["close"], window=period),
+    "atr": lambda df, period: atr(df["high"], df["low"], df["close"], period),
+    "adx": lambda df, period: adx(df["high"], df["low"], df["close"], period),
+    "rsi_wilder": lambda df, period: rsi(df["close"], window=period, smoothing="wilder"),
+    "atr_wilder": lambda df, period: atr(df["high"], df["low"], df["close"], period, smoothing="wilder"),
+    "adx_wilder": lambda df, period: adx(df["high"], df["low"], df["close"], period, smoothing="wilder"),
+    "volume_sma": lambda df, period: sma(df["volume"], period),
+}
+
+
+def indicator_name(indicator: str, smoothing: str = "rolling") -> str:
+    """
+    Registered name of ``indicator`` with a smoothing method: ``"atr"``
+    for ``"rolling"``, ``"atr_wilder"`` for ``"wilder"``.
+    """
+    if smoothing == "rolling":
+        return indicator
+    name = f"{indicator}_{smoothing}"
+    if name not in _INDICATORS:
+        raise KeyError(f"No {smoothing} smoothing for indicator: {indicator}")
+    return name
+
+
+def _pipeline_keys(smoothing: str):
+    """(indicator, period) cache key of each ``IndicatorArrays`` field."""
+    return (
+        ("ema", EMA_FAST),
+        ("ema", EMA_SLOW),
+        (indicator_name("atr", smoothing), PERIOD),
+        (indicator_name("rsi", smoothing), PERIOD),
+        ("volume_sma", VOLUME_WINDOW),
+        (indicator_name("adx", smoothing), PERIOD),
+    )
+
+
+def register_indicator(name: str, func: IndicatorFunc) -> None:
+    """
+    Register an indicator so it can be served from the cache.
+
+    Parameters
+    ----------
+    name : str
+        Indicator name used in cache keys (e.g. ``"ema"``).
+    func : callable
+        ``func(df, period)`` returning a Series aligned with ``df``.
+    """
+    _INDICATORS[name] = func
+
+
+# ----------------------------------------------------------------------
+# Dataset fingerprint
+# ----------------------------------------------------------------------
+
+def dataset_fingerprint(df: _pd.DataFrame) -> str:
+    """
+    Return a stable hash of the candles in ``df``.
+
+    The hash covers the row count, the ``datetime`` column (when present)
+    and the OHLCV columns, so it only changes when the data changes.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    h.update(str(len(df)).encode("ascii"))
+    if "datetime" in df.columns:
+        stamps = _pd.to_datetime(df["datetime"]).to_numpy(dtype="datetime64[ns]")
+        h.update(_np.ascontiguousarray(stamps.view(_np.int64)).data)
+    for col in OHLCV_COLUMNS:
+        if col in df.columns:
+            h.update(col.encode("ascii"))
+            h.update(_np.ascontiguousarray(df[col].to_numpy(dtype=_np.float64)).data)
+    return h.hexdigest()
+
+
+# ----------------------------------------------------------------------
+# Cache
+# ----------------------------------------------------------------------
+
+class IndicatorCache:
+    """
+    LRU cache of indicator arrays keyed by (fingerprint, indicator, period).
+
+    Fingerprints are memoized per DataFrame object, so frames must not be
+    modified in place after their first lookup.  Cached arrays are returned
+    read-only for the same reason.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple[str, str, int], _np.ndarray]" = OrderedDict()
+        self._fingerprints: Dict[int, Tuple[weakref.ref, str]] = {}
+        self._lock = threading.Lock()
+
+    def fingerprint(self, df: _pd.DataFrame) -> str:
+        """Return the (memoized) dataset fingerprint of ``df``."""
+        key = id(df)
+        with self._lock:
+            memo = self._fingerprints.get(key)
+            if memo is not None and memo[0]() is df:
+                return memo[1]
+
+        fp = dataset_fingerprint(df)
+        fingerprints = self._fingerprints
+
+        def _forget(_ref, key=key):
+            fingerprints.pop(key, None)
+
+        with self._lock:
+            self._fingerprints[key] = (weakref.ref(df, _forget), fp)
+        return fp
+
+    def get(self, df: _pd.DataFrame, indicator: str, period: int) -> _np.ndarray:
+        """
+        Return indicator values for ``df`` as a read-only float64 array.
+
+        Parameters
+        ----------
+        df : pandas.DataFrame
+            OHLCV data with ``open``, ``high``, ``low``, ``close`` and
+            ``volume`` columns.
+        indicator : str
+            Registered indicator name (``ema``, ``rsi``, ``atr``, ``adx``,
+            ``volume_sma``).
+        period : int
+            Indicator period / window.
+        """
+        if indicator not in _INDICATORS:
+            raise KeyError(f"Unknown indicator: {indicator}")
+
+        key = (self.fingerprint(df), indicator, int(period))
+        with self._lock:
+            values = self._entries.get(key)
+            if values is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return values
+
+        values = _np.array(_INDICATORS[indicator](df, int(period)), dtype=_np.float64)
+        values.setflags(write=False)
+
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = values
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return values
+
+    def arrays(self, df: _pd.DataFrame, smoothing: str = "rolling") -> IndicatorArrays:
+        """
+        All ATR Breakout indicators of ``df`` (read-only), computed in one
+        pass by ``indicator_pipeline.compute_indicators`` unless every one
+        of them is cached already.  Each array is cached under the same
+        key as :meth:`get` uses, so later single lookups are hits.
+        """
+        fp = self.fingerprint(df)
+        keys = [(fp, name, period) for name, period in _pipeline_keys(smoothing)]
+        with self._lock:
+            values = [self._entries.get(key) for key in keys]
+            if all(v is not None for v in values):
+                for key in keys:
+                    self._entries.move_to_end(key)
+                self.hits += len(keys)
+                return IndicatorArrays(*values)
+
+        result = compute_indicators_frame(df, smoothing)
+        values = [getattr(result, name) for name in INDICATOR_FIELDS]
+        for v in values:
+            v.setflags(write=False)
+
+        with self._lock:
+            self.misses += len(keys)
+            for key, v in zip(keys, values):
+                self._entries[key] = v
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return result
+
+    def series(self, df: _pd.DataFrame, indicator: str, period: int) -> _pd.Series:
+        """Same as :meth:`get` but wrapped in a Series aligned with ``df``."""
+        return _pd.Series(self.get(df, indicator, period), index=df.index)
+
+    def clear(self) -> None:
+        """Drop all cached arrays and fingerprints."""
+        with self._lock:
+            self._entries.clear()
+            self._fingerprints.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Process-wide cache shared by every backtest and optimizer entry point
+DEFAULT_CACHE = IndicatorCache()
+
+
+def get_indicator(
+    df: _pd.DataFrame,
+    indicator: str,
+    period: int,
+    cache: Optional[IndicatorCache] = None,
+) -> _np.ndarray:
+    """Return a cached indicator array from ``cache`` (default: shared cache)."""
+    return (cache if cache is not None else DEFAULT_CACHE).get(df, indicator, period)
+
+
+def get_indicator_arrays(
+    df: _pd.DataFrame,
+    smoothing: str = "rolling",
+    cache: Optional[IndicatorCache] = None,
+) -> IndicatorArrays:
+    """Return all cached ATR Breakout indicators of ``df`` (see :meth:`IndicatorCache.arrays`)."""
+    return (cache if cache is not None else DEFAULT_CACHE).arrays(df, smoothing)
+
+
+def get_indicator_series(
+    df: _pd.DataFrame,
+    indicator: str,
+    period: int,
+    cache: Optional[IndicatorCache] = None,
+) -> _pd.Series:
+    """Return a cached indicator as a Series aligned with ``df``."""
+    return (cache if cache is not None else DEFAULT_CACHE).series(df, indicator, period)
@@ -0,0 +1,164 @@
+"""
+Fused indicator pipeline
+========================
+
+Computes every indicator of the ATR Breakout strategy (EMA fast / slow,
+ATR, RSI, volume SMA and ADX) in one pass over NumPy arrays, with the same
+values as the separate functions in ``utils.py``:
+
+- the true range is built once (element-wise maxima, no 3-column frame)
+  and shared by ATR and ADX
+- true range, +DM / -DM and RSI gains / losses are smoothed together as
+  the columns of one work block, in a single rolling call (or one Wilder
+  pass per column)
+- the results are written into one preallocated ``(6, n)`` buffer and
+  returned as an :class:`IndicatorArrays` struct whose fields are rows of
+  that buffer
+
+The arithmetic follows ``utils.ema`` / ``rsi`` / ``atr`` / ``adx`` /
+``sma`` operation by operation, so both paths give bit-identical values.
+"""
+
+from dataclasses import dataclass, fields
+from typing import Dict
+
+import numpy as _np
+import pandas as _pd
+
+from utils import wilder_mean
+
+
+# Indicator periods of the ATR Breakout strategy
+EMA_FAST = 20
+EMA_SLOW = 50
+PERIOD = 14
+VOLUME_WINDOW = 20
+
+
+@dataclass
+class IndicatorArrays:
+    """
+    Indicator values aligned with the candles, as rows of one float64
+    block (``block``).  Field names are the keys used by the signal
+    generators (``atr_breakout_arrays`` in ``backtest_optimized.py``).
+    """
+    ema20: _np.ndarray
+    ema50: _np.ndarray
+    atr: _np.ndarray
+    rsi: _np.ndarray
+    volume_sma: _np.ndarray
+    adx: _np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.atr)
+
+    def as_dict(self) -> Dict[str, _np.ndarray]:
+        """Arrays keyed by field name."""
+        return {f.name: getattr(self, f.name) for f in fields(self)}
+
+    def latest(self) -> Dict[str, float]:
+        """Values of the last candle, keyed by field name."""
+        return {name: float(values[-1]) for name, values in self.as_dict().items()}
+
+
+INDICATOR_FIELDS = tuple(f.name for f in fields(IndicatorArrays))
+
+
+def _smooth_block(block: _np.ndarray, period: int, smoothing: str) -> _np.ndarray:
+    """Smooth each column of ``block`` like ``utils._smooth``."""
+    if smoothing == "rolling":
+        return _pd.DataFrame(block).rolling(period).mean().to_numpy()
+    if smoothing == "wilder":
+        return _np.column_stack([wilder_mean(_pd.Series(col), period).to_numpy() for col in block.T])
+    raise ValueError(f"Unknown smoothing '{smoothing}'. Use 'rolling' or 'wilder'")
+
+
+def compute_indicators(
+    high: _np.ndarray,
+    low: _np.ndarray,
+    close: _np.ndarray,
+    volume: _np.ndarray,
+    smoothing: str = "rolling",
+    ema_fast: int = EMA_FAST,
+    ema_slow: int = EMA_SLOW,
+    period: int = PERIOD,
+    volume_window: int = VOLUME_WINDOW,
+) -> IndicatorArrays:
+    """
+    Compute the ATR Breakout indicators in one pass.
+
+    Parameters
+    ----------
+    high, low, close, volume : array-like
+        Candle columns, oldest first.
+    smoothing : str
+        ``"rolling"`` or ``"wilder"`` smoothing for ATR, RSI and ADX (see
+        ``utils.atr``).
+    ema_fast, ema_slow, period, volume_window : int
+        EMA spans, ATR / RSI / ADX period and volume SMA window.
+
+    Returns
+    -------
+    IndicatorArrays
+        The ``ema20`` / ``ema50`` fields hold the ``ema_fast`` /
+        ``ema_slow`` EMAs.
+    """
+    high = _np.asarray(high, dtype=_np.float64)
+    low = _np.asarray(low, dtype=_np.float64)
+    close = _np.asarray(close, dtype=_np.float64)
+    volume = _np.asarray(volume, dtype=_np.float64)
+    n = len(close)
+
+    out = _np.empty((len(INDICATOR_FIELDS), n), dtype=_np.float64)
+    result = IndicatorArrays(*out)
+    if n == 0:
+        return result
+
+    close_series = _pd.Series(close)
+    result.ema20[:] = close_series.ewm(span=ema_fast, adjust=False).mean().to_numpy()
+    result.ema50[:] = close_series.ewm(span=ema_slow, adjust=False).mean().to_numpy()
+    result.volume_sma[:] = _pd.Series(volume).rolling(volume_window).mean().to_numpy()
+
+    # Work block: true range, +DM, -DM, RSI gain, RSI loss
+    work = _np.empty((n, 5), dtype=_np.float64)
+    tr, plus_dm, minus_dm, up, down = work.T
+    tr[0] = high[0] - low[0]
+    _np.subtract(high[1:], low[1:], out=tr[1:])
+    _np.fmax(tr[1:], _np.abs(high[1:] - close[:-1]), out=tr[1:])
+    _np.fmax(tr[1:], _np.abs(low[1:] - close[:-1]), out=tr[1:])
+
+    plus_dm[0] = minus_dm[0] = _np.nan
+    _np.subtract(high[1:], high[:-1], out=plus_dm[1:])
+    _np.negative(low[1:] - low[:-1], out=minus_dm[1:])
+    plus_dm[plus_dm < 0] = 0
+    minus_dm[minus_dm < 0] = 0
+
+    delta = _np.empty(n, dtype=_np.float64)
+    delta[0] = _np.nan
+    _np.subtract(close[1:], close[:-1], out=delta[1:])
+    up[:] = _np.where(delta < 0, 0.0, delta)
+    _np.negative(_np.where(delta > 0, 0.0, delta), out=down)
+
+    smoothed = _smooth_block(work, period, smoothing)
+    atr_val, plus_avg, minus_avg, gain, loss = smoothed.T
+
+    with _np.errstate(divide="ignore", invalid="ignore"):
+        result.atr[:] = atr_val
+        result.rsi[:] = 100 - (100 / (1 + gain / loss))
+        plus_di = 100 * (plus_avg / atr_val)
+        minus_di = 100 * (minus_avg / atr_val)
+        dx = 100 * _np.abs(plus_di - minus_di) / (plus_di + minus_di)
+    result.adx[:] = _smooth_block(dx[:, None], period, smoothing)[:, 0]
+    return result
+
+
+def compute_indicators_frame(df, smoothing: str = "rolling", **periods) -> IndicatorArrays:
+    """:func:`compute_indicators` on the columns of an OHLCV DataFrame (or ``CandleBuffer``)."""
+    return compute_indicators(
+        df["high"].to_numpy(dtype=_np.float64),
+        df["low"].to_numpy(dtype=_np.float64),
+        df["close"].to_numpy(dtype=_np.float64),
+        df["volume"].to_numpy(dtype=_np.float64),
+        smoothing=smoothing,
+        **periods,
+    )
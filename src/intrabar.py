@@ -0,0 +1,127 @@
+"""
+Intrabar price paths
+====================
+
+Higher-resolution price data (e.g. 1s candles or individual trades) used
+by the backtest simulators to decide which level a position reached first
+when a single candle touched both its stop loss and its take profit.
+
+Lookups are lazy: nothing is scanned up front.  A candle is resolved by
+binary-searching its ``[start, end)`` time range in the sorted timestamp
+column and scanning only that slice, so a binary (``.npy``) file opened
+with :func:`open_intrabar_path` stays memory-mapped and only the pages for
+the few ambiguous candles are ever read.
+"""
+
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+import numpy as _np
+import pandas as _pd
+
+from ohlcv_store import format_from_path, load_ohlcv, open_ohlcv_arrays
+
+
+# Outcomes of IntrabarPath.first_touch
+TOUCH_UNKNOWN = 0
+TOUCH_STOP = 1
+TOUCH_TARGET = 2
+
+
+def _timestamps_ms(values) -> _np.ndarray:
+    """Datetime-like or integer-millisecond values as an int64 ms array."""
+    arr = _np.asarray(values)
+    if _np.issubdtype(arr.dtype, _np.integer):
+        return arr.astype(_np.int64, copy=False)
+    return _pd.to_datetime(arr).to_numpy(dtype="datetime64[ms]").view(_np.int64)
+
+
+class IntrabarPath:
+    """
+    Timestamp-indexed high/low path for intrabar stop / target resolution.
+
+    Parameters
+    ----------
+    timestamp : numpy.ndarray
+        Sorted int64 open times in milliseconds.
+    high, low : numpy.ndarray
+        Highest and lowest price of each sub-interval.  For trade data pass
+        the trade price as both.
+    """
+
+    def __init__(self, timestamp: _np.ndarray, high: _np.ndarray, low: Optional[_np.ndarray] = None):
+        self.timestamp = timestamp
+        self.high = high
+        self.low = high if low is None else low
+        self.stats: Dict[str, int] = {"lookups": 0, "resolved": 0, "unresolved": 0}
+
+    @classmethod
+    def from_frame(cls, df: _pd.DataFrame) -> "IntrabarPath":
+        """
+        Build from a DataFrame with a ``datetime`` (or ``timestamp``) column
+        and either ``high``/``low`` (candles) or ``price`` (trades).
+        """
+        times = df["datetime"] if "datetime" in df.columns else df["timestamp"]
+        ts = _timestamps_ms(times.to_numpy())
+        if "price" in df.columns:
+            price = df["price"].to_numpy(dtype=_np.float64)
+            return cls(ts, price)
+        return cls(ts, df["high"].to_numpy(dtype=_np.float64), df["low"].to_numpy(dtype=_np.float64))
+
+    def __len__(self) -> int:
+        return len(self.timestamp)
+
+    def first_touch(
+        self,
+        start_ms: int,
+        end_ms: int,
+        direction: int,
+        stop: float,
+        target: float,
+    ) -> int:
+        """
+        Which level a position touched first within ``[start_ms, end_ms)``.
+
+        Returns ``TOUCH_STOP``, ``TOUCH_TARGET`` or ``TOUCH_UNKNOWN`` (no
+        data for the interval, or both levels touched within the same
+        sub-interval).
+        """
+        self.stats["lookups"] += 1
+        lo = int(_np.searchsorted(self.timestamp, start_ms, side="left"))
+        hi = int(_np.searchsorted(self.timestamp, end_ms, side="left"))
+        if hi <= lo:
+            self.stats["unresolved"] += 1
+            return TOUCH_UNKNOWN
+
+        high = self.high[lo:hi]
+        low = self.low[lo:hi]
+        if direction == 1:
+            stop_hits = low <= stop
+            target_hits = high >= target
+        else:
+            stop_hits = high >= stop
+            target_hits = low <= target
+        first_stop = int(_np.argmax(stop_hits)) if stop_hits.any() else hi - lo
+        first_target = int(_np.argmax(target_hits)) if target_hits.any() else hi - lo
+
+        if first_stop < first_target:
+            self.stats["resolved"] += 1
+            return TOUCH_STOP
+        if first_target < first_stop:
+            self.stats["resolved"] += 1
+            return TOUCH_TARGET
+        self.stats["unresolved"] += 1
+        return TOUCH_UNKNOWN
+
+
+def open_intrabar_path(path: Union[str, Path]) -> IntrabarPath:
+    """
+    Open a higher-resolution OHLCV file as an :class:`IntrabarPath`.
+
+    Binary (``.npy``) files are memory-mapped; other formats are loaded
+    with :func:`ohlcv_store.load_ohlcv`.
+    """
+    if format_from_path(path) == "binary":
+        arrays = open_ohlcv_arrays(path)
+        return IntrabarPath(arrays.timestamp, arrays.high, arrays.low)
+    return IntrabarPath.from_frame(load_ohlcv(path))
@@ -0,0 +1,131 @@
+"""
+Exchange kline WebSocket stream
+===============================
+
+Asyncio client for exchange kline (candlestick) streams, used by the
+event-driven mode of ``atr_breakout_production.py``.  Every kline message
+is converted to a ccxt-style row ``[timestamp, open, high, low, close,
+volume]`` plus a flag telling whether the candle has closed, so it can be
+merged straight into a :class:`candle_buffer.CandleBuffer`.
+
+Only Binance USD-M futures streams are mapped for now; ``base_url`` can
+point the client at any server speaking the same message format (e.g. a
+local stand-in that replays recorded candles).
+
+Requires ``aiohttp`` (installed with ccxt).
+"""
+
+import asyncio
+import inspect
+import json
+from typing import Any, Awaitable, Callable, List, Optional, Tuple, Union
+
+try:
+    import aiohttp  # type: ignore[import]
+    _HAVE_AIOHTTP = True
+except ImportError:  # pragma: no cover
+    aiohttp = None
+    _HAVE_AIOHTTP = False
+
+
+# WebSocket base URLs per ccxt exchange id
+STREAM_BASE_URLS = {
+    "binance": "wss://fstream.binance.com/ws",  # USD-M perpetual futures
+}
+
+KlineCallback = Callable[[List[float], bool], Union[None, Awaitable[None]]]
+
+
+class StreamDisconnected(ConnectionError):
+    """Raised when the kline stream closes, errors or goes silent."""
+
+
+def stream_market_id(symbol: str) -> str:
+    """Convert a ccxt symbol (``"BTC/USDT:USDT"``) to a stream id (``"btcusdt"``)."""
+    return symbol.split(":")[0].replace("/", "").lower()
+
+
+def kline_stream_url(
+    exchange_id: str,
+    symbol: str,
+    timeframe: str,
+    base_url: Optional[str] = None,
+) -> str:
+    """
+    Return the kline stream URL for ``symbol`` and ``timeframe``.
+
+    Raises ValueError if no stream is known for ``exchange_id`` and no
+    ``base_url`` is given.
+    """
+    base = base_url or STREAM_BASE_URLS.get(exchange_id)
+    if base is None:
+        raise ValueError(f"No kline stream available for exchange '{exchange_id}'")
+    return f"{base.rstrip('/')}/{stream_market_id(symbol)}@kline_{timeframe}"
+
+
+def parse_kline_message(data: Any) -> Optional[Tuple[List[float], bool]]:
+    """
+    Parse a Binance kline event into ``(row, closed)``.
+
+    Returns None for messages that are not kline events (e.g. subscription
+    acknowledgements).
+    """
+    if isinstance(data, (str, bytes)):
+        data = json.loads(data)
+    if not isinstance(data, dict):
+        return None
+    # Combined streams wrap the event as {"stream": ..., "data": {...}}
+    if "data" in data and isinstance(data["data"], dict):
+        data = data["data"]
+    kline = data.get("k")
+    if data.get("e") != "kline" or not isinstance(kline, dict):
+        return None
+    row = [
+        int(kline["t"]),
+        float(kline["o"]),
+        float(kline["h"]),
+        float(kline["l"]),
+        float(kline["c"]),
+        float(kline["v"]),
+    ]
+    return row, bool(kline.get("x", False))
+
+
+async def stream_klines(
+    url: str,
+    on_kline: KlineCallback,
+    idle_timeout: float = 90.0,
+    heartbeat: float = 20.0,
+) -> None:
+    """
+    Connect to ``url`` and call ``on_kline(row, closed)`` for every kline.
+
+    ``on_kline`` may be a plain function or a coroutine function.  Runs
+    until the connection ends; then raises :class:`StreamDisconnected`.
+    A stream that sends nothing for ``idle_timeout`` seconds is treated as
+    dropped.
+    """
+    if not _HAVE_AIOHTTP:
+        raise ImportError("aiohttp is required for WebSocket streaming. Install it with 'pip install aiohttp'.")
+
+    try:
+        async with aiohttp.ClientSession() as session:
+            async with session.ws_connect(url, heartbeat=heartbeat) as ws:
+                while True:
+                    try:
+                        msg = await asyncio.wait_for(ws.receive(), idle_timeout)
+                    except asyncio.TimeoutError as exc:
+                        raise StreamDisconnected(f"No data for {idle_timeout:.0f}s from {url}") from exc
+
+                    if msg.type == aiohttp.WSMsgType.TEXT:
+                        parsed = parse_kline_message(msg.data)
+                        if parsed is None:
+                            continue
+                        result = on_kline(*parsed)
+                        if inspect.isawaitable(result):
+                            await result
+                    elif msg.type in (aiohttp.WSMsgType.CLOSE, aiohttp.WSMsgType.CLOSING,
+                                      aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.ERROR):
+                        raise StreamDisconnected(f"Stream closed: {url}")
+    except aiohttp.ClientError as exc:
+        raise StreamDisconnected(f"Stream error: {exc}") from exc
@@ -0,0 +1,370 @@
+"""
+OHLCV storage backends
+======================
+
+Reads and writes candle files in one of the supported formats:
+
+- ``csv``: the original text format (``datetime`` column + OHLCV)
+- ``parquet``: columnar, compressed (requires ``pyarrow``)
+- ``feather``: columnar, uncompressed Arrow IPC, fastest to load
+  (requires ``pyarrow``)
+- ``binary``: fixed-width little-endian records in a ``.npy`` file that can
+  be memory-mapped (see :func:`open_ohlcv_arrays`); suited to multi-year
+  1m history on small machines
+
+Columnar files store a typed ``timestamp`` column (int64, milliseconds since
+epoch) and float64 ``open``/``high``/``low``/``close``/``volume`` columns, so
+loading them needs no text parsing or date inference.  Every loader returns
+the same DataFrame layout as before: ``datetime``, ``open``, ``high``,
+``low``, ``close``, ``volume`` sorted by time with a fresh RangeIndex.
+
+The format is chosen by ``DATA_FORMAT`` in ``config.py``.  A data path such
+as ``data/btcusdt_ohlcv.csv`` is treated as a base name: with
+``DATA_FORMAT = "parquet"`` the store reads and writes
+``data/btcusdt_ohlcv.parquet`` and falls back to any existing file with the
+same base name, so old CSV files keep working until they are converted.
+"""
+
+import os
+import tempfile
+from pathlib import Path
+from typing import Optional, Union
+
+import numpy as _np
+import pandas as _pd
+
+try:
+    from config import DATA_FORMAT
+except ImportError:  # pragma: no cover
+    DATA_FORMAT = "csv"
+
+
+PathLike = Union[str, Path]
+
+STORAGE_FORMATS = {
+    "csv": ".csv",
+    "parquet": ".parquet",
+    "feather": ".feather",
+    "binary": ".npy",
+}
+
+OHLCV_COLUMNS = ["open", "high", "low", "close", "volume"]
+
+# One fixed-width (48 byte) record per candle for the binary format
+OHLCV_RECORD_DTYPE = _np.dtype([
+    ("timestamp", "<i8"),
+    ("open", "<f8"),
+    ("high", "<f8"),
+    ("low", "<f8"),
+    ("close", "<f8"),
+    ("volume", "<f8"),
+])
+
+
+# ----------------------------------------------------------------------
+# Path helpers
+# ----------------------------------------------------------------------
+
+def format_from_path(path: PathLike) -> str:
+    """Return the storage format implied by a file suffix."""
+    suffix = Path(path).suffix.lower()
+    for fmt, ext in STORAGE_FORMATS.items():
+        if suffix == ext:
+            return fmt
+    raise ValueError(f"Unknown OHLCV file type: {path}")
+
+
+def data_path_for(path: PathLike, fmt: Optional[str] = None) -> Path:
+    """Return ``path`` with the suffix of storage format ``fmt``."""
+    fmt = (fmt or DATA_FORMAT).lower()
+    if fmt not in STORAGE_FORMATS:
+        raise ValueError(f"Unsupported data format '{fmt}'. Use one of: {', '.join(STORAGE_FORMATS)}")
+    return Path(path).with_suffix(STORAGE_FORMATS[fmt])
+
+
+def find_ohlcv_file(path: Optional[PathLike], fmt: Optional[str] = None) -> Optional[Path]:
+    """
+    Locate an existing data file for the base name ``path``.
+
+    The configured format is preferred, then the path exactly as given,
+    then any other supported format.  Returns None if nothing exists.
+    """
+    if not path:
+        return None
+    candidates = [data_path_for(path, fmt), Path(path)]
+    candidates += [data_path_for(path, other) for other in STORAGE_FORMATS]
+    for candidate in candidates:
+        if candidate.exists():
+            return candidate
+    return None
+
+
+# ----------------------------------------------------------------------
+# Conversion between DataFrame and on-disk layout
+# ----------------------------------------------------------------------
+
+def _to_storage_frame(df: _pd.DataFrame) -> _pd.DataFrame:
+    """Typed columnar layout: int64 ms timestamps + float64 OHLCV."""
+    stamps = _pd.to_datetime(df["datetime"]).to_numpy(dtype="datetime64[ms]")
+    frame = _pd.DataFrame({"timestamp": stamps.view(_np.int64)})
+    for col in OHLCV_COLUMNS:
+        frame[col] = df[col].to_numpy(dtype=_np.float64)
+    return frame
+
+
+def _from_storage_frame(frame: _pd.DataFrame) -> _pd.DataFrame:
+    """Rebuild the in-memory layout used by backtests from a columnar file."""
+    df = _pd.DataFrame({"datetime": _pd.to_datetime(frame["timestamp"].to_numpy(dtype=_np.int64), unit="ms")})
+    for col in OHLCV_COLUMNS:
+        df[col] = frame[col].to_numpy(dtype=_np.float64)
+    return df
+
+
+def _to_records(df: _pd.DataFrame) -> _np.ndarray:
+    """Pack a DataFrame into fixed-width OHLCV records."""
+    records = _np.empty(len(df), dtype=OHLCV_RECORD_DTYPE)
+    stamps = _pd.to_datetime(df["datetime"]).to_numpy(dtype="datetime64[ms]")
+    records["timestamp"] = stamps.view(_np.int64)
+    for col in OHLCV_COLUMNS:
+        records[col] = df[col].to_numpy(dtype=_np.float64)
+    return records
+
+
+def _require_pyarrow(fmt: str) -> None:
+    try:
+        import pyarrow  # type: ignore[import]  # noqa: F401
+    except ImportError as exc:
+        raise ImportError(
+            f"pyarrow is required for the '{fmt}' data format. Install it with 'pip install pyarrow' "
+            f"or set DATA_FORMAT = \"csv\" in config.py."
+        ) from exc
+
+
+# ----------------------------------------------------------------------
+# Public API
+# ----------------------------------------------------------------------
+
+def load_ohlcv(path: PathLike, fmt: Optional[str] = None) -> _pd.DataFrame:
+    """
+    Load an OHLCV file written by :func:`save_ohlcv` (or a legacy CSV).
+
+    Parameters
+    ----------
+    path : str or Path
+        Data file.  The format is taken from ``fmt`` or the file suffix.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Columns ``datetime``, ``open``, ``high``, ``low``, ``close`` and
+        ``volume``, sorted by datetime ascending.
+    """
+    fmt = (fmt or format_from_path(path)).lower()
+    if fmt == "csv":
+        df = _pd.read_csv(path)
+        df["datetime"] = _pd.to_datetime(df["datetime"])
+    elif fmt == "parquet":
+        _require_pyarrow(fmt)
+        df = _from_storage_frame(_pd.read_parquet(path, columns=["timestamp"] + OHLCV_COLUMNS))
+    elif fmt == "feather":
+        _require_pyarrow(fmt)
+        df = _from_storage_frame(_pd.read_feather(path, columns=["timestamp"] + OHLCV_COLUMNS))
+    elif fmt == "binary":
+        df = open_ohlcv_arrays(path).to_frame()
+    else:
+        raise ValueError(f"Unsupported data format '{fmt}'")
+
+    if not df["datetime"].is_monotonic_increasing:
+        df = df.sort_values("datetime", kind="stable")
+    return df.reset_index(drop=True)
+
+
+def save_ohlcv(df: _pd.DataFrame, path: PathLike, fmt: Optional[str] = None) -> Path:
+    """
+    Write OHLCV data atomically in the configured (or given) format.
+
+    ``path`` is a base name; its suffix is replaced to match ``fmt``.
+    The file is written to a temporary name in the same directory and then
+    renamed, so readers never see a partially written file.
+
+    Returns
+    -------
+    Path
+        The file that was written.
+    """
+    fmt = (fmt or DATA_FORMAT).lower()
+    target = data_path_for(path, fmt)
+    target.parent.mkdir(parents=True, exist_ok=True)
+
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{target.name}.", suffix=".tmp", dir=str(target.parent))
+    os.close(fd)
+    try:
+        if fmt == "csv":
+            df[["datetime"] + OHLCV_COLUMNS].to_csv(tmp_name, index=False)
+        elif fmt == "parquet":
+            _require_pyarrow(fmt)
+            _to_storage_frame(df).to_parquet(tmp_name, index=False)
+        elif fmt == "binary":
+            with open(tmp_name, "wb") as f:
+                _np.save(f, _to_records(df), allow_pickle=False)
+        else:
+            _require_pyarrow(fmt)
+            _to_storage_frame(df).to_feather(tmp_name)
+        os.replace(tmp_name, target)
+    except Exception:
+        if os.path.exists(tmp_name):
+            os.remove(tmp_name)
+        raise
+    return target
+
+
+def merge_ohlcv(existing: _pd.DataFrame, new: _pd.DataFrame) -> _pd.DataFrame:
+    """
+    Combine two OHLCV frames, dropping duplicate timestamps.
+
+    Rows from ``new`` win over ``existing`` for the same ``datetime``, so a
+    candle that was still forming when it was first stored is replaced by
+    its final values.  The result is sorted with a fresh RangeIndex.
+    """
+    columns = ["datetime"] + OHLCV_COLUMNS
+    frames = [frame[columns] for frame in (existing, new) if len(frame)]
+    if not frames:
+        return existing[columns].reset_index(drop=True)
+    merged = _pd.concat(frames, ignore_index=True)
+    merged["datetime"] = _pd.to_datetime(merged["datetime"])
+    merged = merged.drop_duplicates("datetime", keep="last")
+    return merged.sort_values("datetime", kind="stable").reset_index(drop=True)
+
+
+def append_ohlcv(new: _pd.DataFrame, path: PathLike, fmt: Optional[str] = None) -> Path:
+    """
+    Merge ``new`` candles into the stored file and rewrite it atomically.
+
+    ``path`` is a base name as for :func:`save_ohlcv`.  Existing data is
+    read from the file :func:`find_ohlcv_file` locates (any format) and the
+    merged result is written in ``fmt``.
+    """
+    source = find_ohlcv_file(path, fmt)
+    if source is not None:
+        new = merge_ohlcv(load_ohlcv(source), new)
+    return save_ohlcv(new, path, fmt)
+
+
+def convert_ohlcv_file(source: PathLike, fmt: Optional[str] = None) -> Path:
+    """Convert an existing OHLCV file (e.g. a legacy CSV) to format ``fmt``."""
+    df = load_ohlcv(source)
+    return save_ohlcv(df, source, fmt)
+
+
+# ----------------------------------------------------------------------
+# Memory-mapped access
+# ----------------------------------------------------------------------
+
+class OHLCVArrays:
+    """
+    Read-only, zero-copy view of a binary OHLCV file.
+
+    The file is memory-mapped; column access returns views into the mapped
+    records, so only the pages actually touched are read into memory.
+    ``arrays["close"]`` returns a pandas Series backed by that view, which
+    lets the indicator functions, signal generators and
+    ``backtest_atr_breakout_strategy`` consume the file exactly like a
+    DataFrame without materializing one.
+    """
+
+    def __init__(self, records: _np.ndarray, path: Optional[PathLike] = None):
+        if records.dtype != OHLCV_RECORD_DTYPE:
+            raise ValueError(f"Unexpected record layout {records.dtype} in {path}")
+        self.records = records
+        self.path = Path(path) if path is not None else None
+        self._series = {}
+
+    # Column arrays ------------------------------------------------------
+
+    @property
+    def timestamp(self) -> _np.ndarray:
+        return self.records["timestamp"]
+
+    @property
+    def open(self) -> _np.ndarray:
+        return self.records["open"]
+
+    @property
+    def high(self) -> _np.ndarray:
+        return self.records["high"]
+
+    @property
+    def low(self) -> _np.ndarray:
+        return self.records["low"]
+
+    @property
+    def close(self) -> _np.ndarray:
+        return self.records["close"]
+
+    @property
+    def volume(self) -> _np.ndarray:
+        return self.records["volume"]
+
+    # DataFrame-like access ----------------------------------------------
+
+    @property
+    def columns(self):
+        return ["datetime"] + OHLCV_COLUMNS
+
+    @property
+    def index(self) -> _pd.RangeIndex:
+        return _pd.RangeIndex(len(self.records))
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __getitem__(self, name: str) -> _pd.Series:
+        series = self._series.get(name)
+        if series is None:
+            if name == "datetime":
+                values = self.timestamp.view("datetime64[ms]")
+            elif name in OHLCV_COLUMNS:
+                values = self.records[name]
+            else:
+                raise KeyError(name)
+            series = _pd.Series(values, index=self.index, name=name, copy=False)
+            self._series[name] = series
+        return series
+
+    def slice(self, start: Optional[int] = None, stop: Optional[int] = None) -> "OHLCVArrays":
+        """Return a zero-copy view of rows ``start:stop``."""
+        return OHLCVArrays(self.records[start:stop], self.path)
+
+    def to_frame(self) -> _pd.DataFrame:
+        """Materialize the data as a regular DataFrame (copies the data)."""
+        return _from_storage_frame(_pd.DataFrame({
+            "timestamp": self.timestamp,
+            **{col: self.records[col] for col in OHLCV_COLUMNS},
+        }))
+
+
+def open_ohlcv_arrays(path: PathLike) -> OHLCVArrays:
+    """
+    Memory-map a binary OHLCV file written with ``fmt="binary"``.
+
+    Raises ValueError if the records are not sorted by timestamp, since the
+    view cannot be reordered without copying.
+    """
+    records = _np.load(path, mmap_mode="r", allow_pickle=False)
+    arrays = OHLCVArrays(records, path)
+    stamps = arrays.timestamp
+    if len(stamps) > 1 and not bool(_np.all(stamps[1:] >= stamps[:-1])):
+        raise ValueError(f"Binary OHLCV file is not sorted by time: {path}")
+    return arrays
+
+
+def open_ohlcv(path: PathLike):
+    """
+    Open a data file for read-only backtesting.
+
+    Binary files are memory-mapped and returned as :class:`OHLCVArrays`;
+    other formats are loaded into a DataFrame with :func:`load_ohlcv`.
+    """
+    if format_from_path(path) == "binary":
+        return open_ohlcv_arrays(path)
+    return load_ohlcv(path)
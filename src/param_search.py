@@ -0,0 +1,341 @@
+"""
+Parameter search strategies
+===========================
+
+Search strategies for strategy optimization that explore continuous
+parameter ranges with far fewer backtests than an exhaustive grid:
+
+- ``"random"``: uniform random sampling of the search space
+- ``"halving"``: successive halving; many configurations are evaluated on
+  a small data budget (e.g. the most recent ninth of the candles), and
+  only the best ``1/eta`` of each rung are promoted to a larger budget,
+  up to the full dataset
+- ``"tpe"``: model-based sampling (a Tree-structured Parzen Estimator):
+  after a random start, new candidates are drawn where a density fitted
+  to the best trials is high relative to a density fitted to the rest
+
+Strategies are independent of the strategy being optimized.  They call an
+objective ``evaluate(configs, budget) -> scores`` with a batch of
+configurations (dicts) and a data budget in ``(0, 1]``; higher scores are
+better and ``-inf`` marks a rejected configuration.  Evaluating whole
+batches lets the objective backtest them in one vectorized or parallel
+call.
+"""
+
+import math
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence, Union
+
+import numpy as _np
+
+
+Objective = Callable[[List[Dict[str, float]], float], Sequence[float]]
+
+
+# ----------------------------------------------------------------------
+# Search space
+# ----------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class Real:
+    """Continuous range ``[low, high]``, optionally rounded to ``step``."""
+    low: float
+    high: float
+    step: Optional[float] = None
+
+    def decode(self, u: _np.ndarray) -> _np.ndarray:
+        values = self.low + u * (self.high - self.low)
+        if self.step:
+            values = self.low + _np.round((values - self.low) / self.step) * self.step
+            # Drop float noise such as 1.2000000000000002
+            values = _np.round(_np.minimum(values, self.high), 10)
+        return values
+
+    def encode(self, values: Sequence) -> _np.ndarray:
+        span = self.high - self.low
+        return (_np.asarray(values, dtype=_np.float64) - self.low) / span if span else _np.zeros(len(values))
+
+
+@dataclass(frozen=True)
+class Categorical:
+    """One of a fixed set of values."""
+    values: tuple
+
+    def decode(self, u: _np.ndarray) -> list:
+        idx = _np.minimum((u * len(self.values)).astype(int), len(self.values) - 1)
+        return [self.values[i] for i in idx]
+
+    def encode(self, values: Sequence) -> _np.ndarray:
+        idx = _np.array([self.values.index(v) for v in values], dtype=_np.float64)
+        return (idx + 0.5) / len(self.values)
+
+
+Dimension = Union[Real, Categorical]
+
+
+class SearchSpace:
+    """
+    Named search dimensions.
+
+    Configurations are dicts ``{name: value}``.  Internally every
+    dimension is mapped to the unit interval, which is where the samplers
+    work.
+    """
+
+    def __init__(self, dimensions: Dict[str, Dimension]):
+        self.dimensions = dict(dimensions)
+        self.names = list(self.dimensions)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def decode(self, unit: _np.ndarray) -> List[Dict[str, float]]:
+        """Configurations for the rows of a ``(n, len(space))`` unit array."""
+        unit = _np.clip(_np.atleast_2d(unit), 0.0, 1.0)
+        columns = [dim.decode(unit[:, j]) for j, dim in enumerate(self.dimensions.values())]
+        return [
+            {name: (col[i].item() if hasattr(col[i], "item") else col[i]) for name, col in zip(self.names, columns)}
+            for i in range(len(unit))
+        ]
+
+    def encode(self, configs: Sequence[Dict[str, float]]) -> _np.ndarray:
+        """Unit-interval coordinates of ``configs``."""
+        if not configs:
+            return _np.empty((0, len(self)))
+        return _np.column_stack([
+            dim.encode([c[name] for c in configs])
+            for name, dim in self.dimensions.items()
+        ]).astype(_np.float64)
+
+    def sample(self, rng: _np.random.Generator, n: int) -> List[Dict[str, float]]:
+        """``n`` uniformly random configurations."""
+        return self.decode(rng.random((n, len(self))))
+
+
+# ----------------------------------------------------------------------
+# Results
+# ----------------------------------------------------------------------
+
+@dataclass
+class Trial:
+    """One evaluated configuration."""
+    config: Dict[str, float]
+    score: float
+    budget: float = 1.0
+
+
+@dataclass
+class SearchResult:
+    """Every trial of a search, in evaluation order."""
+    strategy: str
+    trials: List[Trial] = field(default_factory=list)
+
+    @property
+    def full_budget(self) -> List[Trial]:
+        """Trials evaluated on the full dataset."""
+        return [t for t in self.trials if t.budget >= 1.0]
+
+    @property
+    def best(self) -> Optional[Trial]:
+        """Best full-budget trial (None if every one was rejected)."""
+        scored = [t for t in self.full_budget if math.isfinite(t.score)]
+        return max(scored, key=lambda t: t.score) if scored else None
+
+    def top(self, n: int = 10) -> List[Trial]:
+        """The ``n`` best full-budget trials."""
+        scored = [t for t in self.full_budget if math.isfinite(t.score)]
+        return sorted(scored, key=lambda t: t.score, reverse=True)[:n]
+
+    @property
+    def cost(self) -> float:
+        """Evaluation cost in full-dataset backtests."""
+        return sum(t.budget for t in self.trials)
+
+
+def _evaluate(evaluate: Objective, result: SearchResult, configs: List[Dict[str, float]], budget: float) -> List[float]:
+    scores = [float(s) for s in evaluate(configs, budget)]
+    result.trials.extend(Trial(c, s, budget) for c, s in zip(configs, scores))
+    return scores
+
+
+# ----------------------------------------------------------------------
+# Strategies
+# ----------------------------------------------------------------------
+
+def random_search(
+    space: SearchSpace,
+    evaluate: Objective,
+    n_trials: int = 100,
+    seed: Optional[int] = None,
+) -> SearchResult:
+    """Evaluate ``n_trials`` random configurations on the full dataset."""
+    rng = _np.random.default_rng(seed)
+    result = SearchResult("random")
+    _evaluate(evaluate, result, space.sample(rng, n_trials), 1.0)
+    return result
+
+
+def successive_halving(
+    space: SearchSpace,
+    evaluate: Objective,
+    n_trials: int = 243,
+    eta: int = 3,
+    min_budget: float = 1.0 / 9.0,
+    seed: Optional[int] = None,
+) -> SearchResult:
+    """
+    Successive halving over ``n_trials`` random configurations.
+
+    Rung budgets grow by ``eta`` from about ``min_budget`` to 1.0; after
+    each rung the best ``1/eta`` of the configurations (at least one) are
+    promoted.  With the defaults, 243 configurations cost the same as 81
+    full-dataset backtests.
+    """
+    if eta < 2:
+        raise ValueError("eta must be at least 2")
+    rng = _np.random.default_rng(seed)
+    result = SearchResult("halving")
+    rungs = max(0, int(math.floor(math.log(1.0 / min_budget, eta) + 1e-9)))
+    configs = space.sample(rng, n_trials)
+    for k in range(rungs + 1):
+        budget = float(eta) ** (k - rungs)
+        scores = _evaluate(evaluate, result, configs, budget)
+        if k == rungs:
+            break
+        keep = max(1, len(configs) // eta)
+        order = sorted(range(len(configs)), key=lambda i: scores[i], reverse=True)
+        configs = [configs[i] for i in order[:keep]]
+    return result
+
+
+class _ParzenEstimator:
+    """
+    Independent per-dimension densities over unit-interval coordinates:
+    Gaussian mixtures (plus a uniform prior component) for real
+    dimensions, smoothed frequencies for categorical ones.
+    """
+
+    def __init__(self, points: _np.ndarray, sizes: Sequence[int], min_bandwidth: float):
+        self.points = points
+        self.sizes = sizes
+        n = len(points)
+        spread = points.std(axis=0) if n > 1 else _np.full(points.shape[1], 0.5)
+        self.bandwidth = _np.clip(spread * max(n, 1) ** -0.2, min_bandwidth, 0.5)
+        # Prior weight of the uniform component / of each category
+        self.prior = 1.0 / (n + 1)
+        self.probs = [
+            None if k == 0 else (_np.bincount(_category(points[:, j], k), minlength=k) + 1.0) / (n + k)
+            for j, k in enumerate(sizes)
+        ]
+
+    def sample(self, rng: _np.random.Generator, m: int) -> _np.ndarray:
+        out = _np.empty((m, len(self.sizes)))
+        for j, k in enumerate(self.sizes):
+            if k:
+                out[:, j] = (rng.choice(k, size=m, p=self.probs[j]) + 0.5) / k
+            elif len(self.points) == 0:
+                out[:, j] = rng.random(m)
+            else:
+                centers = self.points[rng.integers(0, len(self.points), m), j]
+                values = centers + rng.normal(size=m) * self.bandwidth[j]
+                uniform = rng.random(m) < self.prior
+                values[uniform] = rng.random(int(uniform.sum()))
+                out[:, j] = _np.clip(values, 0.0, 1.0)
+        return out
+
+    def logpdf(self, x: _np.ndarray) -> _np.ndarray:
+        total = _np.zeros(len(x))
+        for j, k in enumerate(self.sizes):
+            if k:
+                total += _np.log(self.probs[j][_category(x[:, j], k)])
+            elif len(self.points):
+                bw = self.bandwidth[j]
+                z = (x[:, j, None] - self.points[None, :, j]) / bw
+                log_kernel = -0.5 * z ** 2 - math.log(bw * math.sqrt(2 * math.pi))
+                log_mix = _np.logaddexp.reduce(log_kernel, axis=1) - math.log(len(self.points))
+                total += _np.logaddexp(math.log1p(-self.prior) + log_mix, math.log(self.prior))
+        return total
+
+
+def _category(u: _np.ndarray, k: int) -> _np.ndarray:
+    return _np.minimum((u * k).astype(int), k - 1)
+
+
+def model_based_search(
+    space: SearchSpace,
+    evaluate: Objective,
+    n_trials: int = 100,
+    n_initial: int = 20,
+    batch_size: int = 8,
+    gamma: float = 0.15,
+    n_candidates: int = 32,
+    min_bandwidth: float = 0.1,
+    seed: Optional[int] = None,
+) -> SearchResult:
+    """
+    Tree-structured Parzen Estimator search.
+
+    Starts with ``n_initial`` random configurations, then repeatedly
+    splits the trials into the best ``gamma`` fraction and the rest and
+    fits independent per-dimension densities to each.  Every batch slot
+    draws ``n_candidates`` from the good density and suggests the one with
+    the highest density ratio good / rest, so a batch of ``batch_size``
+    suggestions can be evaluated together.
+    """
+    rng = _np.random.default_rng(seed)
+    result = SearchResult("tpe")
+    sizes = [len(dim.values) if isinstance(dim, Categorical) else 0 for dim in space.dimensions.values()]
+    configs = space.sample(rng, min(n_initial, n_trials))
+    scores = _np.array(_evaluate(evaluate, result, configs, 1.0))
+    points = space.encode(configs)
+    seen = {tuple(sorted(c.items())) for c in configs}
+
+    while len(result.trials) < n_trials:
+        batch = min(batch_size, n_trials - len(result.trials))
+        order = _np.argsort(-scores, kind="stable")
+        n_good = max(1, int(math.ceil(gamma * len(order))))
+        good = _ParzenEstimator(points[order[:n_good]], sizes, min_bandwidth)
+        rest = _ParzenEstimator(points[order[n_good:]], sizes, min_bandwidth)
+
+        chosen: List[Dict[str, float]] = []
+        for _ in range(batch):
+            candidates = good.sample(rng, n_candidates)
+            ratio = good.logpdf(candidates) - rest.logpdf(candidates)
+            for idx in _np.argsort(-ratio, kind="stable"):
+                config = space.decode(candidates[idx])[0]
+                key = tuple(sorted(config.items()))
+                if key not in seen:
+                    seen.add(key)
+                    chosen.append(config)
+                    break
+        if len(chosen) < batch:
+            chosen.extend(space.sample(rng, batch - len(chosen)))
+
+        scores = _np.concatenate([scores, _evaluate(evaluate, result, chosen, 1.0)])
+        points = _np.vstack([points, space.encode(chosen)])
+    return result
+
+
+SEARCH_STRATEGIES = {
+    "random": random_search,
+    "halving": successive_halving,
+    "tpe": model_based_search,
+}
+
+
+def run_search(
+    strategy: str,
+    space: SearchSpace,
+    evaluate: Objective,
+    n_trials: int = 100,
+    seed: Optional[int] = None,
+    **kwargs,
+) -> SearchResult:
+    """
+    Run the search strategy named ``strategy`` (see ``SEARCH_STRATEGIES``).
+
+    Extra keyword arguments are passed to the strategy function.
+    """
+    if strategy not in SEARCH_STRATEGIES:
+        raise ValueError(f"Unknown search strategy '{strategy}'. Use one of: {', '.join(SEARCH_STRATEGIES)}")
+    return SEARCH_STRATEGIES[strategy](space, evaluate, n_trials=n_trials, seed=seed, **kwargs)
@@ -0,0 +1,337 @@
+"""
+Persistent backtest result store
+================================
+
+SQLite store of backtest result summaries so optimization runs only
+backtest parameter sets they have not seen before.  Re-running a sweep
+after adding one value to a parameter range reads every existing
+combination from the store and backtests just the new ones.
+
+Each row is keyed by a hash of:
+
+- the dataset fingerprint (``indicator_cache.dataset_fingerprint``), so a
+  different file or a re-synced file gets fresh results
+- the strategy name and version string; bump the version whenever the
+  signal or simulation logic (or a setting baked into it, such as risk
+  per trade or fees) changes
+- the parameter set, as canonical JSON (sorted keys)
+
+Rows hold a :class:`ResultSummary` (trade count, wins / losses, profit,
+average win / loss, signal count, drawdown), which has the same summary
+attributes as ``StrategyResult`` so reporting code works on either.
+Complete backtests are stored with the pruning limit they failed, if any
+(``pruned``, e.g. ``"min_trades"``); summaries of backtests aborted early
+(``PARTIAL_REASONS``) are partial and are never stored.
+
+Queries: :meth:`ResultStore.top` for the best N parameter sets and
+:meth:`ResultStore.surface` for a 2-D pivot of a metric over two
+parameters (e.g. to plot a heatmap).
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Union
+
+import numpy as _np
+import pandas as _pd
+
+
+Params = Dict[str, float]
+
+SUMMARY_FIELDS = (
+    "trade_count", "wins", "losses", "total_profit", "avg_win", "avg_loss", "signal_count",
+    "max_drawdown", "lowest_profit", "pruned",
+)
+
+# Pruning reasons of backtests aborted early (see ``PruneLimits`` in
+# backtest_optimized.py); their summaries are partial
+PARTIAL_REASONS = ("max_trades", "min_signals", "max_drawdown", "profit_floor")
+
+# Columns added after the first schema version; NULL in older rows, which
+# are treated as not stored and recomputed (older rows were never pruned)
+_ADDED_COLUMNS = {"max_drawdown": "REAL", "lowest_profit": "REAL", "pruned": "TEXT NOT NULL DEFAULT ''"}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    dataset TEXT NOT NULL,
+    strategy TEXT NOT NULL,
+    version TEXT NOT NULL,
+    params TEXT NOT NULL,
+    trade_count INTEGER NOT NULL,
+    wins INTEGER NOT NULL,
+    losses INTEGER NOT NULL,
+    total_profit REAL NOT NULL,
+    avg_win REAL NOT NULL,
+    avg_loss REAL NOT NULL,
+    signal_count INTEGER NOT NULL,
+    created REAL NOT NULL,
+    max_drawdown REAL,
+    lowest_profit REAL,
+    pruned TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS results_run ON results (dataset, strategy, version, total_profit);
+"""
+
+# SQLite limits the number of host parameters per statement
+_LOOKUP_CHUNK = 500
+
+
+@dataclass
+class ResultSummary:
+    """Summary statistics of one backtest (see ``StrategyResult``)."""
+    trade_count: int
+    wins: int
+    losses: int
+    total_profit: float
+    avg_win: float
+    avg_loss: float
+    signal_count: int = 0
+    name: str = ""
+    max_drawdown: float = 0.0
+    lowest_profit: float = 0.0
+    pruned: str = ""
+
+    @property
+    def win_rate(self) -> float:
+        return self.wins / self.trade_count if self.trade_count else 0.0
+
+    @property
+    def partial(self) -> bool:
+        """True if the backtest was aborted early (see ``PARTIAL_REASONS``)."""
+        return self.pruned in PARTIAL_REASONS
+
+    @classmethod
+    def from_profits(
+        cls,
+        profits: _np.ndarray,
+        signal_count: int = 0,
+        name: str = "",
+        pruned: str = "",
+    ) -> "ResultSummary":
+        """
+        Summary of a trade profit array (e.g. ``TradeArrays.profit``).
+
+        ``max_drawdown`` and ``lowest_profit`` are measured on the running
+        P/L after each trade, starting from 0.
+        """
+        profits = _np.asarray(profits, dtype=_np.float64)
+        win = profits > 0
+        wins = int(win.sum())
+        losses = len(profits) - wins
+        equity = _np.concatenate([[0.0], _np.cumsum(profits)])
+        return cls(
+            trade_count=len(profits),
+            wins=wins,
+            losses=losses,
+            total_profit=float(profits.sum()),
+            avg_win=float(profits[win].mean()) if wins else 0.0,
+            avg_loss=float(profits[~win].mean()) if losses else 0.0,
+            signal_count=int(signal_count),
+            name=name,
+            max_drawdown=float((_np.maximum.accumulate(equity) - equity).max()),
+            lowest_profit=float(equity.min()),
+            pruned=pruned,
+        )
+
+    @classmethod
+    def from_result(cls, result, signal_count: int = 0) -> "ResultSummary":
+        """Summary of a ``StrategyResult``."""
+        return cls.from_profits([tr.profit for tr in result.trades], signal_count, result.name)
+
+
+def canonical_params(params: Params) -> str:
+    """Parameters as JSON with sorted keys and plain Python numbers."""
+    return json.dumps(
+        {key: (value.item() if isinstance(value, _np.generic) else value) for key, value in params.items()},
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+
+
+def result_key(dataset: str, strategy: str, version: str, params: Params) -> str:
+    """Store key: hash of dataset fingerprint, strategy, version and parameters."""
+    h = hashlib.blake2b(digest_size=16)
+    for part in (dataset, strategy, version, canonical_params(params)):
+        h.update(part.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+class ResultStore:
+    """
+    SQLite-backed memo of backtest summaries.
+
+    Parameters
+    ----------
+    path : str or Path
+        Database file (created with its parent directory if needed), or
+        ``":memory:"``.
+    """
+
+    def __init__(self, path: Union[str, Path] = ":memory:"):
+        if str(path) != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = str(path)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(results)")}
+        for column, kind in _ADDED_COLUMNS.items():
+            if column not in columns:
+                self._conn.execute(f"ALTER TABLE results ADD COLUMN {column} {kind}")
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    # Context manager -----------------------------------------------------
+
+    def __enter__(self) -> "ResultStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    # Lookups and inserts -------------------------------------------------
+
+    def get_many(self, dataset: str, strategy: str, version: str, params: Sequence[Params]) -> List[Optional[ResultSummary]]:
+        """Stored summaries for ``params`` (None where not stored), in order."""
+        keys = [result_key(dataset, strategy, version, p) for p in params]
+        found: Dict[str, ResultSummary] = {}
+        columns = ", ".join(SUMMARY_FIELDS)
+        with self._lock:
+            for start in range(0, len(keys), _LOOKUP_CHUNK):
+                chunk = keys[start:start + _LOOKUP_CHUNK]
+                rows = self._conn.execute(
+                    f"SELECT key, {columns} FROM results WHERE key IN ({', '.join('?' * len(chunk))})",
+                    chunk,
+                ).fetchall()
+                for row in rows:
+                    if None not in row:
+                        found[row[0]] = ResultSummary(**dict(zip(SUMMARY_FIELDS, row[1:])))
+        return [found.get(key) for key in keys]
+
+    def put_many(self, dataset: str, strategy: str, version: str, items: Sequence) -> None:
+        """
+        Store ``(params, ResultSummary)`` pairs in one transaction;
+        partial summaries are skipped.
+        """
+        now = time.time()
+        rows = [
+            (result_key(dataset, strategy, version, p), dataset, strategy, version, canonical_params(p))
+            + tuple(getattr(summary, f) for f in SUMMARY_FIELDS) + (now,)
+            for p, summary in items
+            if not summary.partial
+        ]
+        placeholders = ", ".join("?" * (6 + len(SUMMARY_FIELDS)))
+        with self._lock, self._conn:
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO results (key, dataset, strategy, version, params, "
+                f"{', '.join(SUMMARY_FIELDS)}, created) VALUES ({placeholders})",
+                rows,
+            )
+
+    def evaluate(
+        self,
+        dataset: str,
+        strategy: str,
+        version: str,
+        params: Sequence[Params],
+        run: Callable[[List[Params]], Sequence[ResultSummary]],
+    ) -> List[ResultSummary]:
+        """
+        Summaries for every parameter set, backtesting only unseen ones.
+
+        ``run(missing_params)`` must return one summary per parameter set;
+        its complete (not partial) results are stored before returning.
+        """
+        params = list(params)
+        summaries = self.get_many(dataset, strategy, version, params)
+        missing = [i for i, s in enumerate(summaries) if s is None]
+        self.hits += len(params) - len(missing)
+        self.misses += len(missing)
+        if missing:
+            computed = list(run([params[i] for i in missing]))
+            if len(computed) != len(missing):
+                raise ValueError(f"run() returned {len(computed)} results for {len(missing)} parameter sets")
+            self.put_many(dataset, strategy, version, [(params[i], s) for i, s in zip(missing, computed)])
+            for i, summary in zip(missing, computed):
+                summaries[i] = summary
+        return summaries
+
+    # Queries -------------------------------------------------------------
+
+    def frame(
+        self,
+        dataset: Optional[str] = None,
+        strategy: Optional[str] = None,
+        version: Optional[str] = None,
+    ) -> _pd.DataFrame:
+        """
+        Stored results as a DataFrame: one column per parameter, the
+        summary fields, ``win_rate`` and ``dataset`` / ``strategy`` /
+        ``version``.  Filters are optional.
+        """
+        where, args = [], []
+        for column, value in (("dataset", dataset), ("strategy", strategy), ("version", version)):
+            if value is not None:
+                where.append(f"{column} = ?")
+                args.append(value)
+        sql = f"SELECT dataset, strategy, version, params, {', '.join(SUMMARY_FIELDS)} FROM results"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        with self._lock:
+            rows = self._conn.execute(sql, args).fetchall()
+        columns = ["dataset", "strategy", "version", "params"] + list(SUMMARY_FIELDS)
+        frame = _pd.DataFrame(rows, columns=columns)
+        params = _pd.DataFrame([json.loads(p) for p in frame.pop("params")], index=frame.index)
+        frame = _pd.concat([params, frame], axis=1)
+        frame["win_rate"] = (frame["wins"] / frame["trade_count"].where(frame["trade_count"] > 0)).fillna(0.0)
+        return frame
+
+    def top(
+        self,
+        n: int = 10,
+        by: str = "total_profit",
+        dataset: Optional[str] = None,
+        strategy: Optional[str] = None,
+        version: Optional[str] = None,
+        min_trades: Optional[int] = None,
+        max_trades: Optional[int] = None,
+    ) -> _pd.DataFrame:
+        """The ``n`` best stored results by ``by`` (descending)."""
+        frame = self.frame(dataset, strategy, version)
+        if min_trades is not None:
+            frame = frame[frame["trade_count"] >= min_trades]
+        if max_trades is not None:
+            frame = frame[frame["trade_count"] <= max_trades]
+        return frame.sort_values(by, ascending=False, kind="stable").head(n).reset_index(drop=True)
+
+    def surface(
+        self,
+        x: str,
+        y: str,
+        value: str = "total_profit",
+        agg: str = "max",
+        dataset: Optional[str] = None,
+        strategy: Optional[str] = None,
+        version: Optional[str] = None,
+    ) -> _pd.DataFrame:
+        """
+        Pivot of ``value`` over parameters ``x`` (columns) and ``y``
+        (index), aggregating the other parameters with ``agg``; ready for
+        ``matplotlib.pyplot.pcolormesh`` or ``seaborn.heatmap``.
+        """
+        frame = self.frame(dataset, strategy, version)
+        return frame.pivot_table(index=y, columns=x, values=value, aggfunc=agg)
@@ -0,0 +1,170 @@
+"""
+Candle-close-aligned scheduler
+==============================
+
+Wakes the production loop right after each candle closes instead of
+sleeping a fixed interval after the work is done (which drifts relative
+to candle boundaries).  The next wake-up is the next ``timeframe``
+boundary plus a small settle delay that gives the exchange time to
+publish the closed candle.
+
+Boundaries are computed in exchange time: the offset between the local
+clock and the exchange server clock is measured with a round-trip
+midpoint estimate and refreshed periodically, so a skewed local clock
+does not shift evaluation into the previous or next candle.
+
+Every tick records its lag (actual wake-up minus scheduled time).  If the
+process oversleeps past one or more boundaries (e.g. the host was
+suspended) or the work overruns a whole candle, the skipped boundaries
+are counted and the schedule resumes from the latest one instead of
+firing a burst of catch-up ticks.
+"""
+
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Deque, Dict, Optional
+
+
+ServerTimeFunc = Callable[[], float]
+
+
+@dataclass
+class Tick:
+    """One scheduled wake-up."""
+    boundary_ms: int      # candle boundary (exchange time) this tick belongs to
+    scheduled_ms: float   # boundary + settle delay
+    woke_ms: float        # actual wake-up time (exchange time)
+    lag_ms: float         # woke_ms - scheduled_ms
+    missed: int           # boundaries skipped since the previous tick
+
+
+class CandleScheduler:
+    """
+    Compute and wait for candle-close-aligned wake-up times.
+
+    Parameters
+    ----------
+    timeframe_ms : int
+        Candle length in milliseconds.
+    settle_ms : float
+        Delay after the boundary before waking up.
+    server_time : callable, optional
+        Returns exchange server time in milliseconds (e.g.
+        ``exchange.fetch_time``).  Without it the local clock is used.
+    resync_interval : float
+        Seconds between clock offset refreshes.
+    history : int
+        Number of recent ticks kept for lag statistics.
+    time_func, sleep_func : callable
+        Clock and sleep functions (seconds); injectable for testing.
+    """
+
+    def __init__(
+        self,
+        timeframe_ms: int,
+        settle_ms: float = 2000.0,
+        server_time: Optional[ServerTimeFunc] = None,
+        resync_interval: float = 3600.0,
+        history: int = 1440,
+        time_func: Callable[[], float] = time.time,
+        sleep_func: Callable[[float], None] = time.sleep,
+    ):
+        if timeframe_ms <= 0:
+            raise ValueError("timeframe_ms must be positive")
+        self.timeframe_ms = int(timeframe_ms)
+        self.settle_ms = float(settle_ms)
+        self.server_time = server_time
+        self.resync_interval = float(resync_interval)
+        self.offset_ms = 0.0
+        self.missed_total = 0
+        self.ticks: Deque[Tick] = deque(maxlen=history)
+        self._time = time_func
+        self._sleep = sleep_func
+        self._last_sync: Optional[float] = None
+        self._last_boundary: Optional[int] = None
+
+    # Clock ---------------------------------------------------------------
+
+    def sync_clock(self) -> float:
+        """
+        Re-measure the exchange clock offset (server minus local, in ms).
+
+        Uses the midpoint of the request round trip.  Keeps the previous
+        offset if the server time cannot be fetched.
+        """
+        self._last_sync = self._time()
+        if self.server_time is None:
+            return self.offset_ms
+        try:
+            t0 = self._time() * 1000.0
+            server_ms = float(self.server_time())
+            t1 = self._time() * 1000.0
+        except Exception:
+            return self.offset_ms
+        self.offset_ms = server_ms - (t0 + t1) / 2.0
+        return self.offset_ms
+
+    def now_ms(self) -> float:
+        """Current exchange time in milliseconds."""
+        return self._time() * 1000.0 + self.offset_ms
+
+    # Scheduling ----------------------------------------------------------
+
+    def next_boundary(self, now_ms: Optional[float] = None) -> int:
+        """First boundary whose wake-up time (boundary + settle) is after ``now_ms``."""
+        if now_ms is None:
+            now_ms = self.now_ms()
+        boundary = int((now_ms - self.settle_ms) // self.timeframe_ms + 1) * self.timeframe_ms
+        if self._last_boundary is not None and boundary <= self._last_boundary:
+            boundary = self._last_boundary + self.timeframe_ms
+        return boundary
+
+    def wait(self) -> Tick:
+        """Sleep until the next boundary + settle delay and record the tick."""
+        if self._last_sync is None or self._time() - self._last_sync >= self.resync_interval:
+            self.sync_clock()
+
+        boundary = self.next_boundary()
+        scheduled = boundary + self.settle_ms
+        while True:
+            remaining = scheduled - self.now_ms()
+            if remaining <= 0:
+                break
+            self._sleep(remaining / 1000.0)
+
+        woke = self.now_ms()
+        # Oversleep: one or more later boundaries already passed
+        overslept = int((woke - scheduled) // self.timeframe_ms)
+        if overslept > 0:
+            boundary += overslept * self.timeframe_ms
+            scheduled += overslept * self.timeframe_ms
+        # Boundaries skipped since the previous tick (oversleep or slow work)
+        missed = 0
+        if self._last_boundary is not None:
+            missed = (boundary - self._last_boundary) // self.timeframe_ms - 1
+        self.missed_total += missed
+        self._last_boundary = boundary
+
+        tick = Tick(boundary, scheduled, woke, woke - scheduled, missed)
+        self.ticks.append(tick)
+        return tick
+
+    def seconds_until_next(self) -> float:
+        """Seconds until the next scheduled wake-up."""
+        return max(0.0, (self.next_boundary() + self.settle_ms - self.now_ms()) / 1000.0)
+
+    # Statistics ----------------------------------------------------------
+
+    def lag_stats(self) -> Dict[str, float]:
+        """Last / mean / max lag (ms) over recorded ticks and missed boundaries."""
+        if not self.ticks:
+            return {"ticks": 0, "last_ms": 0.0, "mean_ms": 0.0, "max_ms": 0.0, "missed": self.missed_total}
+        lags = [tick.lag_ms for tick in self.ticks]
+        return {
+            "ticks": len(lags),
+            "last_ms": lags[-1],
+            "mean_ms": sum(lags) / len(lags),
+            "max_ms": max(lags),
+            "missed": self.missed_total,
+        }
@@ -0,0 +1,343 @@
+"""
+JSONL signal journal
+====================
+
+Append-only journal of trading signals, one JSON object per line, used by
+the production script instead of re-opening a pretty-printed log file for
+every signal.
+
+Writing
+-------
+:class:`SignalJournal` keeps the file open and buffers records in memory.
+Buffered records are written when ``batch_size`` records are pending,
+when ``flush_interval`` seconds have passed since the last flush (checked
+on :meth:`SignalJournal.write` and :meth:`SignalJournal.flush_if_due`),
+and on :meth:`SignalJournal.close`.  ``fsync`` selects durability:
+
+- ``"never"``: leave it to the OS
+- ``"flush"``: fsync after every batched flush (default)
+- ``"always"``: flush and fsync after every record
+
+The live file is rotated when it would grow past ``max_bytes`` or when a
+new ``rotate_interval`` period (UTC-aligned, e.g. a day) starts.  Rotated
+segments are renamed ``<stem>.<YYYYmmdd-HHMMSS><suffix>`` after the UTC
+time they were closed, so segment names sort chronologically;
+``backup_count`` limits how many are kept.
+
+Reading
+-------
+:func:`iter_signals` streams records from the rotated segments and the
+live file in chronological order without loading them all;
+:func:`load_signals` flattens them into a DataFrame for analysis.
+"""
+
+import datetime as _dt
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+import numpy as _np
+import pandas as _pd
+
+
+FSYNC_POLICIES = ("never", "flush", "always")
+
+ROTATE_INTERVALS = {
+    "none": 0,
+    "hourly": 3600,
+    "daily": 86400,
+    "weekly": 7 * 86400,
+}
+
+_SEGMENT_TIME_FORMAT = "%Y%m%d-%H%M%S"
+
+
+def _json_default(value: Any) -> Any:
+    """Serialize NumPy scalars, timestamps and other non-JSON values."""
+    if isinstance(value, _np.generic):
+        return value.item()
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+
+def encode_record(record: Dict) -> str:
+    """One compact JSON line (with trailing newline) for ``record``."""
+    return json.dumps(record, default=_json_default, separators=(",", ":"), ensure_ascii=False) + "\n"
+
+
+def _rotate_seconds(rotate_interval: Union[str, float, None]) -> float:
+    if rotate_interval is None:
+        return 0.0
+    if isinstance(rotate_interval, str):
+        if rotate_interval not in ROTATE_INTERVALS:
+            raise ValueError(
+                f"Unknown rotate interval '{rotate_interval}'. Use one of: {', '.join(ROTATE_INTERVALS)}"
+            )
+        return float(ROTATE_INTERVALS[rotate_interval])
+    return float(rotate_interval)
+
+
+# ----------------------------------------------------------------------
+# Writer
+# ----------------------------------------------------------------------
+
+class SignalJournal:
+    """
+    Buffered JSONL writer with rotation.
+
+    Parameters
+    ----------
+    path : str or Path
+        Live journal file; the parent directory is created if needed.
+    batch_size : int
+        Flush once this many records are buffered (1 = write through).
+    flush_interval : float
+        Maximum seconds a record stays buffered (checked on writes and
+        :meth:`flush_if_due`).
+    fsync : str
+        ``"never"``, ``"flush"`` or ``"always"`` (see module docstring).
+    max_bytes : int
+        Rotate before the live file would exceed this size (0 = no limit).
+    rotate_interval : str or float
+        ``"none"``, ``"hourly"``, ``"daily"``, ``"weekly"`` or seconds.
+    backup_count : int
+        Number of rotated segments to keep (0 = keep all).
+    time_func : callable
+        Wall clock in seconds; injectable for testing.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        batch_size: int = 16,
+        flush_interval: float = 5.0,
+        fsync: str = "flush",
+        max_bytes: int = 50 * 1024 * 1024,
+        rotate_interval: Union[str, float, None] = "daily",
+        backup_count: int = 0,
+        time_func=time.time,
+    ):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy '{fsync}'. Use one of: {', '.join(FSYNC_POLICIES)}")
+        self.path = Path(path)
+        self.batch_size = max(1, int(batch_size))
+        self.flush_interval = float(flush_interval)
+        self.fsync = fsync
+        self.max_bytes = int(max_bytes)
+        self.rotate_seconds = _rotate_seconds(rotate_interval)
+        self.backup_count = int(backup_count)
+        self._time = time_func
+
+        self._pending: List[str] = []
+        self._pending_bytes = 0
+        self._last_flush = self._time()
+        self._file = None
+        self._size = 0
+        self._period_start: Optional[float] = None
+        self.stats = {"records": 0, "flushes": 0, "fsyncs": 0, "rotations": 0}
+
+    # Context manager -----------------------------------------------------
+
+    def __enter__(self) -> "SignalJournal":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # Public API ----------------------------------------------------------
+
+    def write(self, record: Dict) -> None:
+        """Buffer one record; flushes according to the batching policy."""
+        now = self._time()
+        if self.rotate_seconds and self._period_start is not None:
+            if self._period_of(now) != self._period_start:
+                # Records of the old period must land in the old segment
+                self.flush()
+                self._rotate()
+        line = encode_record(record)
+        self._pending.append(line)
+        self._pending_bytes += len(line.encode("utf-8"))
+        self.stats["records"] += 1
+        if self._period_start is None:
+            self._period_start = self._period_of(now)
+
+        if self.fsync == "always" or len(self._pending) >= self.batch_size:
+            self.flush()
+        else:
+            self.flush_if_due()
+
+    def flush_if_due(self) -> bool:
+        """Flush if buffered records are older than ``flush_interval``."""
+        if self._pending and self._time() - self._last_flush >= self.flush_interval:
+            self.flush()
+            return True
+        return False
+
+    def flush(self) -> None:
+        """Write buffered records to disk (and fsync, depending on policy)."""
+        self._last_flush = self._time()
+        if not self._pending:
+            return
+        f = self._open()
+        if self.max_bytes and self._size and self._size + self._pending_bytes > self.max_bytes:
+            period = self._period_start
+            self._rotate()
+            f = self._open()
+            self._period_start = period
+        data = "".join(self._pending)
+        f.write(data)
+        f.flush()
+        self._size += self._pending_bytes
+        self._pending.clear()
+        self._pending_bytes = 0
+        self.stats["flushes"] += 1
+        if self.fsync != "never":
+            os.fsync(f.fileno())
+            self.stats["fsyncs"] += 1
+
+    def close(self) -> None:
+        """Flush pending records and close the file."""
+        self.flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    # Files ---------------------------------------------------------------
+
+    def _period_of(self, t: float) -> float:
+        if not self.rotate_seconds:
+            return 0.0
+        return (t // self.rotate_seconds) * self.rotate_seconds
+
+    def _open(self):
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            if self.rotate_seconds and self.path.exists() and self.path.stat().st_size:
+                # A live file left from an earlier run: archive it if it
+                # belongs to an older period
+                mtime = self.path.stat().st_mtime
+                file_period = self._period_of(mtime)
+                if self._period_start is None:
+                    self._period_start = file_period
+                elif file_period != self._period_start:
+                    self._archive(mtime)
+            self._file = open(self.path, "a", encoding="utf-8")
+            self._size = self._file.tell()
+        return self._file
+
+    def _segment_path(self, closed_at: float) -> Path:
+        stamp = _dt.datetime.fromtimestamp(closed_at, tz=_dt.timezone.utc).strftime(_SEGMENT_TIME_FORMAT)
+        candidate = self.path.with_name(f"{self.path.stem}.{stamp}{self.path.suffix}")
+        n = 1
+        while candidate.exists():
+            candidate = self.path.with_name(f"{self.path.stem}.{stamp}-{n}{self.path.suffix}")
+            n += 1
+        return candidate
+
+    def _archive(self, closed_at: Optional[float] = None) -> None:
+        """Rename the live file to a timestamped segment and prune old ones."""
+        if not self.path.exists() or self.path.stat().st_size == 0:
+            return
+        os.replace(self.path, self._segment_path(self._time() if closed_at is None else closed_at))
+        self.stats["rotations"] += 1
+        if self.backup_count:
+            for old in journal_segments(self.path)[:-self.backup_count]:
+                old.unlink()
+
+    def _rotate(self) -> None:
+        """Close the live file and archive it as a segment."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._period_start = None
+        self._size = 0
+        self._archive()
+
+
+# ----------------------------------------------------------------------
+# Reader
+# ----------------------------------------------------------------------
+
+def _segment_key(path: Path, name: str):
+    """Sort key ``(stamp, n)`` of a rotated segment name, or None."""
+    prefix, suffix = f"{path.stem}.", path.suffix
+    if not (name.startswith(prefix) and name.endswith(suffix)) or name == path.name:
+        return None
+    parts = name[len(prefix):len(name) - len(suffix)].split("-")
+    if len(parts) not in (2, 3):
+        return None
+    try:
+        _dt.datetime.strptime(f"{parts[0]}-{parts[1]}", _SEGMENT_TIME_FORMAT)
+        n = int(parts[2]) if len(parts) == 3 else 0
+    except ValueError:
+        return None
+    return parts[0] + parts[1], n
+
+
+def journal_segments(path: Union[str, Path]) -> List[Path]:
+    """Rotated segments of the journal at ``path``, oldest first."""
+    path = Path(path)
+    if not path.parent.exists():
+        return []
+    keyed = [(_segment_key(path, p.name), p) for p in path.parent.iterdir()]
+    return [p for key, p in sorted((k, p) for k, p in keyed if k is not None)]
+
+
+def iter_signals(
+    path: Union[str, Path],
+    start: Optional[Union[str, _dt.datetime]] = None,
+    end: Optional[Union[str, _dt.datetime]] = None,
+    field: str = "timestamp",
+) -> Iterator[Dict]:
+    """
+    Stream journal records from the rotated segments and the live file.
+
+    Parameters
+    ----------
+    path : str or Path
+        Live journal file (as passed to :class:`SignalJournal`).
+    start, end : str or datetime, optional
+        Keep records whose ``field`` (ISO time string) is within
+        ``[start, end)``.
+    field : str
+        Record key compared against ``start`` / ``end``.
+
+    Lines that are not valid JSON (e.g. a record cut short by a crash)
+    are skipped.
+    """
+    start_s = start.isoformat() if isinstance(start, _dt.datetime) else start
+    end_s = end.isoformat() if isinstance(end, _dt.datetime) else end
+    path = Path(path)
+    files = journal_segments(path) + ([path] if path.exists() else [])
+    for file in files:
+        with open(file, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if start_s is not None or end_s is not None:
+                    key = str(record.get(field, ""))
+                    if start_s is not None and key < start_s:
+                        continue
+                    if end_s is not None and key >= end_s:
+                        continue
+                yield record
+
+
+def load_signals(path: Union[str, Path], **kwargs) -> _pd.DataFrame:
+    """
+    Load journal records into a flat DataFrame (nested keys joined with ``.``).
+
+    Keyword arguments are passed to :func:`iter_signals`.
+    """
+    records = list(iter_signals(path, **kwargs))
+    if not records:
+        return _pd.DataFrame()
+    return _pd.json_normalize(records)
@@ -0,0 +1,368 @@
+"""
+Streaming indicators
+====================
+
+Stateful, O(1)-per-candle versions of the indicators in ``utils.py``
+(EMA, SMA, ATR, RSI and ADX) for the production loop.
+
+Each indicator is fed one closed candle at a time with ``update`` and can
+be seeded from history with ``seed``.  ``peek`` returns the value the
+indicator would have if a candle closed now, without changing its state;
+it is used to evaluate the still-forming candle every tick.
+
+Two smoothing methods are available for ATR, RSI and ADX:
+
+- ``"rolling"``: simple rolling mean over the period, as computed by the
+  batch functions in ``utils.py``
+- ``"wilder"``: Wilder's smoothing (RMA), seeded with the simple mean of
+  the first ``period`` values and then ``y = y + (x - y) / period``
+
+The rolling mean reproduces the arithmetic of pandas' ``rolling().mean()``
+(compensated running sums) and the exponential updates reproduce
+``ewm(adjust=False)``, so streaming values match the batch functions run
+over the same history, NaN prices included.
+"""
+
+import math
+from collections import deque
+from typing import Sequence
+
+import numpy as _np
+
+
+NAN = float("nan")
+
+SMOOTHING_METHODS = ("rolling", "wilder")
+
+
+# ----------------------------------------------------------------------
+# Arithmetic helpers
+# ----------------------------------------------------------------------
+
+def _div(a: float, b: float) -> float:
+    """Float division with NumPy semantics (x/0 -> ±inf, 0/0 -> nan)."""
+    if b == 0.0 or math.isnan(a) or math.isnan(b):
+        with _np.errstate(divide="ignore", invalid="ignore"):
+            return float(_np.float64(a) / _np.float64(b))
+    return a / b
+
+
+def _ewm_step(prev: float, x: float, alpha: float, old_wt: float = NAN) -> float:
+    """
+    One ``ewm(adjust=False)`` update, using pandas' exact arithmetic.
+    ``old_wt`` is the weight of ``prev`` (``1 - alpha`` unless NaN inputs
+    were skipped since the last update).
+    """
+    if prev == x:
+        return prev
+    if math.isnan(old_wt):
+        old_wt = 1.0 - alpha
+    return (old_wt * prev + alpha * x) / (old_wt + alpha)
+
+
+def _check_smoothing(smoothing: str) -> str:
+    if smoothing not in SMOOTHING_METHODS:
+        raise ValueError(f"Unknown smoothing '{smoothing}'. Use one of: {', '.join(SMOOTHING_METHODS)}")
+    return smoothing
+
+
+# ----------------------------------------------------------------------
+# Smoothers
+# ----------------------------------------------------------------------
+
+class RollingMean:
+    """
+    Rolling mean over the last ``window`` values (NaN while the window is
+    not full or contains a NaN), matching ``Series.rolling(window).mean()``.
+    """
+
+    def __init__(self, window: int):
+        self.window = int(window)
+        self._values: deque = deque()
+        # nobs, sum, negative count, add/remove compensation, run of equal values, last value
+        self._state = [0, 0.0, 0, 0.0, 0.0, 0, NAN]
+        self.value = NAN
+
+    @staticmethod
+    def _add(st: list, x: float) -> None:
+        if math.isnan(x):
+            return
+        st[0] += 1
+        y = x - st[3]
+        t = st[1] + y
+        st[3] = t - st[1] - y
+        st[1] = t
+        if math.copysign(1.0, x) < 0:
+            st[2] += 1
+        if x == st[6]:
+            st[5] += 1
+        else:
+            st[5] = 1
+        st[6] = x
+
+    @staticmethod
+    def _remove(st: list, x: float) -> None:
+        if math.isnan(x):
+            return
+        st[0] -= 1
+        y = -x - st[4]
+        t = st[1] + y
+        st[4] = t - st[1] - y
+        st[1] = t
+        if math.copysign(1.0, x) < 0:
+            st[2] -= 1
+
+    def _result(self, st: list) -> float:
+        nobs = st[0]
+        if nobs < self.window or nobs == 0:
+            return NAN
+        if st[5] >= nobs:
+            return st[6]
+        result = st[1] / nobs
+        if st[2] == 0 and result < 0:
+            return 0.0
+        if st[2] == nobs and result > 0:
+            return 0.0
+        return result
+
+    def push(self, x: float) -> float:
+        x = float(x)
+        if len(self._values) == self.window:
+            self._remove(self._state, self._values.popleft())
+        self._add(self._state, x)
+        self._values.append(x)
+        self.value = self._result(self._state)
+        return self.value
+
+    def peek(self, x: float) -> float:
+        st = list(self._state)
+        if len(self._values) == self.window:
+            self._remove(st, self._values[0])
+        self._add(st, float(x))
+        return self._result(st)
+
+
+class WilderMean:
+    """
+    Wilder's smoothing (RMA) with period ``n``.
+
+    The first value is the simple mean of the first ``n`` valid inputs;
+    afterwards ``y = y + (x - y) / n`` (an ``ewm(alpha=1/n, adjust=False)``
+    step).  NaN inputs are skipped and leave the value unchanged.
+    """
+
+    def __init__(self, period: int):
+        self.period = int(period)
+        self.alpha = 1.0 / self.period
+        self._seed = RollingMean(self.period)
+        self._seeded = False
+        self.value = NAN
+
+    def push(self, x: float) -> float:
+        x = float(x)
+        if math.isnan(x):
+            return self.value
+        if self._seeded:
+            self.value = _ewm_step(self.value, x, self.alpha)
+        else:
+            self.value = self._seed.push(x)
+            self._seeded = not math.isnan(self.value)
+        return self.value
+
+    def peek(self, x: float) -> float:
+        x = float(x)
+        if math.isnan(x):
+            return self.value
+        if self._seeded:
+            return _ewm_step(self.value, x, self.alpha)
+        return self._seed.peek(x)
+
+
+def make_smoother(smoothing: str, period: int):
+    """Return a ``RollingMean`` or ``WilderMean`` for ``smoothing``."""
+    if _check_smoothing(smoothing) == "wilder":
+        return WilderMean(period)
+    return RollingMean(period)
+
+
+# ----------------------------------------------------------------------
+# Indicators
+# ----------------------------------------------------------------------
+
+class StreamingEMA:
+    """Exponential moving average, same as ``utils.ema`` (``adjust=False``)."""
+
+    def __init__(self, span: int):
+        self.span = int(span)
+        self.alpha = 2.0 / (self.span + 1.0)
+        self.value = NAN
+        # Weight of ``value``; decays over NaN closes, as in pandas
+        self._old_wt = 1.0
+
+    def _step(self, close: float):
+        if math.isnan(self.value):
+            return close, 1.0
+        old_wt = self._old_wt * (1.0 - self.alpha)
+        if math.isnan(close):
+            return self.value, old_wt
+        return _ewm_step(self.value, close, self.alpha, old_wt), 1.0
+
+    def update(self, close: float) -> float:
+        self.value, self._old_wt = self._step(float(close))
+        return self.value
+
+    def peek(self, close: float) -> float:
+        return self._step(float(close))[0]
+
+    def seed(self, closes: Sequence[float]) -> float:
+        for close in closes:
+            self.update(close)
+        return self.value
+
+
+class StreamingSMA:
+    """Simple moving average, same as ``utils.sma``."""
+
+    def __init__(self, window: int):
+        self.window = int(window)
+        self._mean = RollingMean(window)
+
+    @property
+    def value(self) -> float:
+        return self._mean.value
+
+    def update(self, x: float) -> float:
+        return self._mean.push(x)
+
+    def peek(self, x: float) -> float:
+        return self._mean.peek(x)
+
+    def seed(self, values: Sequence[float]) -> float:
+        for x in values:
+            self.update(x)
+        return self.value
+
+
+class StreamingRSI:
+    """Relative Strength Index; ``smoothing="rolling"`` matches ``utils.rsi``."""
+
+    def __init__(self, window: int = 14, smoothing: str = "rolling"):
+        self.window = int(window)
+        self.smoothing = _check_smoothing(smoothing)
+        self._gain = make_smoother(smoothing, window)
+        self._loss = make_smoother(smoothing, window)
+        self._prev_close = NAN
+        self.value = NAN
+
+    @staticmethod
+    def _rsi(gain: float, loss: float) -> float:
+        rs = _div(gain, loss)
+        return 100 - _div(100.0, 1 + rs)
+
+    def _step(self, close: float, commit: bool) -> float:
+        close = float(close)
+        # NaN on the first candle (no previous close) or around a NaN close,
+        # as ``Series.diff``
+        delta = close - self._prev_close
+        if math.isnan(delta):
+            up = down = NAN
+        else:
+            up = delta if delta > 0 else 0.0
+            down = -delta if delta < 0 else -0.0
+        if commit:
+            self._prev_close = close
+            self.value = self._rsi(self._gain.push(up), self._loss.push(down))
+            return self.value
+        return self._rsi(self._gain.peek(up), self._loss.peek(down))
+
+    def update(self, close: float) -> float:
+        return self._step(close, True)
+
+    def peek(self, close: float) -> float:
+        return self._step(close, False)
+
+    def seed(self, closes: Sequence[float]) -> float:
+        for close in closes:
+            self.update(close)
+        return self.value
+
+
+def _true_range(high: float, low: float, prev_close: float) -> float:
+    """Largest true range term, skipping NaN terms like ``DataFrame.max``."""
+    tr = high - low
+    for term in (abs(high - prev_close), abs(low - prev_close)):
+        if math.isnan(tr) or term > tr:
+            tr = term
+    return tr
+
+
+class StreamingATR:
+    """Average True Range; ``smoothing="rolling"`` matches ``utils.atr``."""
+
+    def __init__(self, period: int = 14, smoothing: str = "rolling"):
+        self.period = int(period)
+        self.smoothing = _check_smoothing(smoothing)
+        self._tr = make_smoother(smoothing, period)
+        self._prev_close = NAN
+        self.value = NAN
+
+    def update(self, high: float, low: float, close: float) -> float:
+        tr = _true_range(float(high), float(low), self._prev_close)
+        self._prev_close = float(close)
+        self.value = self._tr.push(tr)
+        return self.value
+
+    def peek(self, high: float, low: float, close: float) -> float:
+        return self._tr.peek(_true_range(float(high), float(low), self._prev_close))
+
+    def seed(self, high: Sequence[float], low: Sequence[float], close: Sequence[float]) -> float:
+        for h, l, c in zip(high, low, close):
+            self.update(h, l, c)
+        return self.value
+
+
+class StreamingADX:
+    """Average Directional Index; ``smoothing="rolling"`` matches ``utils.adx``."""
+
+    def __init__(self, period: int = 14, smoothing: str = "rolling"):
+        self.period = int(period)
+        self.smoothing = _check_smoothing(smoothing)
+        self._tr = make_smoother(smoothing, period)
+        self._plus_dm = make_smoother(smoothing, period)
+        self._minus_dm = make_smoother(smoothing, period)
+        self._dx = make_smoother(smoothing, period)
+        self._prev = (NAN, NAN, NAN)  # high, low, close
+        self.value = NAN
+
+    def _inputs(self, high: float, low: float):
+        prev_high, prev_low, prev_close = self._prev
+        tr = _true_range(high, low, prev_close)
+        # NaN on the first candle or next to a NaN price, as ``Series.diff``
+        plus_dm = high - prev_high
+        minus_dm = -(low - prev_low)
+        # Negative moves count as 0; NaN stays NaN
+        return tr, (0.0 if plus_dm < 0 else plus_dm), (0.0 if minus_dm < 0 else minus_dm)
+
+    @staticmethod
+    def _dx_value(tr_avg: float, plus_avg: float, minus_avg: float) -> float:
+        plus_di = 100 * _div(plus_avg, tr_avg)
+        minus_di = 100 * _div(minus_avg, tr_avg)
+        return _div(100 * abs(plus_di - minus_di), plus_di + minus_di)
+
+    def update(self, high: float, low: float, close: float) -> float:
+        high, low, close = float(high), float(low), float(close)
+        tr, plus_dm, minus_dm = self._inputs(high, low)
+        self._prev = (high, low, close)
+        dx = self._dx_value(self._tr.push(tr), self._plus_dm.push(plus_dm), self._minus_dm.push(minus_dm))
+        self.value = self._dx.push(dx)
+        return self.value
+
+    def peek(self, high: float, low: float, close: float) -> float:
+        tr, plus_dm, minus_dm = self._inputs(float(high), float(low))
+        dx = self._dx_value(self._tr.peek(tr), self._plus_dm.peek(plus_dm), self._minus_dm.peek(minus_dm))
+        return self._dx.peek(dx)
+
+    def seed(self, high: Sequence[float], low: Sequence[float], close: Sequence[float]) -> float:
+        for h, l, c in zip(high, low, close):
+            self.update(h, l, c)
+        return self.value
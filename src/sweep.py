@@ -0,0 +1,201 @@
+"""
+Parallel parameter sweep executor
+=================================
+
+Runs parameter sweeps across a ``ProcessPoolExecutor``.  Large read-only
+inputs (OHLCV columns and precomputed indicator arrays) are placed in
+shared memory once and attached by every worker process, so tasks only
+carry their parameter rows instead of a pickled DataFrame.
+
+Parameter rows are split into contiguous shards.  Results are returned in
+the same order as the input rows, regardless of which worker finished first.
+"""
+
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as _np
+
+
+# Task function signature: task(arrays, rows) -> list with one result per row
+SweepTask = Callable[[Dict[str, _np.ndarray], Sequence[Any]], List[Any]]
+ProgressCallback = Callable[[int, int], None]
+
+
+# ----------------------------------------------------------------------
+# Shared memory arrays
+# ----------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class SharedArraySpec:
+    """Picklable description of one array stored in shared memory."""
+    shm_name: str
+    shape: Tuple[int, ...]
+    dtype: str
+
+
+class SharedArrays:
+    """
+    Copy a dict of NumPy arrays into shared memory blocks.
+
+    Use as a context manager; blocks are released and unlinked on exit.
+    ``specs`` is what gets sent to worker processes.
+    """
+
+    def __init__(self, arrays: Dict[str, _np.ndarray]):
+        self._blocks: List[shared_memory.SharedMemory] = []
+        self.specs: Dict[str, SharedArraySpec] = {}
+        try:
+            for key, values in arrays.items():
+                values = _np.ascontiguousarray(values)
+                block = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+                self._blocks.append(block)
+                view = _np.ndarray(values.shape, dtype=values.dtype, buffer=block.buf)
+                view[...] = values
+                self.specs[key] = SharedArraySpec(block.name, values.shape, values.dtype.str)
+        except Exception:
+            self.close()
+            raise
+
+    def close(self) -> None:
+        """Release and unlink every shared memory block."""
+        for block in self._blocks:
+            try:
+                block.close()
+                block.unlink()
+            except FileNotFoundError:
+                pass
+        self._blocks = []
+
+    def __enter__(self) -> "SharedArrays":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def attach_shared_arrays(
+    specs: Dict[str, SharedArraySpec],
+) -> Tuple[Dict[str, _np.ndarray], List[shared_memory.SharedMemory]]:
+    """
+    Map shared memory blocks described by ``specs`` as read-only arrays.
+
+    Returns the arrays and the underlying blocks; the blocks must stay
+    referenced for as long as the arrays are used.
+    """
+    arrays: Dict[str, _np.ndarray] = {}
+    blocks: List[shared_memory.SharedMemory] = []
+    for key, spec in specs.items():
+        try:
+            # Python 3.13+: the creating process owns cleanup
+            block = shared_memory.SharedMemory(name=spec.shm_name, track=False)
+        except TypeError:
+            block = shared_memory.SharedMemory(name=spec.shm_name)
+        blocks.append(block)
+        view = _np.ndarray(spec.shape, dtype=_np.dtype(spec.dtype), buffer=block.buf)
+        view.setflags(write=False)
+        arrays[key] = view
+    return arrays, blocks
+
+
+# ----------------------------------------------------------------------
+# Worker side
+# ----------------------------------------------------------------------
+
+_WORKER_ARRAYS: Dict[str, _np.ndarray] = {}
+_WORKER_BLOCKS: List[shared_memory.SharedMemory] = []
+
+
+def _init_worker(specs: Dict[str, SharedArraySpec]) -> None:
+    """Pool initializer: attach the shared arrays once per worker process."""
+    global _WORKER_ARRAYS, _WORKER_BLOCKS
+    _WORKER_ARRAYS, _WORKER_BLOCKS = attach_shared_arrays(specs)
+
+
+def _run_shard(task: SweepTask, start: int, rows: Sequence[Any]) -> Tuple[int, List[Any]]:
+    """Evaluate one shard of parameter rows inside a worker."""
+    return start, task(_WORKER_ARRAYS, rows)
+
+
+# ----------------------------------------------------------------------
+# Executor
+# ----------------------------------------------------------------------
+
+def default_workers() -> int:
+    """Number of worker processes to use when none is configured."""
+    return os.cpu_count() or 1
+
+
+def run_sweep(
+    task: SweepTask,
+    arrays: Dict[str, _np.ndarray],
+    rows: Sequence[Any],
+    max_workers: Optional[int] = None,
+    shard_size: Optional[int] = None,
+    progress: Optional[ProgressCallback] = None,
+) -> List[Any]:
+    """
+    Evaluate ``task`` over parameter ``rows`` in parallel.
+
+    Parameters
+    ----------
+    task : callable
+        Module-level function ``task(arrays, rows)`` returning one result
+        per row.  It must be importable by worker processes.
+    arrays : dict
+        Read-only input arrays shared with every worker.
+    rows : sequence
+        Parameter rows (any picklable objects).
+    max_workers : int, optional
+        Worker processes (default: CPU count).  ``1`` runs in-process
+        without a pool or shared memory.
+    shard_size : int, optional
+        Rows per task.  Defaults to about four shards per worker.
+    progress : callable, optional
+        Called as ``progress(done_rows, total_rows)`` after each shard.
+
+    Returns
+    -------
+    list
+        Results in the same order as ``rows``.
+    """
+    rows = list(rows)
+    total = len(rows)
+    if total == 0:
+        return []
+
+    workers = max(1, min(max_workers or default_workers(), total))
+    if shard_size is None:
+        shard_size = max(1, math.ceil(total / (workers * 4)))
+
+    shards = [(start, rows[start:start + shard_size]) for start in range(0, total, shard_size)]
+    results: List[Any] = [None] * total
+    done = 0
+
+    if workers == 1:
+        for start, shard in shards:
+            results[start:start + len(shard)] = task(arrays, shard)
+            done += len(shard)
+            if progress is not None:
+                progress(done, total)
+        return results
+
+    with SharedArrays(arrays) as shared:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(shared.specs,),
+        ) as executor:
+            futures = [executor.submit(_run_shard, task, start, shard) for start, shard in shards]
+            for future in as_completed(futures):
+                start, shard_results = future.result()
+                results[start:start + len(shard_results)] = shard_results
+                done += len(shard_results)
+                if progress is not None:
+                    progress(done, total)
+
+    return results
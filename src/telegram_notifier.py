@@ -0,0 +1,244 @@
+"""
+Background Telegram notifier
+============================
+
+Non-blocking replacement for ``utils.send_telegram_message`` in loops
+that must not stall on the Telegram API.  Callers only enqueue messages
+with :meth:`TelegramNotifier.notify`; a daemon thread drains a bounded
+queue and sends them:
+
+- one keep-alive HTTP(S) connection is reused for every request and
+  reopened after network errors
+- sends are spaced to Telegram's limits (about one message per second
+  per chat, 30 per second overall) with :class:`utils.RateLimiter`
+- network errors and 5xx responses are retried with exponential backoff;
+  ``429 Too Many Requests`` waits for the ``retry_after`` the API returns;
+  other 4xx responses are dropped (retrying would not help)
+- when the queue is full the oldest pending message is dropped, so the
+  newest signals always get through
+
+``api_url`` can point the notifier at a local HTTP server speaking the
+Bot API ``sendMessage`` call, e.g. a stub used for testing.
+"""
+
+import http.client
+import json
+import queue
+import ssl
+import threading
+import time
+import urllib.parse
+from typing import Dict, Optional
+
+from utils import RateLimiter
+
+
+TELEGRAM_API_URL = "https://api.telegram.org"
+
+# Telegram Bot API limits
+PER_CHAT_MESSAGES_PER_SECOND = 1.0
+GLOBAL_MESSAGES_PER_SECOND = 30.0
+
+_STOP = object()
+
+
+class TelegramNotifier:
+    """
+    Queue Telegram messages and send them from a background thread.
+
+    Parameters
+    ----------
+    bot_token : str
+        Telegram bot token from BotFather.
+    api_url : str, optional
+        Bot API base URL (default: ``https://api.telegram.org``).
+    queue_size : int
+        Maximum number of pending messages.
+    max_retries : int
+        Retries per message after the first attempt.
+    backoff : float
+        Initial retry delay in seconds, doubled after each failure.
+    max_backoff : float
+        Upper bound on the retry delay in seconds.
+    timeout : float
+        Socket timeout per request in seconds.
+    per_chat_rate, global_rate : float
+        Maximum messages per second to one chat and overall.
+    """
+
+    def __init__(
+        self,
+        bot_token: str,
+        api_url: Optional[str] = None,
+        queue_size: int = 100,
+        max_retries: int = 5,
+        backoff: float = 1.0,
+        max_backoff: float = 30.0,
+        timeout: float = 10.0,
+        per_chat_rate: float = PER_CHAT_MESSAGES_PER_SECOND,
+        global_rate: float = GLOBAL_MESSAGES_PER_SECOND,
+    ):
+        self.bot_token = bot_token
+        parsed = urllib.parse.urlsplit(api_url or TELEGRAM_API_URL)
+        self._scheme = parsed.scheme
+        self._netloc = parsed.netloc
+        self._path = parsed.path.rstrip("/")
+        self.max_retries = int(max_retries)
+        self.backoff = float(backoff)
+        self.max_backoff = float(max_backoff)
+        self.timeout = float(timeout)
+        self.per_chat_rate = float(per_chat_rate)
+
+        self._queue: "queue.Queue" = queue.Queue(maxsize=queue_size)
+        self._global_limiter = RateLimiter(global_rate)
+        self._chat_limiters: Dict[str, RateLimiter] = {}
+        self._conn: Optional[http.client.HTTPConnection] = None
+        self._lock = threading.Lock()
+        self._stats = {"queued": 0, "sent": 0, "failed": 0, "dropped": 0, "retries": 0, "connections": 0}
+        self._thread = threading.Thread(target=self._run, name="telegram-notifier", daemon=True)
+        self._thread.start()
+
+    # Public API ----------------------------------------------------------
+
+    def notify(self, chat_id: str, message: str, parse_mode: str = "HTML") -> bool:
+        """
+        Queue ``message`` for ``chat_id`` without blocking.
+
+        Returns False only if the notifier has been closed.  If the queue
+        is full, the oldest pending message is dropped to make room.
+        """
+        if not self._thread.is_alive():
+            return False
+        item = (str(chat_id), message, parse_mode)
+        while True:
+            try:
+                self._queue.put_nowait(item)
+                break
+            except queue.Full:
+                try:
+                    self._queue.get_nowait()
+                    self._queue.task_done()
+                    self._count("dropped")
+                except queue.Empty:
+                    pass
+        self._count("queued")
+        return True
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued message was handled; False on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def close(self, timeout: Optional[float] = 10.0) -> None:
+        """Send what is queued (up to ``timeout`` seconds) and stop the thread."""
+        if not self._thread.is_alive():
+            return
+        self.flush(timeout)
+        try:
+            self._queue.put(_STOP, timeout=1.0)
+        except queue.Full:
+            return
+        self._thread.join(timeout)
+
+    def stats(self) -> Dict[str, int]:
+        """Counters: queued, sent, failed, dropped, retries, connections, pending."""
+        with self._lock:
+            stats = dict(self._stats)
+        stats["pending"] = self._queue.qsize()
+        return stats
+
+    # Worker --------------------------------------------------------------
+
+    def _count(self, key: str, n: int = 1) -> None:
+        with self._lock:
+            self._stats[key] += n
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            try:
+                if item is _STOP:
+                    return
+                self._count("sent" if self._deliver(*item) else "failed")
+            except Exception as e:  # never let the worker die
+                print(f"Error sending Telegram message: {e}")
+                self._count("failed")
+            finally:
+                self._queue.task_done()
+
+    def _deliver(self, chat_id: str, message: str, parse_mode: str) -> bool:
+        """Send one message with rate limiting and retries."""
+        limiter = self._chat_limiters.get(chat_id)
+        if limiter is None:
+            limiter = self._chat_limiters[chat_id] = RateLimiter(self.per_chat_rate)
+        body = urllib.parse.urlencode({"chat_id": chat_id, "text": message, "parse_mode": parse_mode})
+
+        delay = self.backoff
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                self._count("retries")
+            limiter.acquire()
+            self._global_limiter.acquire()
+            try:
+                status, payload = self._post("sendMessage", body)
+            except (OSError, http.client.HTTPException) as e:
+                self._reset_connection()
+                print(f"Error sending Telegram message: {e}")
+                status, payload = None, {}
+
+            if status == 200:
+                return True
+            if status == 429:
+                retry_after = payload.get("parameters", {}).get("retry_after", delay)
+                time.sleep(float(retry_after))
+                continue
+            if status is not None and status < 500:
+                print(f"Telegram rejected message ({status}): {payload.get('description', '')}")
+                return False
+            time.sleep(delay)
+            delay = min(delay * 2, self.max_backoff)
+        return False
+
+    # Connection ----------------------------------------------------------
+
+    def _connection(self) -> http.client.HTTPConnection:
+        if self._conn is None:
+            if self._scheme == "https":
+                # Same relaxed verification as utils.send_telegram_message
+                # (for environments with proxy/self-signed certs)
+                context = ssl.create_default_context()
+                context.check_hostname = False
+                context.verify_mode = ssl.CERT_NONE
+                self._conn = http.client.HTTPSConnection(self._netloc, timeout=self.timeout, context=context)
+            else:
+                self._conn = http.client.HTTPConnection(self._netloc, timeout=self.timeout)
+            self._count("connections")
+        return self._conn
+
+    def _reset_connection(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _post(self, method: str, body: str):
+        """POST a form-encoded Bot API call; returns (status, decoded JSON)."""
+        conn = self._connection()
+        conn.request(
+            "POST",
+            f"{self._path}/bot{self.bot_token}/{method}",
+            body=body.encode("utf-8"),
+            headers={"Content-Type": "application/x-www-form-urlencoded", "Connection": "keep-alive"},
+        )
+        response = conn.getresponse()
+        raw = response.read()
+        if response.getheader("Connection", "").lower() == "close":
+            self._reset_connection()
+        try:
+            payload = json.loads(raw) if raw else {}
+        except ValueError:
+            payload = {}
+        return response.status, payload if isinstance(payload, dict) else {}
@@ -0,0 +1,321 @@
+"""
+Tick (aggTrade) data
+====================
+
+Streams exchange trade files and aggregates them into candles without
+loading a whole file, so months of ticks can be replayed with bounded
+memory.
+
+Input files are Binance-style ``aggTrades`` CSV dumps (as published on
+data.binance.vision), optionally compressed (``.zip``, ``.gz``, ``.bz2``,
+``.xz``)::
+
+    agg_trade_id, price, quantity, first_trade_id, last_trade_id,
+    transact_time, is_buyer_maker
+
+with or without a header row.  Only ``price``, ``quantity`` and
+``transact_time`` are parsed.  Timestamps in microseconds (used by newer
+spot dumps) are converted to milliseconds.
+
+:func:`iter_trade_chunks` yields :class:`TradeChunk` blocks of at most
+``chunksize`` trades; :func:`iter_bar_chunks` turns them into
+:class:`BarChunk` blocks of complete candles together with the trades of
+each candle.  Trades of the last, possibly incomplete, candle of a block
+are carried over to the next one, so every candle is built from all of
+its trades even when it straddles a chunk (or file) boundary.
+"""
+
+import bz2
+import gzip
+import io
+import lzma
+import zipfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Sequence, Union
+
+import numpy as _np
+import pandas as _pd
+
+
+PathLike = Union[str, Path]
+
+AGG_TRADE_COLUMNS = [
+    "agg_trade_id",
+    "price",
+    "quantity",
+    "first_trade_id",
+    "last_trade_id",
+    "transact_time",
+    "is_buyer_maker",
+]
+
+# Timestamps above this are microseconds rather than milliseconds
+_MICROSECOND_THRESHOLD = 10 ** 14
+
+_OPENERS = {
+    ".gz": gzip.open,
+    ".bz2": bz2.open,
+    ".xz": lzma.open,
+}
+
+
+@dataclass
+class TradeChunk:
+    """
+    Block of trades sorted by time (int64 ms, float64 price / quantity).
+    ``source`` names the file it was read from, for error messages.
+    """
+    timestamp: _np.ndarray
+    price: _np.ndarray
+    quantity: _np.ndarray
+    source: str = ""
+
+    def __len__(self) -> int:
+        return len(self.timestamp)
+
+    def slice(self, start: int, stop: Optional[int] = None) -> "TradeChunk":
+        return TradeChunk(
+            self.timestamp[start:stop], self.price[start:stop], self.quantity[start:stop], self.source
+        )
+
+
+@dataclass
+class BarChunk:
+    """
+    Block of complete candles and the trades they were built from.
+
+    The trades of candle ``j`` are ``trades.slice(starts[j], ends[j])``;
+    candles without trades (gaps) have ``starts[j] == ends[j]``, zero
+    volume and open = high = low = close = previous close.
+    """
+    timestamp: _np.ndarray
+    open: _np.ndarray
+    high: _np.ndarray
+    low: _np.ndarray
+    close: _np.ndarray
+    volume: _np.ndarray
+    trades: TradeChunk
+    starts: _np.ndarray
+    ends: _np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.timestamp)
+
+    def to_frame(self) -> _pd.DataFrame:
+        """Candles as an OHLCV DataFrame (``datetime`` + OHLCV columns)."""
+        return _pd.DataFrame({
+            "datetime": _pd.to_datetime(self.timestamp, unit="ms"),
+            "open": self.open,
+            "high": self.high,
+            "low": self.low,
+            "close": self.close,
+            "volume": self.volume,
+        })
+
+
+# ----------------------------------------------------------------------
+# Reading trades
+# ----------------------------------------------------------------------
+
+def _open_text(path: Path):
+    """Open a (possibly compressed) trade file as a text stream."""
+    suffix = path.suffix.lower()
+    if suffix == ".zip":
+        archive = zipfile.ZipFile(path)
+        members = [name for name in archive.namelist() if not name.endswith("/")]
+        if len(members) != 1:
+            archive.close()
+            raise ValueError(f"Expected one file in {path}, found {len(members)}")
+        return io.TextIOWrapper(archive.open(members[0]), encoding="utf-8")
+    opener = _OPENERS.get(suffix)
+    if opener is not None:
+        return opener(path, "rt", encoding="utf-8")
+    return open(path, "r", encoding="utf-8")
+
+
+def _has_header(path: Path) -> bool:
+    with _open_text(path) as f:
+        first = f.readline()
+    return not first.split(",", 1)[0].strip().lstrip("-").isdigit()
+
+
+def iter_trade_chunks(
+    paths: Union[PathLike, Sequence[PathLike]],
+    chunksize: int = 1_000_000,
+) -> Iterator[TradeChunk]:
+    """
+    Stream trades from one or more aggTrade files, in the given order.
+
+    Parameters
+    ----------
+    paths : path or list of paths
+        Trade files, oldest first (e.g. one file per day or month).
+    chunksize : int
+        Maximum number of trades per yielded chunk.
+
+    Yields
+    ------
+    TradeChunk
+    """
+    if isinstance(paths, (str, Path)):
+        paths = [paths]
+    for path in paths:
+        path = Path(path)
+        header = 0 if _has_header(path) else None
+        with _open_text(path) as f:
+            reader = _pd.read_csv(
+                f,
+                header=header,
+                names=AGG_TRADE_COLUMNS,
+                usecols=["price", "quantity", "transact_time"],
+                dtype={"price": _np.float64, "quantity": _np.float64, "transact_time": _np.int64},
+                chunksize=chunksize,
+            )
+            for frame in reader:
+                if frame.empty:
+                    continue
+                ts = frame["transact_time"].to_numpy(dtype=_np.int64)
+                if ts[-1] > _MICROSECOND_THRESHOLD:
+                    ts = ts // 1000
+                price = frame["price"].to_numpy(dtype=_np.float64)
+                quantity = frame["quantity"].to_numpy(dtype=_np.float64)
+                if len(ts) > 1 and (_np.diff(ts) < 0).any():
+                    order = _np.argsort(ts, kind="stable")
+                    ts, price, quantity = ts[order], price[order], quantity[order]
+                yield TradeChunk(ts, price, quantity, str(path))
+
+
+# ----------------------------------------------------------------------
+# Candle aggregation
+# ----------------------------------------------------------------------
+
+def _concat(a: Optional[TradeChunk], b: TradeChunk) -> TradeChunk:
+    if a is None or len(a) == 0:
+        return b
+    return TradeChunk(
+        _np.concatenate([a.timestamp, b.timestamp]),
+        _np.concatenate([a.price, b.price]),
+        _np.concatenate([a.quantity, b.quantity]),
+        b.source,
+    )
+
+
+class _BarAggregator:
+    """Vectorized trade -> candle aggregation carrying state across blocks."""
+
+    def __init__(self, timeframe_ms: int, fill_gaps: bool):
+        if timeframe_ms <= 0:
+            raise ValueError("timeframe_ms must be positive")
+        self.timeframe_ms = int(timeframe_ms)
+        self.fill_gaps = fill_gaps
+        self.last_close = _np.nan
+        self.next_bucket: Optional[int] = None
+
+    def bars(self, trades: TradeChunk) -> BarChunk:
+        tf = self.timeframe_ms
+        bucket = trades.timestamp // tf * tf
+        if self.fill_gaps:
+            first = int(bucket[0]) if self.next_bucket is None else min(self.next_bucket, int(bucket[0]))
+            grid = _np.arange(first, int(bucket[-1]) + tf, tf, dtype=_np.int64)
+        else:
+            grid = _np.unique(bucket)
+        starts = _np.searchsorted(bucket, grid, side="left")
+        ends = _np.searchsorted(bucket, grid, side="right")
+        has = ends > starts
+
+        price = trades.price
+        n = len(grid)
+        open_ = _np.full(n, _np.nan)
+        high = _np.full(n, _np.nan)
+        low = _np.full(n, _np.nan)
+        close = _np.full(n, _np.nan)
+        volume = _np.zeros(n)
+
+        first_idx = starts[has]
+        open_[has] = price[first_idx]
+        close[has] = price[ends[has] - 1]
+        high[has] = _np.maximum.reduceat(price, first_idx)
+        low[has] = _np.minimum.reduceat(price, first_idx)
+        volume[has] = _np.add.reduceat(trades.quantity, first_idx)
+
+        if not has.all():
+            # Empty candles: flat at the previous close
+            last = _np.where(has, _np.arange(n), -1)
+            _np.maximum.accumulate(last, out=last)
+            prev_close = _np.where(last >= 0, close[_np.maximum(last, 0)], self.last_close)
+            empty = ~has
+            for col in (open_, high, low, close):
+                col[empty] = prev_close[empty]
+
+        self.last_close = close[-1]
+        self.next_bucket = int(grid[-1]) + tf
+        return BarChunk(grid, open_, high, low, close, volume, trades, starts, ends)
+
+
+def iter_bar_chunks(
+    trades: Iterable[TradeChunk],
+    timeframe_ms: int,
+    fill_gaps: bool = True,
+) -> Iterator[BarChunk]:
+    """
+    Aggregate a stream of trade chunks into blocks of complete candles.
+
+    Parameters
+    ----------
+    trades : iterable of TradeChunk
+        Trades sorted by time, e.g. from :func:`iter_trade_chunks`.  Each
+        chunk must start at or after the last trade of the previous one.
+    timeframe_ms : int
+        Candle length in milliseconds.
+    fill_gaps : bool
+        Emit flat zero-volume candles for intervals without trades (as
+        exchanges do), so candle indices stay evenly spaced.
+
+    Yields
+    ------
+    BarChunk
+        The last candle of the stream is emitted when the input ends.
+
+    Raises
+    ------
+    ValueError
+        If a chunk starts before the last trade of the previous chunk
+        (e.g. trade files passed out of order).
+    """
+    aggregator = _BarAggregator(timeframe_ms, fill_gaps)
+    tf = aggregator.timeframe_ms
+    carry: Optional[TradeChunk] = None
+    for index, chunk in enumerate(trades):
+        if len(chunk) == 0:
+            continue
+        if carry is not None and chunk.timestamp[0] < carry.timestamp[-1]:
+            raise ValueError(
+                f"Trade chunk {index}{f' of {chunk.source}' if chunk.source else ''} starts at "
+                f"{_pd.to_datetime(chunk.timestamp[0], unit='ms')}, before the previous trade at "
+                f"{_pd.to_datetime(carry.timestamp[-1], unit='ms')}"
+                f"{f' in {carry.source}' if carry.source else ''}; trades must be in time order "
+                "(pass trade files oldest first)"
+            )
+        merged = _concat(carry, chunk)
+        # Trades of the newest candle may continue in the next chunk
+        last_bucket = merged.timestamp[-1] // tf * tf
+        cut = int(_np.searchsorted(merged.timestamp, last_bucket, side="left"))
+        carry = merged.slice(cut)
+        if cut > 0:
+            yield aggregator.bars(merged.slice(0, cut))
+    if carry is not None and len(carry):
+        yield aggregator.bars(carry)
+
+
+def aggregate_trades(
+    paths: Union[PathLike, Sequence[PathLike]],
+    timeframe_ms: int,
+    chunksize: int = 1_000_000,
+    fill_gaps: bool = True,
+) -> _pd.DataFrame:
+    """Aggregate trade files into one OHLCV DataFrame (candles only)."""
+    frames = [chunk.to_frame() for chunk in iter_bar_chunks(iter_trade_chunks(paths, chunksize), timeframe_ms, fill_gaps)]
+    if not frames:
+        return _pd.DataFrame(columns=["datetime", "open", "high", "low", "close", "volume"])
+    return _pd.concat(frames, ignore_index=True)
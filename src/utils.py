@@ -6,8 +6,11 @@ This module contains shared functions for indicators and data fetching
 used by both backtest and signal production scripts.
 """
 
-import datetime as _dt
-from typing import Optional
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
 import urllib.parse
 import urllib.request
 import ssl
@@ -31,13 +34,48 @@ def ema(series: _pd.Series, span: int) -> _pd.Series:
     return series.ewm(span=span, adjust=False).mean()
 
 
-def rsi(series: _pd.Series, window: int = 14) -> _pd.Series:
-    """Compute the Relative Strength Index (RSI)."""
+def wilder_mean(series: _pd.Series, period: int) -> _pd.Series:
+    """
+    Wilder's smoothing (RMA), as charting tools compute ATR, RSI and ADX.
+
+    The first value is the simple mean of the first ``period`` valid
+    values; afterwards ``y = y + (x - y) / period``, evaluated as one
+    ``ewm(alpha=1/period, adjust=False)`` pass.  NaN inputs are skipped and
+    keep the previous value, as in ``streaming_indicators.WilderMean``.
+    """
+    valid = series.dropna()
+    out = _pd.Series(float("nan"), index=series.index, dtype="float64")
+    if len(valid) < period:
+        return out
+    seed = valid.iloc[:period].rolling(period).mean().iloc[-1:]
+    smoothed = _pd.concat([seed, valid.iloc[period:]]).ewm(alpha=1.0 / period, adjust=False).mean()
+    positions = series.notna().to_numpy().nonzero()[0][period - 1:]
+    out.iloc[positions] = smoothed.to_numpy()
+    out.iloc[positions[0]:] = out.iloc[positions[0]:].ffill()
+    return out
+
+
+def _smooth(series: _pd.Series, period: int, smoothing: str) -> _pd.Series:
+    """Rolling mean (``"rolling"``) or Wilder's smoothing (``"wilder"``)."""
+    if smoothing == "rolling":
+        return series.rolling(period).mean()
+    if smoothing == "wilder":
+        return wilder_mean(series, period)
+    raise ValueError(f"Unknown smoothing '{smoothing}'. Use 'rolling' or 'wilder'")
+
+
+def rsi(series: _pd.Series, window: int = 14, smoothing: str = "rolling") -> _pd.Series:
+    """
+    Compute the Relative Strength Index (RSI).
+
+    ``smoothing="wilder"`` averages gains and losses with Wilder's
+    smoothing (the classic RSI) instead of a simple rolling mean.
+    """
     delta = series.diff()
     up = delta.clip(lower=0)
     down = -delta.clip(upper=0)
-    gain = up.rolling(window).mean()
-    loss = down.rolling(window).mean()
+    gain = _smooth(up, window, smoothing)
+    loss = _smooth(down, window, smoothing)
     rs = gain / loss
     return 100 - (100 / (1 + rs))
 
@@ -51,34 +89,211 @@ def bollinger_bands(series: _pd.Series, window: int = 20, n_std: float = 2.0) ->
     return _pd.DataFrame({"mid": mid, "upper": upper, "lower": lower})
 
 
+def adx(
+    high: _pd.Series,
+    low: _pd.Series,
+    close: _pd.Series,
+    period: int = 14,
+    smoothing: str = "rolling",
+) -> _pd.Series:
+    """
+    Calculate Average Directional Index (ADX) to measure trend strength.
+    Higher ADX (>25) indicates strong trend.
+
+    ``smoothing="wilder"`` smooths TR, +DM, -DM and DX with Wilder's
+    smoothing instead of a simple rolling mean.
+    """
+    # Calculate True Range
+    tr1 = high - low
+    tr2 = abs(high - close.shift())
+    tr3 = abs(low - close.shift())
+    tr = _pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
+    
+    # Calculate Directional Movement
+    plus_dm = high.diff()
+    minus_dm = -low.diff()
+    plus_dm[plus_dm < 0] = 0
+    minus_dm[minus_dm < 0] = 0
+    
+    # Calculate smoothed values
+    atr = _smooth(tr, period, smoothing)
+    plus_di = 100 * (_smooth(plus_dm, period, smoothing) / atr)
+    minus_di = 100 * (_smooth(minus_dm, period, smoothing) / atr)
+    
+    # Calculate ADX
+    dx = 100 * abs(plus_di - minus_di) / (plus_di + minus_di)
+    adx = _smooth(dx, period, smoothing)
+    
+    return adx
+
+
+def atr(
+    high: _pd.Series,
+    low: _pd.Series,
+    close: _pd.Series,
+    period: int = 14,
+    smoothing: str = "rolling",
+) -> _pd.Series:
+    """
+    Calculate Average True Range (ATR) for volatility measurement.
+
+    ``smoothing="wilder"`` gives Wilder's ATR instead of a simple rolling
+    mean of the true range.
+    """
+    tr1 = high - low
+    tr2 = abs(high - close.shift())
+    tr3 = abs(low - close.shift())
+    tr = _pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
+    return _smooth(tr, period, smoothing)
+
+
+def sma(series: _pd.Series, window: int) -> _pd.Series:
+    """Simple Moving Average."""
+    return series.rolling(window).mean()
+
+
 # ----------------------------------------------------------------------
 # Data retrieval
 # ----------------------------------------------------------------------
 
-def get_exchange(exchange_id: str):
+# Paginated download settings
+FETCH_PAGE_LIMIT: int = 1000           # candles per fetch_ohlcv request
+FETCH_MAX_WORKERS: int = 4             # concurrent page requests
+FETCH_REQUESTS_PER_SECOND: float = 8.0  # request budget shared by all workers
+
+
+class RateLimiter:
+    """
+    Thread-safe request budget: spaces calls at least ``1 / rate`` seconds
+    apart across every thread that shares the limiter.
     """
-    Create and configure exchange instance.
+
+    def __init__(self, requests_per_second: float):
+        self.interval = 1.0 / requests_per_second if requests_per_second > 0 else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until the next request slot is available."""
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if wait > 0:
+            time.sleep(wait)
+
+
+def timeframe_to_ms(timeframe: str) -> int:
+    """Return the length of a ccxt timeframe (e.g. ``"1m"``) in milliseconds."""
+    return int(ccxt.Exchange.parse_timeframe(timeframe) * 1000)
+
+
+def _default_exchange_config(exchange_id: str) -> Dict[str, Any]:
+    """Constructor options used when a caller does not pass any."""
+    # For Binance, ensure we're using futures market for perpetual contracts
+    if exchange_id == "binance":
+        return {
+            'options': {
+                'defaultType': 'future',  # Use futures market for perpetual contracts
+            }
+        }
+    return {}
+
+
+class ExchangeRegistry:
+    """
+    Pool of ccxt exchange instances keyed by exchange id and options.
+
+    Each instance keeps its HTTP session (keep-alive), rate-limit state and
+    market metadata for the life of the process, so repeated fetches reuse
+    them instead of starting from scratch.  Markets are loaded lazily, once
+    per instance.
+
+    ``connections`` counts exchange instances created and
+    ``market_loads`` counts ``load_markets`` calls made by the registry.
+    """
+
+    def __init__(self):
+        self.connections = 0
+        self.market_loads = 0
+        self._exchanges: Dict[Tuple[str, str], Any] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(exchange_id: str, config: Dict[str, Any]) -> Tuple[str, str]:
+        return exchange_id, json.dumps(config, sort_keys=True, default=str)
+
+    def get(self, exchange_id: str, config: Optional[Dict[str, Any]] = None):
+        """Return the pooled exchange for ``exchange_id`` and ``config``."""
+        if config is None:
+            config = _default_exchange_config(exchange_id)
+        key = self._key(exchange_id, config)
+        with self._lock:
+            exchange = self._exchanges.get(key)
+            if exchange is None:
+                exchange_class = getattr(ccxt, exchange_id)
+                exchange = exchange_class(config)
+                self._exchanges[key] = exchange
+                self.connections += 1
+        return exchange
+
+    def load_markets(self, exchange) -> None:
+        """Load market metadata for ``exchange`` unless already loaded."""
+        if getattr(exchange, "markets", None):
+            return
+        with self._lock:
+            if getattr(exchange, "markets", None):
+                return
+            exchange.load_markets()
+            self.market_loads += 1
+
+    def stats(self) -> Dict[str, int]:
+        """Return connection and market load counters."""
+        with self._lock:
+            return {
+                "exchanges": len(self._exchanges),
+                "connections": self.connections,
+                "market_loads": self.market_loads,
+            }
+
+    def clear(self) -> None:
+        """Close and forget every pooled exchange."""
+        with self._lock:
+            exchanges = list(self._exchanges.values())
+            self._exchanges.clear()
+        for exchange in exchanges:
+            close = getattr(exchange, "close", None)
+            if callable(close):
+                try:
+                    close()
+                except Exception:
+                    pass
+
+
+# Process-wide registry shared by every fetch helper
+EXCHANGE_REGISTRY = ExchangeRegistry()
+
+
+def get_exchange(exchange_id: str, config: Optional[Dict[str, Any]] = None):
+    """
+    Return the shared exchange instance for ``exchange_id``.
     
     Parameters
     ----------
     exchange_id : str
         Name of the exchange as recognised by ccxt (e.g. "binance" or "bybit").
+    config : dict, optional
+        ccxt constructor options.  Defaults to futures markets on Binance.
+        Each distinct ``(exchange_id, config)`` pair gets its own instance.
     
     Returns
     -------
     ccxt.Exchange
-        Configured exchange instance.
+        Configured exchange instance from :data:`EXCHANGE_REGISTRY`, with
+        markets loaded.
     """
-    exchange_class = getattr(ccxt, exchange_id)
-    # For Binance, ensure we're using futures market for perpetual contracts
-    if exchange_id == "binance":
-        exchange = exchange_class({
-            'options': {
-                'defaultType': 'future',  # Use futures market for perpetual contracts
-            }
-        })
-    else:
-        exchange = exchange_class()
+    exchange = EXCHANGE_REGISTRY.get(exchange_id, config)
+    EXCHANGE_REGISTRY.load_markets(exchange)
     return exchange
 
 
@@ -98,8 +313,9 @@ def fetch_historical_ohlcv(
         Candle interval (e.g. "1m", "5m").
     days : int
         Number of days of data to fetch.  ccxt may limit the number of
-        candles returned per request, so the function loops backward in
-        batches of up to 1000 candles until the requested lookback is covered.
+        candles returned per request, so the lookback is split into pages
+        of up to 1000 candles that are downloaded concurrently (see
+        :func:`fetch_ohlcv_range`).
 
     Returns
     -------
@@ -107,27 +323,129 @@ def fetch_historical_ohlcv(
         DataFrame with columns ``datetime``, ``open``, ``high``, ``low``,
         ``close`` and ``volume``.  The index is not set.
     """
-    exchange = get_exchange(exchange_id)
-
     # Calculate start timestamp in milliseconds
-    now_ms = int(_dt.datetime.utcnow().timestamp() * 1000)
+    now_ms = int(time.time() * 1000)
     since_ms = now_ms - days * 24 * 60 * 60 * 1000
-    all_data = []
-    while since_ms < now_ms:
-        ohlcv = exchange.fetch_ohlcv(symbol, timeframe=timeframe, since=since_ms, limit=1000)
+    return fetch_ohlcv_range(exchange_id, symbol, timeframe, since_ms)
+
+
+def _page_ranges(since_ms: int, until_ms: int, page_ms: int) -> List[Tuple[int, int]]:
+    """Split ``[since_ms, until_ms)`` into consecutive page windows."""
+    return [(start, min(start + page_ms, until_ms)) for start in range(since_ms, until_ms, page_ms)]
+
+
+def _fetch_page(
+    exchange,
+    symbol: str,
+    timeframe: str,
+    start_ms: int,
+    end_ms: Optional[int],
+    timeframe_ms: int,
+    limit: int,
+    limiter: RateLimiter,
+) -> list:
+    """
+    Fetch every candle opening in ``[start_ms, end_ms)``, or every candle
+    from ``start_ms`` up to the exchange's latest one if ``end_ms`` is None.
+    """
+    rows = []
+    since_ms = start_ms
+    while end_ms is None or since_ms < end_ms:
+        limiter.acquire()
+        ohlcv = exchange.fetch_ohlcv(symbol, timeframe=timeframe, since=since_ms, limit=limit)
         if not ohlcv:
             break
-        last_ts = ohlcv[-1][0]
-        all_data.extend(ohlcv)
-        # advance since pointer to last candle + 1 ms
-        since_ms = last_ts + 1
-        # safety break to avoid infinite loop
-        if len(ohlcv) < 1000:
+        rows.extend(row for row in ohlcv if start_ms <= row[0] and (end_ms is None or row[0] < end_ms))
+        # A short page means the exchange has nothing more in this window
+        if len(ohlcv) < limit or (end_ms is not None and ohlcv[-1][0] + timeframe_ms >= end_ms):
             break
+        since_ms = ohlcv[-1][0] + 1
+    return rows
+
+
+def fetch_ohlcv_range(
+    exchange_id: str,
+    symbol: str,
+    timeframe: str,
+    since_ms: int,
+    until_ms: Optional[int] = None,
+    max_workers: int = FETCH_MAX_WORKERS,
+    requests_per_second: float = FETCH_REQUESTS_PER_SECOND,
+    limit: int = FETCH_PAGE_LIMIT,
+    exchange=None,
+) -> _pd.DataFrame:
+    """
+    Download OHLCV candles opening in ``[since_ms, until_ms)``.
+
+    The range is split up front into pages of ``limit`` candles, which are
+    fetched concurrently by a bounded thread pool.  All workers share one
+    request budget, so the exchange sees at most ``requests_per_second``
+    requests regardless of ``max_workers``.  Pages are stitched back in
+    time order and duplicate timestamps are dropped.
+
+    Parameters
+    ----------
+    exchange_id : str
+        Name of the exchange as recognised by ccxt.
+    symbol : str
+        Trading pair symbol.
+    timeframe : str
+        Candle interval (e.g. "1m", "5m").
+    since_ms : int
+        First candle open time (milliseconds since epoch, inclusive).
+    until_ms : int, optional
+        End of the range (milliseconds since epoch, exclusive).  By default
+        the range is open-ended: pages are planned up to the current time,
+        and the last one is fetched until the exchange returns a short
+        page, so the latest candle is included even if the local clock
+        lags the exchange.
+    max_workers : int
+        Concurrent page requests.  ``1`` fetches pages sequentially.
+    requests_per_second : float
+        Request budget shared by all workers (``0`` disables the limit).
+    limit : int
+        Candles per request.
+    exchange : object, optional
+        Exchange instance to use instead of ``get_exchange(exchange_id)``
+        (e.g. a local fake exchange).  It must be safe to share between
+        threads.
+
+    Returns
+    -------
+    pandas.DataFrame
+        DataFrame with columns ``datetime``, ``open``, ``high``, ``low``,
+        ``close`` and ``volume``, sorted by datetime.  The index is not set.
+    """
+    if exchange is None:
+        exchange = get_exchange(exchange_id)
+    open_ended = until_ms is None
+    if open_ended:
+        until_ms = int(time.time() * 1000)
+
+    timeframe_ms = timeframe_to_ms(timeframe)
+    pages: List[Tuple[int, Optional[int]]] = list(_page_ranges(int(since_ms), int(until_ms), limit * timeframe_ms))
+    if open_ended:
+        # The last page runs to the exchange's latest candle, not the local clock
+        pages[-1:] = [(pages[-1][0] if pages else int(since_ms), None)]
+    limiter = RateLimiter(requests_per_second)
+
+    def fetch(page: Tuple[int, Optional[int]]) -> list:
+        return _fetch_page(exchange, symbol, timeframe, page[0], page[1], timeframe_ms, limit, limiter)
+
+    workers = max(1, min(max_workers, len(pages)))
+    if workers == 1:
+        page_rows = [fetch(page) for page in pages]
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            page_rows = list(executor.map(fetch, pages))
+
+    all_data = [row for rows in page_rows for row in rows]
 
     # convert to DataFrame
     cols = ["timestamp", "open", "high", "low", "close", "volume"]
     df = _pd.DataFrame(all_data, columns=cols)
+    df = df.drop_duplicates("timestamp", keep="first").sort_values("timestamp", kind="stable")
+    df = df.reset_index(drop=True)
     df["datetime"] = _pd.to_datetime(df["timestamp"], unit="ms")
     return df[["datetime", "open", "high", "low", "close", "volume"]].copy()
 
@@ -155,13 +473,8 @@ def fetch_latest_ohlcv(
         DataFrame with columns ``datetime``, ``open``, ``high``, ``low``,
         ``close`` and ``volume``, sorted by datetime ascending.
     """
-    exchange = get_exchange(exchange_id)
-    
     # Fetch recent candles
-    ohlcv = exchange.fetch_ohlcv(symbol, timeframe=timeframe, limit=limit)
-    
-    if not ohlcv:
-        raise ValueError(f"No data returned from {exchange_id} for {symbol}")
+    ohlcv = fetch_ohlcv_rows(exchange_id, symbol, timeframe, limit=limit)
     
     # convert to DataFrame
     cols = ["timestamp", "open", "high", "low", "close", "volume"]
@@ -172,6 +485,29 @@ def fetch_latest_ohlcv(
     return df
 
 
+def fetch_ohlcv_rows(
+    exchange_id: str,
+    symbol: str,
+    timeframe: str,
+    since_ms: Optional[int] = None,
+    limit: int = 200,
+) -> list:
+    """
+    Fetch raw ccxt candles ``[timestamp, open, high, low, close, volume]``.
+
+    With ``since_ms`` only candles opening at or after that time are
+    returned (used to top up a :class:`candle_buffer.CandleBuffer`);
+    otherwise the most recent ``limit`` candles.
+
+    Raises ValueError if the exchange returns no candles.
+    """
+    exchange = get_exchange(exchange_id)
+    ohlcv = exchange.fetch_ohlcv(symbol, timeframe=timeframe, since=since_ms, limit=limit)
+    if not ohlcv:
+        raise ValueError(f"No data returned from {exchange_id} for {symbol}")
+    return ohlcv
+
+
 def get_current_price(exchange_id: str, symbol: str) -> float:
     """
     Get the current ticker price for the symbol.
@@ -193,6 +529,19 @@ def get_current_price(exchange_id: str, symbol: str) -> float:
     return float(ticker["last"])
 
 
+def get_exchange_time(exchange_id: str) -> int:
+    """
+    Get the exchange server time in milliseconds since epoch.
+
+    Parameters
+    ----------
+    exchange_id : str
+        Name of the exchange as recognised by ccxt.
+    """
+    exchange = get_exchange(exchange_id)
+    return int(exchange.fetch_time())
+
+
 # ----------------------------------------------------------------------
 # Telegram notification
 # ----------------------------------------------------------------------
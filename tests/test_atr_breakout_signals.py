@@ -0,0 +1,168 @@
+"""
+Regression test: vectorized ATR Breakout signals vs. the original loop
+=======================================================================
+
+``atr_breakout_signals`` evaluates the rule set as boolean masks.  The
+per-row ``.iloc`` loop it replaced is kept here as the reference, and both
+must return identical signal arrays on synthetic candles.
+
+Usage
+-----
+    python -m pytest tests/test_atr_breakout_signals.py
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "src"))
+sys.path.insert(0, str(project_root / "scripts"))
+
+import numpy as _np
+import pandas as _pd
+import pytest
+
+from utils import ema, rsi, adx, atr, sma
+from backtest_optimized import atr_breakout_signals
+
+
+# (atr_breakout_mult, rsi_long_min, rsi_long_max, rsi_short_min,
+#  rsi_short_max, volume_mult, adx_threshold)
+PARAM_SETS = [
+    (0.8, 50, 70, 30, 50, 1.2, 25),
+    (0.3, 45, 80, 20, 55, 1.0, 15),
+    (0.0, 40, 90, 10, 60, 0.5, 0),
+    (1.5, 55, 65, 35, 45, 2.0, 35),
+]
+
+
+def reference_signals(
+    df: _pd.DataFrame,
+    atr_breakout_mult: float,
+    rsi_long_min: float,
+    rsi_long_max: float,
+    rsi_short_min: float,
+    rsi_short_max: float,
+    volume_mult: float,
+    adx_threshold: float,
+) -> _np.ndarray:
+    """The original per-row ATR Breakout loop, with explicit parameters."""
+    if len(df) < 50:
+        return _np.zeros(len(df), dtype=int)
+
+    ema20 = ema(df["close"], 20)
+    ema50 = ema(df["close"], 50)
+    atr_val = atr(df["high"], df["low"], df["close"], 14)
+    rsi_val = rsi(df["close"], window=14)
+    volume_sma = sma(df["volume"], 20)
+    adx_val = adx(df["high"], df["low"], df["close"], 14)
+
+    signals = _np.zeros(len(df), dtype=int)
+
+    for i in range(50, len(df)):
+        if (_pd.isna(ema20.iloc[i]) or _pd.isna(ema50.iloc[i]) or
+            _pd.isna(atr_val.iloc[i]) or _pd.isna(rsi_val.iloc[i]) or
+            _pd.isna(volume_sma.iloc[i]) or _pd.isna(adx_val.iloc[i])):
+            continue
+
+        current_price = df["close"].iloc[i]
+        ema20_current = ema20.iloc[i]
+        ema50_current = ema50.iloc[i]
+        atr_current = atr_val.iloc[i]
+        rsi_current = rsi_val.iloc[i]
+        volume_current = df["volume"].iloc[i]
+        adx_current = adx_val.iloc[i]
+
+        volume_ok = volume_current >= volume_sma.iloc[i] * volume_mult
+        adx_ok = adx_current >= adx_threshold
+
+        if not (volume_ok and adx_ok):
+            continue
+
+        breakout_long = ema20_current + (atr_breakout_mult * atr_current)
+        breakout_short = ema20_current - (atr_breakout_mult * atr_current)
+
+        if ema20_current > ema50_current:
+            if current_price > breakout_long:
+                if rsi_long_min < rsi_current < rsi_long_max:
+                    signals[i] = 1
+        elif ema20_current < ema50_current:
+            if current_price < breakout_short:
+                if rsi_short_min < rsi_current < rsi_short_max:
+                    signals[i] = -1
+
+    return signals
+
+
+def make_candles(n: int, seed: int) -> _pd.DataFrame:
+    """Trending random-walk candles with a flat-price segment in the middle."""
+    rng = _np.random.default_rng(seed)
+    drift = _np.repeat(rng.choice([-0.002, 0.002], size=n // 100 + 1), 100)[:n]
+    close = 60000 * _np.exp(_np.cumsum(drift + rng.standard_t(3, n) * 0.002))
+
+    # Flat segment: no price change, zero range (ATR 0, RSI 0 / 0)
+    flat = slice(n // 2, n // 2 + 60)
+    close[flat] = close[flat.start - 1]
+
+    open_ = _np.r_[close[0], close[:-1]]
+    high = _np.maximum(open_, close) * (1 + _np.abs(rng.normal(0, 0.001, n)))
+    low = _np.minimum(open_, close) * (1 - _np.abs(rng.normal(0, 0.001, n)))
+    high[flat] = low[flat] = open_[flat] = close[flat]
+
+    return _pd.DataFrame({
+        "datetime": _pd.date_range("2024-01-01", periods=n, freq="1min"),
+        "open": open_,
+        "high": high,
+        "low": low,
+        "close": close,
+        "volume": rng.lognormal(3, 0.8, n),
+    })
+
+
+@pytest.fixture(scope="module")
+def candles() -> _pd.DataFrame:
+    return make_candles(3000, seed=7)
+
+
+@pytest.mark.parametrize("params", PARAM_SETS)
+def test_matches_reference_loop(candles, params):
+    expected = reference_signals(candles, *params)
+    signals = atr_breakout_signals(candles, *params)
+
+    assert signals.dtype == expected.dtype
+    assert _np.array_equal(signals, expected)
+
+
+def test_reference_data_produces_signals(candles):
+    # Guard against a vacuous comparison of two all-zero arrays
+    signals = reference_signals(candles, *PARAM_SETS[2])
+    assert (signals == 1).any() and (signals == -1).any()
+
+
+@pytest.mark.parametrize("params", PARAM_SETS)
+def test_nan_warmup(params):
+    # Leading candles with missing volume keep the volume SMA NaN past the
+    # 50-candle warm-up
+    df = make_candles(600, seed=11)
+    df.loc[:79, "volume"] = _np.nan
+
+    expected = reference_signals(df, *params)
+    signals = atr_breakout_signals(df, *params)
+
+    assert not expected[:99].any()
+    assert _np.array_equal(signals, expected)
+
+
+def test_flat_segment_has_no_signals(candles):
+    n = len(candles)
+    signals = atr_breakout_signals(candles, *PARAM_SETS[2])
+    assert not signals[n // 2 + 1:n // 2 + 60].any()
+
+
+@pytest.mark.parametrize("n", [0, 10, 49, 50, 51])
+def test_short_frames(n):
+    df = make_candles(60, seed=3).iloc[:n]
+    for params in PARAM_SETS:
+        assert _np.array_equal(atr_breakout_signals(df, *params), reference_signals(df, *params))
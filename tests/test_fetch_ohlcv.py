@@ -0,0 +1,102 @@
+"""
+OHLCV download against a fake exchange
+======================================
+
+Checks that the paged downloads in ``utils.py`` reach the exchange's latest
+candle whatever the host time zone or local clock offset.
+
+Usage
+-----
+    python -m pytest tests/test_fetch_ohlcv.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "src"))
+
+import pandas as _pd
+import pytest
+
+import utils
+from utils import fetch_historical_ohlcv
+
+
+MINUTE_MS = 60_000
+
+
+class FakeExchange:
+    """1m candles up to the current (forming) candle, ccxt ``fetch_ohlcv`` style."""
+
+    def __init__(self, clock_offset_ms: int = 0):
+        self.clock_offset_ms = clock_offset_ms
+
+    def latest_open(self) -> int:
+        now_ms = int(time.time() * 1000) + self.clock_offset_ms
+        return now_ms - now_ms % MINUTE_MS
+
+    def fetch_ohlcv(self, symbol, timeframe="1m", since=None, limit=1000):
+        start = -(-since // MINUTE_MS) * MINUTE_MS
+        stop = min(start + limit * MINUTE_MS, self.latest_open() + MINUTE_MS)
+        return [[ts, 1.0, 2.0, 0.5, 1.5, 10.0] for ts in range(start, stop, MINUTE_MS)]
+
+
+@pytest.fixture(params=["UTC", "Asia/Bangkok", "America/New_York"])
+def host_timezone(request, monkeypatch):
+    """Run the test with the host clock in another time zone."""
+    monkeypatch.setenv("TZ", request.param)
+    time.tzset()
+    yield request.param
+    monkeypatch.undo()
+    time.tzset()
+
+
+@pytest.fixture
+def exchange(monkeypatch):
+    fake = FakeExchange()
+    monkeypatch.setattr(utils, "get_exchange", lambda exchange_id: fake)
+    return fake
+
+
+def test_historical_download_includes_latest_candle(host_timezone, exchange):
+    df = fetch_historical_ohlcv("fake", "BTC/USDT", "1m", days=1)
+
+    latest = _pd.to_datetime(exchange.latest_open(), unit="ms")
+    assert df["datetime"].iloc[-1] >= latest - _pd.Timedelta(minutes=1)
+    assert df["datetime"].is_monotonic_increasing and df["datetime"].is_unique
+    # One day of candles, not one day shifted by the host UTC offset
+    assert 1439 <= len(df) <= 1441
+
+
+@pytest.mark.parametrize("clock_offset_ms", [0, 5 * MINUTE_MS, 3 * 60 * MINUTE_MS])
+def test_open_ended_range_follows_the_exchange_clock(clock_offset_ms):
+    # The exchange clock runs ahead of the local one: candles opening after
+    # the local "now" must still be downloaded
+    fake = FakeExchange(clock_offset_ms)
+    since_ms = fake.latest_open() - 2500 * MINUTE_MS
+    df = utils.fetch_ohlcv_range("fake", "BTC/USDT", "1m", since_ms, limit=1000, exchange=fake)
+
+    expected = _pd.to_datetime(range(since_ms, fake.latest_open() + MINUTE_MS, MINUTE_MS), unit="ms")
+    assert df["datetime"].iloc[0] == expected[0]
+    assert df["datetime"].iloc[-1] >= expected[-1]
+    assert df["datetime"].is_unique and df["datetime"].is_monotonic_increasing
+
+
+def test_open_ended_range_starting_after_local_clock():
+    fake = FakeExchange(10 * MINUTE_MS)
+    since_ms = fake.latest_open() - 3 * MINUTE_MS
+    df = utils.fetch_ohlcv_range("fake", "BTC/USDT", "1m", since_ms, exchange=fake)
+    assert len(df) >= 4
+
+
+def test_bounded_range_is_exclusive():
+    fake = FakeExchange()
+    until_ms = fake.latest_open() - 10 * MINUTE_MS
+    since_ms = until_ms - 2500 * MINUTE_MS
+    df = utils.fetch_ohlcv_range("fake", "BTC/USDT", "1m", since_ms, until_ms, limit=1000, exchange=fake)
+    assert len(df) == 2500
+    assert df["datetime"].iloc[-1] == _pd.to_datetime(until_ms - MINUTE_MS, unit="ms")
@@ -0,0 +1,326 @@
+"""
+High/low exit fills vs. a plain per-candle loop
+===============================================
+
+``simulate_trades(..., bars=...)`` runs a kernel that pauses on candles
+that touched both stop and target, lets the driver resolve them (from an
+``IntrabarPath`` drill-down, or stop first) and resumes from saved state.
+A simple Python loop over :func:`backtest_optimized.bar_exit` is kept here
+as the reference; both must produce identical trades and prune reasons.
+
+Usage
+-----
+    python -m pytest tests/test_high_low_fills.py
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "src"))
+sys.path.insert(0, str(project_root / "scripts"))
+
+import numpy as _np
+import pytest
+
+from intrabar import TOUCH_STOP, TOUCH_TARGET, TOUCH_UNKNOWN, IntrabarPath
+from backtest_optimized import PruneLimits, bar_exit, simulate_trades
+
+
+MINUTE_MS = 60_000
+SECOND_MS = 1_000
+START_MS = 1_704_067_200_000  # 2024-01-01
+RISK = 10.0
+FEE = 0.5
+
+
+# ----------------------------------------------------------------------
+# Reference
+# ----------------------------------------------------------------------
+
+def reference_trades(close, signals, long_stop, long_tp, short_stop, short_tp, tradable, bars,
+                     drill_down=None, prune=None):
+    """Per-candle loop with the semantics of ``fill="high_low"``."""
+    prune = prune or PruneLimits()
+    n = len(close)
+    timestamps = bars["timestamp"]
+    bar_ms = int(_np.median(_np.diff(timestamps))) if n > 1 else 0
+    total_signals = int(_np.count_nonzero(signals[tradable]))
+    max_trades = n + 1 if prune.max_trades is None else prune.max_trades
+    min_trades = prune.min_trades or 0
+    max_drawdown = _np.inf if prune.max_drawdown is None else prune.max_drawdown
+    profit_floor = -_np.inf if prune.profit_floor is None else prune.profit_floor
+
+    trades = []
+    pruned = ""
+    if total_signals < min_trades:
+        return trades, "min_signals"
+    seen = 0
+    equity = peak = 0.0
+    position = None
+    for i in range(n):
+        if not tradable[i]:
+            continue
+        sig = signals[i]
+        if sig != 0:
+            seen += 1
+        if position is None:
+            if sig == 1:
+                stop, tp, risk = long_stop[i], long_tp[i], close[i] - long_stop[i]
+            elif sig == -1:
+                stop, tp, risk = short_stop[i], short_tp[i], short_stop[i] - close[i]
+            else:
+                continue
+            if risk > 0:
+                position = (i, sig, close[i], stop, tp, RISK / risk)
+            continue
+
+        entry_i, direction, entry_price, stop, tp, quantity = position
+        end_ms = int(timestamps[i + 1]) if i + 1 < n else int(timestamps[i]) + bar_ms
+        exit_price = bar_exit(
+            direction, bars["open"][i], bars["high"][i], bars["low"][i], stop, tp,
+            int(timestamps[i]), end_ms, drill_down,
+        )
+        if exit_price is None and sig == -direction:
+            exit_price = close[i]
+        if exit_price is None:
+            continue
+
+        profit = (exit_price - entry_price) * direction * quantity - FEE
+        trades.append((entry_i, i, direction, quantity, profit, exit_price))
+        position = None
+        equity += profit
+        peak = max(peak, equity)
+        if len(trades) > max_trades:
+            pruned = "max_trades"
+        elif len(trades) + total_signals - seen < min_trades:
+            pruned = "min_signals"
+        elif peak - equity > max_drawdown:
+            pruned = "max_drawdown"
+        elif equity < profit_floor:
+            pruned = "profit_floor"
+        if pruned:
+            break
+    if not pruned and len(trades) < min_trades:
+        pruned = "min_trades"
+    return trades, pruned
+
+
+def run(market, drill_down=None, prune=None):
+    close, signals, levels, tradable, bars = market
+    trades = simulate_trades(
+        close, signals, *levels, tradable=tradable,
+        risk_per_trade=RISK, fee_per_trade=FEE, bars=bars, drill_down=drill_down, prune=prune,
+    )
+    rows = list(zip(
+        trades.entry_idx.tolist(), trades.exit_idx.tolist(), trades.direction.tolist(),
+        trades.quantity.tolist(), trades.profit.tolist(), trades.exit_price.tolist(),
+    ))
+    return rows, trades.pruned
+
+
+def assert_matches_reference(market, drill_down=None, prune=None):
+    close, signals, levels, tradable, bars = market
+    expected = reference_trades(close, signals, *levels, tradable, bars, drill_down, prune)
+    actual = run(market, drill_down, prune)
+    assert actual == expected
+    return actual
+
+
+# ----------------------------------------------------------------------
+# Market data
+# ----------------------------------------------------------------------
+
+def make_market(n: int, seed: int, wide: float = 3.0):
+    """
+    Random 1m candles with wide ranges relative to the stop / target
+    distance, so many candles touch both levels, plus a 1s path inside
+    every candle for the drill-down.
+    """
+    rng = _np.random.default_rng(seed)
+    sub = rng.normal(0, 1.0, (n, 60)).cumsum(axis=1)
+    sub += 100 + rng.normal(0, 4, n).cumsum()[:, None]
+    open_ = sub[:, 0].copy()
+    close = sub[:, -1].copy()
+    high = sub.max(axis=1)
+    low = sub.min(axis=1)
+    timestamps = START_MS + _np.arange(n, dtype=_np.int64) * MINUTE_MS
+
+    # Gaps at the open: some candles open far from the previous close
+    gaps = rng.random(n) < 0.05
+    shift = _np.where(gaps, rng.choice([-1, 1], n) * 3 * wide, 0.0)
+    open_ += shift
+    high = _np.maximum(high, open_)
+    low = _np.minimum(low, open_)
+
+    atr = _np.full(n, wide)
+    levels = (close - atr, close + 1.5 * atr, close + atr, close - 1.5 * atr)
+    signals = rng.choice([0, 0, 0, 1, -1], n)
+    tradable = rng.random(n) > 0.03
+    bars = {"open": open_, "high": high, "low": low, "timestamp": timestamps}
+
+    sub_ts = (timestamps[:, None] + _np.arange(60) * SECOND_MS).ravel()
+    sub_high = sub.ravel() + _np.where(gaps, shift, 0.0).repeat(60)
+    path = IntrabarPath(sub_ts, sub_high, sub_high.copy())
+    return (close, signals, levels, tradable, bars), path
+
+
+def handmade_market(candles, signals, stop_dist=1.0, tp_dist=2.0):
+    """Market from ``(open, high, low, close)`` tuples; levels at fixed distances."""
+    open_, high, low, close = (_np.array(col, dtype=_np.float64) for col in zip(*candles))
+    n = len(close)
+    levels = (close - stop_dist, close + tp_dist, close + stop_dist, close - tp_dist)
+    bars = {
+        "open": open_, "high": high, "low": low,
+        "timestamp": START_MS + _np.arange(n, dtype=_np.int64) * MINUTE_MS,
+    }
+    return close, _np.array(signals, dtype=_np.int64), levels, _np.ones(n, dtype=bool), bars
+
+
+def path_through(bar: int, prices) -> IntrabarPath:
+    """1s path of ``prices`` inside candle ``bar``."""
+    ts = START_MS + bar * MINUTE_MS + _np.arange(len(prices), dtype=_np.int64) * SECOND_MS
+    return IntrabarPath(ts, _np.array(prices, dtype=_np.float64))
+
+
+# ----------------------------------------------------------------------
+# Randomized comparison
+# ----------------------------------------------------------------------
+
+PRUNES = [
+    None,
+    PruneLimits(max_trades=15),
+    PruneLimits(min_trades=40),
+    PruneLimits(max_drawdown=60.0),
+    PruneLimits(profit_floor=-30.0),
+    PruneLimits(max_trades=200, min_trades=5, max_drawdown=500.0, profit_floor=-500.0),
+]
+
+
+@pytest.mark.parametrize("prune", PRUNES)
+@pytest.mark.parametrize("seed", range(6))
+@pytest.mark.parametrize("with_path", [False, True])
+def test_matches_reference_loop(seed, prune, with_path):
+    market, path = make_market(400, seed)
+    assert_matches_reference(market, path if with_path else None, prune)
+
+
+def test_random_market_exercises_both_touched_candles():
+    # Guard against a vacuous comparison: candles touching both levels
+    # are common, and the drill-down resolves some of them to the target
+    market, path = make_market(400, 0)
+    with_path, _ = run(market, path)
+    without_path, _ = run(market)
+    assert path.stats["lookups"] > 5 and path.stats["resolved"] > 0
+    assert with_path != without_path
+
+
+# ----------------------------------------------------------------------
+# Handmade cases
+# ----------------------------------------------------------------------
+
+# Long entry at 100 (stop 99, target 102); candle 2 touches both levels
+BOTH_TOUCHED = [
+    (100.0, 100.5, 99.5, 100.0),
+    (100.0, 100.5, 99.5, 100.0),
+    (100.0, 103.0, 98.0, 100.5),
+    (100.5, 101.0, 100.0, 100.5),
+]
+
+
+def test_both_touched_resolves_to_target_with_drill_down():
+    market = handmade_market(BOTH_TOUCHED, [0, 1, 0, 0])
+    path = path_through(2, [100.0, 101.0, 102.5, 99.0, 98.0, 100.5])
+
+    trades, pruned = assert_matches_reference(market, path)
+    assert trades == [(1, 2, 1, 10.0, 2.0 * 10.0 - FEE, 102.0)]
+    assert pruned == ""
+    assert path.stats["unresolved"] == 0
+
+
+def test_both_touched_defaults_to_stop():
+    market = handmade_market(BOTH_TOUCHED, [0, 1, 0, 0])
+    trades, _ = assert_matches_reference(market)
+    assert trades == [(1, 2, 1, 10.0, -1.0 * 10.0 - FEE, 99.0)]
+
+    # Drill-down data that cannot tell (both in one sub-interval) -> stop
+    path = IntrabarPath(_np.array([START_MS + 2 * MINUTE_MS]), _np.array([103.0]), _np.array([98.0]))
+    trades, _ = assert_matches_reference(market, path)
+    assert trades[0][5] == 99.0
+
+
+def test_gap_through_stop_fills_at_open():
+    candles = [
+        (100.0, 100.5, 99.5, 100.0),
+        (100.0, 100.5, 99.5, 100.0),
+        (97.0, 103.0, 96.5, 98.0),  # opens below the stop, then reaches the target
+    ]
+    trades, _ = assert_matches_reference(handmade_market(candles, [0, 1, 0]))
+    assert trades == [(1, 2, 1, 10.0, -3.0 * 10.0 - FEE, 97.0)]
+
+
+def test_short_gap_through_target_fills_at_open():
+    candles = [
+        (100.0, 100.5, 99.5, 100.0),
+        (100.0, 100.5, 99.5, 100.0),
+        (97.0, 97.5, 96.5, 97.0),
+    ]
+    trades, _ = assert_matches_reference(handmade_market(candles, [0, -1, 0]))
+    assert trades == [(1, 2, -1, 10.0, 3.0 * 10.0 - FEE, 97.0)]
+
+
+def test_opposite_signal_on_both_touched_candle_is_not_double_counted():
+    # The kernel pauses on candle 2 and evaluates it again on resume; its
+    # signal counted twice would leave too few signals and prune the run
+    market = handmade_market(BOTH_TOUCHED + [(100.5, 100.6, 100.4, 100.5)] * 3, [0, 1, -1, 0, 1, 0, 0])
+    trades, pruned = assert_matches_reference(market, prune=PruneLimits(min_trades=2))
+    assert pruned == "min_trades"
+    assert len(trades) == 1
+
+
+def test_prune_after_resume():
+    # Three long trades, each closed on a candle that touched both levels
+    # and resolved by the drill-down; the second one exceeds max_trades
+    entry = (100.0, 100.5, 99.5, 100.0)
+    both = (100.0, 103.0, 98.0, 100.5)
+    candles = [entry, entry, both, entry, both, entry, both]
+    signals = [0, 1, 0, 1, 0, 1, 0]
+    market = handmade_market(candles, signals)
+    path = IntrabarPath(
+        _np.concatenate([START_MS + bar * MINUTE_MS + _np.arange(3) * SECOND_MS for bar in (2, 4, 6)]),
+        _np.array([102.5, 99.0, 100.0, 98.5, 102.5, 100.0, 102.5, 98.0, 100.0]),
+    )
+
+    trades, pruned = assert_matches_reference(market, path, PruneLimits(max_trades=1))
+    assert pruned == "max_trades"
+    assert [(t[0], t[1], t[5]) for t in trades] == [(1, 2, 102.0), (3, 4, 99.0)]
+
+    trades, pruned = assert_matches_reference(market, path, PruneLimits(profit_floor=10.0))
+    assert pruned == "profit_floor"
+    assert len(trades) == 2
+
+
+# ----------------------------------------------------------------------
+# IntrabarPath.first_touch
+# ----------------------------------------------------------------------
+
+def test_first_touch():
+    path = IntrabarPath(
+        START_MS + _np.arange(6, dtype=_np.int64) * SECOND_MS,
+        _np.array([100.5, 101.0, 102.5, 100.0, 99.0, 98.0]),
+        _np.array([99.5, 100.0, 101.5, 99.0, 98.5, 97.0]),
+    )
+    end = START_MS + 6 * SECOND_MS
+    # Long: target (102) at second 2, stop (99) at second 3
+    assert path.first_touch(START_MS, end, 1, 99.0, 102.0) == TOUCH_TARGET
+    # Short: stop (102) at second 2, target (98.5) at second 4
+    assert path.first_touch(START_MS, end, -1, 102.0, 98.5) == TOUCH_STOP
+    # Long from second 3 on: only the stop is reached
+    assert path.first_touch(START_MS + 3 * SECOND_MS, end, 1, 99.0, 102.0) == TOUCH_STOP
+    # Both levels inside one sub-interval
+    assert path.first_touch(START_MS, end, 1, 99.6, 100.4) == TOUCH_UNKNOWN
+    # No data in the interval
+    assert path.first_touch(end, end + MINUTE_MS, 1, 99.0, 102.0) == TOUCH_UNKNOWN
+    assert path.stats == {"lookups": 5, "resolved": 3, "unresolved": 2}
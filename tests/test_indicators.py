@@ -0,0 +1,178 @@
+"""
+Indicator parity: batch, streaming and fused pipeline
+=====================================================
+
+The ATR / RSI / ADX values must not depend on how they are computed:
+
+- ``streaming_indicators`` fed one candle at a time gives the same values
+  as the batch functions in ``utils.py``, for both smoothing methods
+- ``indicator_pipeline.compute_indicators`` gives the same values as the
+  separate ``utils`` functions
+
+All comparisons are exact (NaN positions included).
+
+Usage
+-----
+    python -m pytest tests/test_indicators.py
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "src"))
+
+import numpy as _np
+import pandas as _pd
+import pytest
+
+from utils import _smooth, adx, atr, ema, rsi, sma
+from streaming_indicators import (
+    StreamingADX,
+    StreamingATR,
+    StreamingEMA,
+    StreamingRSI,
+    StreamingSMA,
+    make_smoother,
+)
+from indicator_pipeline import compute_indicators, compute_indicators_frame
+
+
+SMOOTHINGS = ["rolling", "wilder"]
+LENGTHS = [0, 1, 2, 13, 14, 15, 28, 60, 400]
+
+
+def make_candles(n: int, seed: int = 0, flat: bool = True, gaps: bool = False) -> _pd.DataFrame:
+    """
+    Random-walk candles; with ``flat`` a zero-range segment in the middle,
+    with ``gaps`` NaN prices (leading candles and scattered single values).
+    """
+    rng = _np.random.default_rng(seed)
+    close = 60000 * _np.exp(_np.cumsum(rng.standard_t(3, n) * 0.002))
+    if flat and n >= 120:
+        segment = slice(n // 2, n // 2 + 40)
+        close[segment] = close[segment.start - 1]
+    open_ = _np.r_[close[:1], close[:-1]]
+    high = _np.maximum(open_, close) * (1 + _np.abs(rng.normal(0, 0.001, n)))
+    low = _np.minimum(open_, close) * (1 - _np.abs(rng.normal(0, 0.001, n)))
+    if flat and n >= 120:
+        high[segment] = low[segment] = close[segment]
+    if gaps:
+        for column in (high, low, close):
+            column[rng.choice(n, min(n, max(1, n // 40)), replace=False)] = _np.nan
+        high[:3] = low[:3] = close[:3] = _np.nan
+    return _pd.DataFrame({
+        "open": open_,
+        "high": high,
+        "low": low,
+        "close": close,
+        "volume": rng.lognormal(3, 0.8, n),
+    })
+
+
+def assert_identical(actual, expected) -> None:
+    actual = _np.asarray(actual, dtype=_np.float64)
+    expected = _np.asarray(expected, dtype=_np.float64)
+    assert actual.shape == expected.shape
+    assert _np.array_equal(actual, expected, equal_nan=True)
+
+
+def stream(indicator, *columns) -> _np.ndarray:
+    return _np.array([indicator.update(*row) for row in zip(*columns)], dtype=_np.float64)
+
+
+# ----------------------------------------------------------------------
+# Streaming vs batch
+# ----------------------------------------------------------------------
+
+@pytest.mark.parametrize("gaps", [False, True])
+@pytest.mark.parametrize("smoothing", SMOOTHINGS)
+@pytest.mark.parametrize("n", LENGTHS)
+def test_streaming_atr_rsi_adx_match_batch(smoothing, n, gaps):
+    df = make_candles(n, seed=n, gaps=gaps)
+    high, low, close = df["high"], df["low"], df["close"]
+
+    assert_identical(stream(StreamingATR(14, smoothing), high, low, close), atr(high, low, close, 14, smoothing))
+    assert_identical(stream(StreamingRSI(14, smoothing), close), rsi(close, 14, smoothing))
+    assert_identical(stream(StreamingADX(14, smoothing), high, low, close), adx(high, low, close, 14, smoothing))
+
+
+@pytest.mark.parametrize("gaps", [False, True])
+@pytest.mark.parametrize("n", LENGTHS)
+def test_streaming_ema_sma_match_batch(n, gaps):
+    df = make_candles(n, seed=n, gaps=gaps)
+    assert_identical(stream(StreamingEMA(20), df["close"]), ema(df["close"], 20))
+    assert_identical(stream(StreamingSMA(20), df["volume"]), sma(df["volume"], 20))
+
+
+@pytest.mark.parametrize("smoothing", SMOOTHINGS)
+def test_flat_segment_gives_nan_rsi_and_adx(smoothing):
+    # Zero range and no price change: RSI and DX are 0 / 0 in both paths
+    df = make_candles(400, seed=5)
+    high, low, close = df["high"], df["low"], df["close"]
+    batch = rsi(close, 14, smoothing)
+    if smoothing == "rolling":
+        assert batch.iloc[200 + 14:240].isna().all()
+    assert_identical(stream(StreamingRSI(14, smoothing), close), batch)
+    assert_identical(stream(StreamingADX(14, smoothing), high, low, close), adx(high, low, close, 14, smoothing))
+
+
+@pytest.mark.parametrize("smoothing", SMOOTHINGS)
+def test_smoothers_skip_nan_like_batch(smoothing):
+    # NaN inputs blank a rolling window and are skipped by Wilder's smoothing
+    volume = make_candles(200, seed=9, flat=False)["volume"]
+    volume.iloc[[0, 1, 30, 31, 32, 100]] = _np.nan
+    assert_identical(stream(StreamingSMA(20), volume), sma(volume, 20))
+
+    smoother = make_smoother(smoothing, 14)
+    assert_identical([smoother.push(x) for x in volume], _smooth(volume, 14, smoothing))
+
+
+@pytest.mark.parametrize("smoothing", SMOOTHINGS)
+def test_peek_matches_update(smoothing):
+    df = make_candles(120, seed=2, gaps=True)
+    indicators = [StreamingATR(14, smoothing), StreamingADX(14, smoothing)]
+    close_indicators = [StreamingRSI(14, smoothing), StreamingEMA(20)]
+    for h, l, c in zip(df["high"], df["low"], df["close"]):
+        for indicator in indicators:
+            peeked = indicator.peek(h, l, c)
+            assert _np.array_equal(peeked, indicator.update(h, l, c), equal_nan=True)
+        for indicator in close_indicators:
+            peeked = indicator.peek(c)
+            assert _np.array_equal(peeked, indicator.update(c), equal_nan=True)
+
+
+# ----------------------------------------------------------------------
+# Fused pipeline vs separate utils functions
+# ----------------------------------------------------------------------
+
+@pytest.mark.parametrize("gaps", [False, True])
+@pytest.mark.parametrize("smoothing", SMOOTHINGS)
+@pytest.mark.parametrize("n", LENGTHS)
+def test_pipeline_matches_utils(smoothing, n, gaps):
+    df = make_candles(n, seed=100 + n, gaps=gaps)
+    high, low, close, volume = df["high"], df["low"], df["close"], df["volume"]
+    ind = compute_indicators(high, low, close, volume, smoothing)
+
+    assert_identical(ind.ema20, ema(close, 20))
+    assert_identical(ind.ema50, ema(close, 50))
+    assert_identical(ind.atr, atr(high, low, close, 14, smoothing))
+    assert_identical(ind.rsi, rsi(close, 14, smoothing))
+    assert_identical(ind.volume_sma, sma(volume, 20))
+    assert_identical(ind.adx, adx(high, low, close, 14, smoothing))
+
+
+@pytest.mark.parametrize("smoothing", SMOOTHINGS)
+def test_pipeline_frame_and_periods(smoothing):
+    df = make_candles(300, seed=4)
+    periods = dict(ema_fast=9, ema_slow=21, period=10, volume_window=5)
+    ind = compute_indicators_frame(df, smoothing, **periods)
+
+    assert_identical(ind.ema20, ema(df["close"], 9))
+    assert_identical(ind.ema50, ema(df["close"], 21))
+    assert_identical(ind.atr, atr(df["high"], df["low"], df["close"], 10, smoothing))
+    assert_identical(ind.rsi, rsi(df["close"], 10, smoothing))
+    assert_identical(ind.volume_sma, sma(df["volume"], 5))
+    assert_identical(ind.adx, adx(df["high"], df["low"], df["close"], 10, smoothing))
@@ -0,0 +1,87 @@
+"""
+Trade chunk aggregation
+=======================
+
+Checks that ``tick_data.iter_bar_chunks`` builds the same candles however
+the trades are split into chunks and files, and rejects trades that go
+back in time across a chunk or file boundary.
+
+Usage
+-----
+    python -m pytest tests/test_tick_data.py
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "src"))
+
+import numpy as _np
+import pandas as _pd
+import pytest
+
+from tick_data import AGG_TRADE_COLUMNS, aggregate_trades, iter_bar_chunks, iter_trade_chunks
+
+
+MINUTE_MS = 60_000
+START_MS = 1_704_067_200_000  # 2024-01-01
+
+
+def write_trades(path: Path, timestamps: _np.ndarray, seed: int) -> Path:
+    rng = _np.random.default_rng(seed)
+    n = len(timestamps)
+    _pd.DataFrame({
+        "agg_trade_id": _np.arange(n),
+        "price": 60000 + rng.normal(0, 50, n).cumsum(),
+        "quantity": rng.lognormal(-3, 1, n),
+        "first_trade_id": _np.arange(n),
+        "last_trade_id": _np.arange(n),
+        "transact_time": timestamps,
+        "is_buyer_maker": rng.integers(0, 2, n).astype(bool),
+    })[AGG_TRADE_COLUMNS].to_csv(path, index=False)
+    return path
+
+
+@pytest.fixture
+def trade_files(tmp_path):
+    """Two consecutive days of trades, with a gap in the first one."""
+    rng = _np.random.default_rng(0)
+    jan = _np.sort(START_MS + rng.integers(0, 1440 * MINUTE_MS, 5000))
+    jan = jan[(jan < START_MS + 600 * MINUTE_MS) | (jan > START_MS + 640 * MINUTE_MS)]
+    feb = _np.sort(START_MS + 1440 * MINUTE_MS + rng.integers(0, 1440 * MINUTE_MS, 5000))
+    return write_trades(tmp_path / "jan.csv", jan, 1), write_trades(tmp_path / "feb.csv", feb, 2)
+
+
+@pytest.mark.parametrize("chunksize", [7, 333, 100_000])
+def test_chunking_does_not_change_candles(trade_files, chunksize):
+    expected = aggregate_trades(list(trade_files), MINUTE_MS, chunksize=1_000_000)
+    candles = aggregate_trades(list(trade_files), MINUTE_MS, chunksize=chunksize)
+
+    _pd.testing.assert_frame_equal(candles, expected)
+    assert candles["datetime"].is_unique and candles["datetime"].is_monotonic_increasing
+    # Gaps are filled, so candles are evenly spaced
+    span = candles["datetime"].iloc[-1] - candles["datetime"].iloc[0]
+    assert len(candles) == span // _pd.Timedelta(minutes=1) + 1
+
+
+def test_files_out_of_order_raise(trade_files):
+    jan, feb = trade_files
+    with pytest.raises(ValueError, match="jan.csv.*before the previous trade.*feb.csv"):
+        list(iter_bar_chunks(iter_trade_chunks([feb, jan], chunksize=1000), MINUTE_MS))
+
+
+def test_unsorted_rows_across_chunks_raise(tmp_path):
+    ts = START_MS + _np.arange(100) * 1000
+    path = write_trades(tmp_path / "mixed.csv", _np.r_[ts[50:], ts[:50]], 3)
+    with pytest.raises(ValueError, match="Trade chunk 1 of .*mixed.csv"):
+        list(iter_bar_chunks(iter_trade_chunks(path, chunksize=50), MINUTE_MS))
+
+
+def test_equal_timestamps_across_chunks_are_accepted(tmp_path):
+    ts = _np.full(40, START_MS + 5 * MINUTE_MS)
+    path = write_trades(tmp_path / "same.csv", ts, 4)
+    bars = list(iter_bar_chunks(iter_trade_chunks(path, chunksize=10), MINUTE_MS))
+    assert sum(len(b) for b in bars) == 1